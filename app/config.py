@@ -6,3 +6,53 @@ TELEMETRY_PORT = 33740
 # To mirror the trajectory (clockwise/counterclockwise), invert only one axis.
 TRACK_INVERT_X = False
 TRACK_INVERT_Z = True
+
+# Dead reckoning between packets (velocity extrapolation, capped).
+# The track car marker always uses it; the speed / RPM gauges only when enabled.
+PREDICT_MAX_EXTRAPOLATION_S = 0.1
+UI_PREDICT_GAUGES = False
+
+# Sectors: split automatically on the first clean lap (middle of the longest
+# straights), or at these distances (m from the start/finish line) when set.
+SECTOR_COUNT = 3
+SECTOR_MARKS_M = None
+
+# Extra channels stored with each lap sample (see domain/channels.py for the
+# registry). Disabled channels cost nothing; the track window can change them.
+CAPTURE_CHANNELS = (
+    "speed_kmh",
+    "rpm",
+    "gear",
+    "tyre_temp_fl",
+    "tyre_temp_fr",
+    "tyre_temp_rl",
+    "tyre_temp_rr",
+)
+
+# UI pacing.
+# Racing: dashboard runs at this interval, capped to the display refresh rate.
+# Paused / menus / no packets: everything drops to the idle interval.
+UI_RACING_INTERVAL_MS = 16
+UI_IDLE_INTERVAL_MS = 200
+UI_STALE_AFTER_S = 1.0
+# Frame clock: non-critical work (track map, analytics) that doesn't fit the
+# budget is pushed to later frames, at most UI_MAX_DEFERRED_FRAMES in a row.
+UI_FRAME_BUDGET_MS = 10.0
+UI_MAX_DEFERRED_FRAMES = 6
+# Render quality: drop glows / antialiasing / track detail when the p95 frame
+# period stays above the frame interval, restore it once there is headroom.
+UI_QUALITY_AUTO = True
+# UI profiler: F3 toggles the HUD (and measurement), F4 writes CSV + Chrome trace
+# to UI_PROFILE_DIR. Enabled at startup when UI_PROFILER_ENABLED is True.
+UI_PROFILER_ENABLED = False
+UI_PROFILE_DIR = "profiles"
+# Lap export (track window): default folder of the save dialog.
+EXPORT_DIR = "exports"
+# Packet capture (main.py --record / --replay): decrypted packets + sparse index,
+# replayed with a timeline scrubber in the dashboard and track windows.
+CAPTURE_DIR = "captures"
+
+# Track map: ingest notifies changed laps, coalesced to at most one refresh per interval.
+TRACK_NOTIFY_INTERVAL_MS = 16
+# Trace window: rebuilding 5 curves per changed lap is heavier than the map, refresh less often.
+TRACE_REFRESH_INTERVAL_MS = 250
@@ -0,0 +1,280 @@
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+
+from infrastructure.capture import CaptureReader
+from infrastructure.packet_parser import PACKET_RATE_HZ, ms_to_time, parse_telemetry_columns
+from domain.motion_predictor import MotionPredictor
+from domain.sectors import SectorTimingEngine
+from app.services.track_service import TrackService
+from app.telemetry import TelemetryService
+
+# Pacotes lidos do disco por vez durante a reprodução.
+PLAYBACK_BLOCK = 256
+# Parado, o pacote atual é reenviado nesse intervalo (como o jogo faz pausado):
+# a UI não cai em "sem telemetria" e o carro continua no mapa.
+PAUSED_RESEND_S = 0.5
+
+
+def retained_laps(
+    segments: list[tuple[int, int, int, int, float]], max_laps: int
+) -> tuple[dict[int, list[tuple[int, int]]], dict[int, tuple[int, float]]]:
+    """
+    Quais trechos o LapTelemetryState ainda guardaria depois de uma ingestão ao
+    vivo de todos eles: mesma regra de _trim_old_laps (sai a pior volta com
+    tempo, ou a mais antiga), simulada só com as fronteiras do índice.
+    segments: (volta, início, fim, last_lap_ms, fuel), com last_lap_ms / fuel do
+    primeiro pacote do trecho. Retorna volta -> [(início, fim)] e volta ->
+    (tempo ms, combustível) que a volta recebeu ao fechar.
+    """
+    kept: dict[int, list[tuple[int, int]]] = {}
+    summaries: dict[int, tuple[int, float]] = {}
+    current: Optional[int] = None
+    for lap, start, end, last_lap_ms, fuel in segments:
+        if lap <= 0:
+            continue
+        if current is not None and lap != current and current in kept:
+            # ms_to_time corta negativos em 0:00:000, que vira 0 ms de volta.
+            summaries[current] = (max(last_lap_ms, 0), fuel)
+        current = lap
+        if lap not in kept:
+            kept[lap] = []
+            while len(kept) > max_laps:
+                timed = [number for number in kept if number in summaries]
+                worst = max(timed, key=lambda number: summaries[number][0]) if timed else min(kept)
+                kept.pop(worst)
+                summaries.pop(worst, None)
+        kept[lap].append((start, end))
+    return kept, summaries
+
+
+class ReplayService:
+    """
+    Reproduz uma captura .gt7cap pelo mesmo caminho dos pacotes ao vivo
+    (TelemetryService.handle_packet), numa thread própria.
+
+    preview(t) só decodifica o pacote em t (estado do painel e carro no mapa);
+    seek(t) também refaz o estado das voltas: só as voltas que o estado ainda
+    guardaria em t, cada uma decodificada em bloco (parse_telemetry_columns) e
+    entregue a TrackService.ingest_positions. Comandos vão para a thread do
+    replay, então ingestão e reconstrução nunca rodam ao mesmo tempo.
+    """
+
+    def __init__(
+        self,
+        reader: CaptureReader,
+        telemetry: TelemetryService,
+        track_service: TrackService,
+        predictor: Optional[MotionPredictor] = None,
+        sectors: Optional[SectorTimingEngine] = None,
+    ):
+        self.reader = reader
+        self.telemetry = telemetry
+        self.track_service = track_service
+        self.predictor = predictor
+        self.sectors = sectors
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._playing = False
+        self._speed = 1.0
+        # Próximo pacote a tocar e o último entregue.
+        self._next = 0
+        self._current: Optional[int] = None
+        self._position_s = 0.0
+        # Depois de um preview o estado das voltas não corresponde à posição:
+        # refeito no seek, ou antes do primeiro pacote tocado.
+        self._laps_stale = False
+        # (tempo de captura, refazer voltas) pendente; o último pedido ganha.
+        self._pending: Optional[tuple[float, bool]] = None
+
+    # =========================================================
+    # CONTROLE (qualquer thread)
+    # =========================================================
+    def start(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._running = False
+        self._wake.set()
+
+    def play(self) -> None:
+        with self._lock:
+            self._playing = True
+        self._wake.set()
+
+    def pause(self) -> None:
+        with self._lock:
+            self._playing = False
+        self._wake.set()
+
+    def is_playing(self) -> bool:
+        with self._lock:
+            return self._playing
+
+    def set_speed(self, speed: float) -> None:
+        with self._lock:
+            self._speed = max(0.05, speed)
+        self._wake.set()
+
+    def duration(self) -> float:
+        return self.reader.duration
+
+    def position(self) -> float:
+        """Tempo de captura (s) do último pacote entregue."""
+        with self._lock:
+            return self._position_s
+
+    def lap_starts(self) -> list[tuple[int, float]]:
+        """(volta, tempo de captura) do início de cada trecho de volta > 0."""
+        laps = self.reader.lap_boundaries()
+        return [
+            (lap, capture_time)
+            for lap, capture_time in zip(laps["lap"].tolist(), laps["capture_time"].tolist())
+            if lap > 0
+        ]
+
+    def preview(self, capture_time: float) -> None:
+        self._request(capture_time, rebuild=False)
+
+    def seek(self, capture_time: float) -> None:
+        self._request(capture_time, rebuild=True)
+
+    def _request(self, capture_time: float, rebuild: bool) -> None:
+        capture_time = min(max(capture_time, 0.0), self.reader.duration)
+        with self._lock:
+            # Um seek pendente não vira preview: a reconstrução ainda precisa acontecer.
+            if self._pending is not None and self._pending[1]:
+                rebuild = True
+            self._pending = (capture_time, rebuild)
+            self._position_s = capture_time
+        self._wake.set()
+
+    # =========================================================
+    # THREAD DO REPLAY
+    # =========================================================
+    def _loop(self) -> None:
+        block: Optional[np.ndarray] = None
+        block_first = 0
+        clock: Optional[tuple[float, float, float]] = None
+        while self._running:
+            self._wake.clear()
+            with self._lock:
+                pending, self._pending = self._pending, None
+                playing, speed = self._playing, self._speed
+            if pending is not None:
+                self._apply(*pending)
+                block, clock = None, None
+                continue
+
+            if not playing or self._next >= self.reader.count:
+                self._resend_current()
+                self._wake.wait(PAUSED_RESEND_S)
+                clock = None
+                continue
+
+            if self._laps_stale:
+                self._rebuild(self._next)
+                self._laps_stale = False
+                clock = None
+                continue
+            if block is None or not block_first <= self._next < block_first + len(block):
+                block_first = self._next
+                block = self.reader.read(block_first, PLAYBACK_BLOCK)
+            record = block[self._next - block_first]
+            rx_time = float(record["rx_time"])
+            now = time.monotonic()
+            if clock is None or clock[2] != speed:
+                # (instante local, rx_time do pacote, velocidade): o ritmo sai das diferenças de rx_time.
+                clock = (now, rx_time, speed)
+            due = clock[0] + (rx_time - clock[1]) / speed
+            if due > now and self._wake.wait(due - now):
+                continue
+            if now - due > PAUSED_RESEND_S:
+                # Atrasou (GC, disco, rebuild): segue do pacote atual em vez de despejar o atraso.
+                clock = (now, rx_time, speed)
+            self._deliver(record, self._next, ingest_track=True)
+            self._next += 1
+
+    def _apply(self, capture_time: float, rebuild: bool) -> None:
+        packet = self.reader.packet_at_time(capture_time)
+        if self.predictor is not None:
+            # Salto no tempo: nada de extrapolar ou deslizar a partir do pacote anterior.
+            self.predictor.reset()
+        if rebuild:
+            self._rebuild(packet)
+        self._laps_stale = not rebuild
+        record = self.reader.read(packet, 1)
+        if len(record):
+            self._deliver(record[0], packet, ingest_track=rebuild)
+        self._next = packet + 1
+
+    def _deliver(self, record, packet: int, ingest_track: bool) -> None:
+        payload = record["payload"][:int(record["length"])].tobytes()
+        self.telemetry.handle_packet(payload, time.monotonic(), ingest_track=ingest_track)
+        self._current = packet
+        with self._lock:
+            if self._pending is None:
+                self._position_s = float(self.reader.capture_time(record))
+
+    def _resend_current(self) -> None:
+        if self._current is None:
+            return
+        record = self.reader.read(self._current, 1)
+        if len(record):
+            self._deliver(record[0], self._current, ingest_track=False)
+
+    def _rebuild(self, target: int) -> None:
+        """Estado das voltas como estaria ao vivo logo antes do pacote target."""
+        self.track_service.clear_track()
+        if self.sectors is not None:
+            self.sectors.reset()
+
+        laps = self.reader.lap_boundaries()
+        summaries = dict(zip(laps["packet"].tolist(), zip(laps["last_lap_ms"].tolist(), laps["fuel"].tolist())))
+        segments = [
+            (lap, start, end, *summaries[start]) for lap, start, end in self.reader.lap_segments(target)
+        ]
+        kept, summaries = retained_laps(segments, self.track_service.lap_state.get_max_laps())
+        chosen = sorted((start, end, lap) for lap, spans in kept.items() for start, end in spans)
+        if not chosen:
+            return
+
+        parts = []
+        previous: Optional[int] = None
+        for start, end, lap in chosen:
+            records = self.reader.read(start, end - start)
+            columns = parse_telemetry_columns(records["payload"], records["length"])
+            columns["capture_time"] = self.reader.capture_time(records)
+            # Transição vinda do trecho anterior da lista: o resumo é o que a volta
+            # anterior recebeu ao vivo, não o do pacote (a volta do meio pode ter saído).
+            columns["last_lap_time"] = np.full(len(records), None, dtype=object)
+            if previous is not None and previous != lap and previous in summaries and len(records):
+                lap_time_ms, fuel = summaries[previous]
+                columns["last_lap_time"][0] = ms_to_time(lap_time_ms)
+                columns["fuel"] = columns["fuel"].copy()
+                columns["fuel"][0] = fuel
+            parts.append({name: values[columns["valid"]] for name, values in columns.items()})
+            previous = lap
+
+        batch = {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+        channels = self.track_service.lap_state.get_channels()
+        self.track_service.ingest_positions(
+            x=batch["position_x"],
+            z=batch["position_z"],
+            lap=batch["current_lap"],
+            timestamp=batch["packet_id"] / PACKET_RATE_HZ,
+            throttle=batch["throttle"],
+            brake=batch["brake"],
+            last_lap_time=batch["last_lap_time"],
+            fuel=batch["fuel"],
+            wall_time=self.reader.start_wall_time + batch["capture_time"],
+            channels={name: batch[name] for name in channels if name in batch},
+        )
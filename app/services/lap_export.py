@@ -0,0 +1,232 @@
+import csv
+import json
+import math
+import os
+from typing import Callable, Optional
+import zipfile
+
+import numpy as np
+
+from domain.channels import CHANNELS, missing_value
+from domain.lap_delta import ReferenceLap
+from domain.lap_telemetry import LapTelemetry, LapTelemetryState
+from domain.track_state import TrackPoint
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet é opcional: sem pyarrow o formato some da lista.
+    pa = None
+    pq = None
+
+# Colunas fixas de cada amostra; os canais extras vêm depois, na ordem do registro.
+BASE_COLUMNS = (
+    ("lap", "int32"),
+    ("timestamp", "float64"),
+    ("x", "float64"),
+    ("z", "float64"),
+    ("throttle", "float32"),
+    ("brake", "float32"),
+    ("rx_time", "float64"),
+    ("wall_time", "float64"),
+)
+
+EXPORT_FORMATS = {
+    "npz": ".npz",
+    "parquet": ".parquet",
+    "csv": ".csv",
+    "jsonl": ".jsonl",
+}
+
+
+def available_formats() -> list[str]:
+    return [fmt for fmt in EXPORT_FORMATS if fmt != "parquet" or pq is not None]
+
+
+def lap_columns(lap: LapTelemetry, channel_names: tuple[str, ...]) -> dict[str, np.ndarray]:
+    """
+    Colunas numpy de uma volta. Canais pedidos que a volta não gravou saem como
+    valores ausentes, para o esquema ser o mesmo em todas as voltas do arquivo.
+    """
+    count = len(lap.points)
+    columns = {"lap": np.full(count, lap.lap_number, dtype="int32")}
+    for name, dtype in BASE_COLUMNS[1:]:
+        columns[name] = np.fromiter((getattr(p, name) for p in lap.points), dtype=dtype, count=count)
+    for name in channel_names:
+        values = lap.channels.get(name)
+        if values is None or len(values) != count:
+            dtype = CHANNELS[name].dtype
+            values = np.full(count, missing_value(dtype), dtype=dtype)
+        columns[name] = values
+    return columns
+
+
+class _NpzWriter:
+    """
+    .npz escrito entrada a entrada: lap_0003_x.npy, lap_0003_brake.npy, ... e
+    laps.npy / lap_time_ms.npy (-1 = sem tempo). np.load lê normalmente.
+    """
+
+    def __init__(self, path: str, names: list[str]):
+        self._zip = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED, allowZip64=True)
+        self._laps: list[int] = []
+        self._times: list[int] = []
+
+    def write_lap(self, lap: LapTelemetry, lap_time_ms: Optional[int], columns: dict[str, np.ndarray], chunk_rows: int) -> None:
+        for name, values in columns.items():
+            if name == "lap":
+                continue
+            with self._zip.open(f"lap_{lap.lap_number:04d}_{name}.npy", "w", force_zip64=True) as entry:
+                np.lib.format.write_array(entry, values, allow_pickle=False)
+        self._laps.append(lap.lap_number)
+        self._times.append(lap_time_ms if lap_time_ms is not None else -1)
+
+    def close(self) -> None:
+        for name, values in (("laps", self._laps), ("lap_time_ms", self._times)):
+            with self._zip.open(f"{name}.npy", "w") as entry:
+                np.lib.format.write_array(entry, np.asarray(values, dtype="int64"))
+        self._zip.close()
+
+
+class _ParquetWriter:
+    """Uma tabela só (coluna lap); cada bloco de chunk_rows vira um row group."""
+
+    def __init__(self, path: str, names: list[str]):
+        self._path = path
+        self._writer = None
+
+    def write_lap(self, lap: LapTelemetry, lap_time_ms: Optional[int], columns: dict[str, np.ndarray], chunk_rows: int) -> None:
+        count = len(columns["lap"])
+        for start in range(0, count, chunk_rows):
+            table = pa.table({name: values[start:start + chunk_rows] for name, values in columns.items()})
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self._path, table.schema, compression="zstd")
+            self._writer.write_table(table)
+
+    def close(self) -> None:
+        if self._writer is None:
+            # Nenhuma amostra: arquivo válido, sem linhas.
+            pq.write_table(pa.table({}), self._path)
+            return
+        self._writer.close()
+
+
+class _CsvWriter:
+    def __init__(self, path: str, names: list[str]):
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(names)
+
+    def write_lap(self, lap: LapTelemetry, lap_time_ms: Optional[int], columns: dict[str, np.ndarray], chunk_rows: int) -> None:
+        count = len(columns["lap"])
+        for start in range(0, count, chunk_rows):
+            chunk = [values[start:start + chunk_rows].tolist() for values in columns.values()]
+            self._writer.writerows(zip(*chunk))
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _JsonlWriter:
+    """Um objeto por amostra; NaN (canal ausente) vira null."""
+
+    def __init__(self, path: str, names: list[str]):
+        self._file = open(path, "w", encoding="utf-8")
+        self._names = names
+
+    def write_lap(self, lap: LapTelemetry, lap_time_ms: Optional[int], columns: dict[str, np.ndarray], chunk_rows: int) -> None:
+        count = len(columns["lap"])
+        for start in range(0, count, chunk_rows):
+            chunk = []
+            for values in columns.values():
+                part = values[start:start + chunk_rows]
+                rows = part.tolist()
+                if part.dtype.kind == "f" and np.isnan(part).any():
+                    rows = [None if math.isnan(value) else value for value in rows]
+                chunk.append(rows)
+            self._file.write(
+                "".join(json.dumps(dict(zip(self._names, row))) + "\n" for row in zip(*chunk))
+            )
+
+    def close(self) -> None:
+        self._file.close()
+
+
+_WRITERS = {
+    "npz": _NpzWriter,
+    "parquet": _ParquetWriter,
+    "csv": _CsvWriter,
+    "jsonl": _JsonlWriter,
+}
+
+
+def export_laps(
+    lap_state: LapTelemetryState,
+    path: str,
+    fmt: str,
+    lap_numbers: Optional[set[int]] = None,
+    chunk_rows: int = 20_000,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> int:
+    """
+    Exporta as voltas pedidas (None = sessão inteira) volta a volta: só uma
+    volta é copiada do estado por vez e as linhas saem em blocos de chunk_rows.
+    Escreve num arquivo temporário e troca no fim; retorna o número de amostras.
+    progress(voltas_feitas, total) é chamado na thread de quem exporta.
+    """
+    if fmt not in available_formats():
+        raise ValueError(f"Unsupported export format: {fmt}")
+
+    lap_channels = lap_state.get_lap_channels()
+    selected = sorted(
+        lap_number for lap_number in lap_channels if lap_numbers is None or lap_number in lap_numbers
+    )
+    recorded = {name for lap_number in selected for name in lap_channels[lap_number]}
+    channel_names = tuple(name for name in CHANNELS if name in recorded)
+    names = [name for name, _dtype in BASE_COLUMNS] + list(channel_names)
+
+    lap_times = lap_state.get_lap_times_ms()
+    temp_path = f"{path}.part"
+    writer = _WRITERS[fmt](temp_path, names)
+    rows = 0
+    completed = False
+    try:
+        for done, lap_number in enumerate(selected, start=1):
+            laps = lap_state.get_laps_snapshot({lap_number})
+            if laps:
+                columns = lap_columns(laps[0], channel_names)
+                writer.write_lap(laps[0], lap_times.get(lap_number), columns, chunk_rows)
+                rows += len(columns["lap"])
+            if progress is not None:
+                progress(done, len(selected))
+        completed = True
+    finally:
+        writer.close()
+        if not completed:
+            os.remove(temp_path)
+    os.replace(temp_path, path)
+    return rows
+
+
+def load_reference_lap(path: str, lap_number: Optional[int] = None) -> ReferenceLap:
+    """
+    Volta de um .npz exportado, como ReferenceLap (ex.: fantasma de outra
+    sessão). Sem lap_number, a volta mais rápida com tempo no arquivo.
+    """
+    with np.load(path, allow_pickle=False) as data:
+        if "laps" not in data.files:
+            raise ValueError(f"{path} is not a lap export")
+        laps = data["laps"].tolist()
+        times = data["lap_time_ms"].tolist()
+        if lap_number is None:
+            timed = [(time_ms, lap) for lap, time_ms in zip(laps, times) if time_ms >= 0]
+            if not timed:
+                raise ValueError(f"{path} has no timed lap")
+            lap_number = min(timed)[1]
+        elif lap_number not in laps:
+            raise ValueError(f"lap {lap_number} not found in {path}")
+        lap_time_ms = times[laps.index(lap_number)]
+        prefix = f"lap_{lap_number:04d}_"
+        x, z, timestamp = (data[prefix + name].tolist() for name in ("x", "z", "timestamp"))
+    points = [TrackPoint(x=px, z=pz, timestamp=pt) for px, pz, pt in zip(x, z, timestamp)]
+    return ReferenceLap(lap_number, points, lap_time_ms if lap_time_ms >= 0 else None)
@@ -1,7 +1,12 @@
+from bisect import bisect_left, bisect_right
 import math
 import time
-from typing import Optional
+from typing import Optional, Sequence
 
+import numpy as np
+
+from domain.ghost import GhostCar
+from domain.lap_delta import LapDeltaEngine
 from domain.lap_telemetry import LapTelemetryState
 
 
@@ -13,8 +18,12 @@ class TrackService:
         sample_interval_ms: int = 80,
         invert_x: bool = False,
         invert_z: bool = False,
+        delta: Optional[LapDeltaEngine] = None,
+        ghost: Optional[GhostCar] = None,
     ):
         self.lap_state = lap_state
+        self.delta = delta
+        self.ghost = ghost
         self.min_distance_m = min_distance_m
         self.sample_interval_s = sample_interval_ms / 1000.0
         self.invert_x = invert_x
@@ -36,7 +45,17 @@ class TrackService:
         throttle: Optional[float] = None,
         brake: Optional[float] = None,
         timestamp: Optional[float] = None,
+        rx_time: Optional[float] = None,
+        wall_time: Optional[float] = None,
+        sample: Optional[object] = None,
     ) -> None:
+        """
+        timestamp é o relógio do jogo em segundos (packet_id / 60): amostragem e
+        decimação dependem só dele, então replay acelerado ou backlog dão o mesmo
+        resultado. Sem ele (pacote sem packet_id) cai no relógio de parede.
+        sample é o pacote decodificado; os canais extras só são lidos dele quando
+        o ponto é gravado.
+        """
         if self._capture_paused:
             return
 
@@ -51,7 +70,13 @@ class TrackService:
 
         x, z = self._transform_position(x=x, z=z)
 
-        ts = timestamp if timestamp is not None else time.time()
+        wall = wall_time if wall_time is not None else time.time()
+        ts = timestamp if timestamp is not None else wall
+        # Delta a cada pacote, antes da decimação.
+        if self.delta is not None:
+            self.delta.observe(lap_number=current_lap, x=x, z=z, timestamp=ts)
+        if self.ghost is not None:
+            self.ghost.observe(lap_number=current_lap, timestamp=ts, rx_time=rx_time)
         if not self._should_add_point(x=x, z=z, timestamp=ts):
             return
 
@@ -62,6 +87,9 @@ class TrackService:
             timestamp=ts,
             throttle=throttle if throttle is not None else 0.0,
             brake=brake if brake is not None else 0.0,
+            rx_time=rx_time if rx_time is not None else time.monotonic(),
+            wall_time=wall,
+            sample=sample,
         )
         if not added:
             return
@@ -71,6 +99,136 @@ class TrackService:
         self._last_ts = ts
         self._current_lap = current_lap
 
+    def ingest_positions(
+        self,
+        x: np.ndarray,
+        z: np.ndarray,
+        lap: np.ndarray,
+        timestamp: np.ndarray,
+        throttle: Optional[np.ndarray] = None,
+        brake: Optional[np.ndarray] = None,
+        last_lap_time: Optional[Sequence[Optional[str]]] = None,
+        fuel: Optional[np.ndarray] = None,
+        rx_time: Optional[np.ndarray] = None,
+        wall_time: Optional[np.ndarray] = None,
+        channels: Optional[dict[str, np.ndarray]] = None,
+    ) -> int:
+        """
+        Versão em lote de ingest_position (replay, importação, recepção em lote).
+        Mesma inversão de eixos, mesma decimação e mesmas transições de volta que
+        chamar ingest_position pacote a pacote, com um lock por trecho de volta.
+        timestamp é o relógio do jogo; channels traz colunas por nome de canal.
+        Retorna quantos pontos foram gravados.
+        """
+        if self._capture_paused:
+            return 0
+        x = np.asarray(x, dtype=float)
+        z = np.asarray(z, dtype=float)
+        lap = np.asarray(lap, dtype=np.int64)
+        timestamp = np.asarray(timestamp, dtype=float)
+        count = len(x)
+        if count == 0:
+            return 0
+        throttle = np.zeros(count) if throttle is None else np.asarray(throttle, dtype=float)
+        brake = np.zeros(count) if brake is None else np.asarray(brake, dtype=float)
+        if self.invert_x:
+            x = -x
+        if self.invert_z:
+            z = -z
+
+        # Trechos contíguos da mesma volta; volta <= 0 não grava nem muda de volta.
+        boundaries = np.flatnonzero(np.diff(lap)) + 1
+        starts = np.concatenate(([0], boundaries))
+        ends = np.concatenate((boundaries, [count]))
+        added = 0
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            lap_number = int(lap[start])
+            if lap_number <= 0:
+                continue
+            self._handle_lap_transition(
+                current_lap=lap_number,
+                last_lap_time=last_lap_time[start] if last_lap_time is not None else None,
+                current_fuel=float(fuel[start]) if fuel is not None else None,
+            )
+            # Em lote o delta e o fantasma só acompanham o início e o fim de cada trecho.
+            for index in sorted({start, end - 1}):
+                if self.delta is not None:
+                    self.delta.observe(
+                        lap_number=lap_number, x=float(x[index]), z=float(z[index]), timestamp=float(timestamp[index])
+                    )
+                if self.ghost is not None:
+                    self.ghost.observe(
+                        lap_number=lap_number,
+                        timestamp=float(timestamp[index]),
+                        rx_time=float(rx_time[index]) if rx_time is not None else None,
+                    )
+            keep = start + self._decimate(x[start:end], z[start:end], timestamp[start:end])
+            if len(keep) == 0:
+                continue
+            chunk_added = self.lap_state.add_points(
+                lap_number=lap_number,
+                x=x[keep],
+                z=z[keep],
+                timestamp=timestamp[keep],
+                throttle=throttle[keep],
+                brake=brake[keep],
+                rx_time=rx_time[keep] if rx_time is not None else None,
+                wall_time=wall_time[keep] if wall_time is not None else None,
+                channels={name: np.asarray(column)[keep] for name, column in channels.items()} if channels else None,
+            )
+            if not chunk_added:
+                continue
+            added += chunk_added
+            last = keep[-1]
+            self._last_x = float(x[last])
+            self._last_z = float(z[last])
+            self._last_ts = float(timestamp[last])
+            self._current_lap = lap_number
+        return added
+
+    def _decimate(self, x: np.ndarray, z: np.ndarray, timestamp: np.ndarray) -> np.ndarray:
+        """
+        Índices aceitos por _should_add_point, partindo do último ponto gravado.
+        Depois de cada ponto aceito, a bissecção pula direto para o primeiro pacote
+        fora do intervalo de amostragem; só dali em diante a distância é testada.
+        """
+        count = len(x)
+        xs, zs, ts = x.tolist(), z.tolist(), timestamp.tolist()
+        interval = self.sample_interval_s
+        min_distance = self.min_distance_m
+        kept: list[int] = []
+        last_x, last_z, last_ts = self._last_x, self._last_z, self._last_ts
+        index = 0
+        if last_x is None or last_z is None:
+            kept.append(0)
+            last_x, last_z, last_ts = xs[0], zs[0], ts[0]
+            index = 1
+
+        # Trechos em que o relógio do jogo não volta: dentro de um, ts é ordenado e a
+        # bissecção vale. Só o primeiro pacote de um trecho pode ficar abaixo do
+        # último ponto gravado (elapsed < 0 em _should_add_point), e aí é aceito.
+        runs = (np.flatnonzero(np.diff(timestamp) < 0) + 1).tolist()
+        runs.append(count)
+        run = bisect_right(runs, index)
+        hypot = math.hypot
+        while index < count:
+            while runs[run] <= index:
+                run += 1
+            limit = runs[run]
+            if ts[index] >= last_ts:
+                # Margem na bissecção; o teste exato (o mesmo do por pacote) vem no laço.
+                index = bisect_left(ts, last_ts + interval - 1e-6, index, limit)
+                while index < limit:
+                    if ts[index] - last_ts >= interval and hypot(xs[index] - last_x, zs[index] - last_z) >= min_distance:
+                        break
+                    index += 1
+                if index >= limit:
+                    continue
+            kept.append(index)
+            last_x, last_z, last_ts = xs[index], zs[index], ts[index]
+            index += 1
+        return np.asarray(kept, dtype=np.int64)
+
     def _handle_lap_transition(
         self,
         current_lap: int,
@@ -105,7 +263,11 @@ class TrackService:
         if self._last_x is None or self._last_z is None:
             return True
 
-        if (timestamp - self._last_ts) < self.sample_interval_s:
+        elapsed = timestamp - self._last_ts
+        # Relógio do jogo voltou (nova sessão / packet_id reiniciado): aceita e recomeça dali.
+        if elapsed < 0:
+            return True
+        if elapsed < self.sample_interval_s:
             return False
 
         dx = x - self._last_x
@@ -119,6 +281,10 @@ class TrackService:
         self._last_z = None
         self._last_ts = 0.0
         self._current_lap = None
+        if self.delta is not None:
+            self.delta.reset()
+        if self.ghost is not None:
+            self.ghost.reset()
 
     def pause_capture(self) -> None:
         self._capture_paused = True
@@ -2,68 +2,100 @@ import threading
 from typing import Optional
 
 from infrastructure.udp_client import GT7UdpClient
+from infrastructure.capture import CaptureWriter
 from infrastructure.crypto import decrypt
-from infrastructure.packet_parser import parse_telemetry
+from infrastructure.packet_parser import PACKET_RATE_HZ, parse_telemetry
 from domain.game_state import GameState
+from domain.motion_predictor import MotionPredictor
 from app.services.track_service import TrackService
 
 class TelemetryService:
     def __init__(
         self,
-        client: GT7UdpClient,
+        client: Optional[GT7UdpClient],
         state: GameState,
         track_service: Optional[TrackService] = None,
+        predictor: Optional[MotionPredictor] = None,
+        capture: Optional[CaptureWriter] = None,
     ):
+        """client=None: sem UDP, os pacotes chegam por handle_packet (replay)."""
         self.client = client
         self.state = state
         self.track_service = track_service
+        self.predictor = predictor
+        self.capture = capture
         self._running = False
         self._thread: Optional[threading.Thread] = None
 
     def _loop(self):
         while self._running:
-            data, _ = self.client.receive()
+            data, _, rx_time = self.client.receive_timestamped()
             packet = decrypt(data)
             if not packet:
                 continue
+            if self.capture is not None:
+                self.capture.write(packet, rx_time)
+            self.handle_packet(packet, rx_time)
 
-            try:
-                data = parse_telemetry(packet)
-            except ValueError:
-                continue
+    def handle_packet(self, packet: bytes, rx_time: float, ingest_track: bool = True) -> None:
+        """
+        Pacote já decifrado. ingest_track=False atualiza estado e previsão sem
+        gravar ponto de volta (preview do replay).
+        """
+        try:
+            data = parse_telemetry(packet)
+        except ValueError:
+            return
 
-            self.state.update(
-                throttle=data.throttle,
-                brake=data.brake,
-                rpm=data.rpm,
-                rpm_warn=data.rpm_warn,
-                rpm_rev_limiter=data.rpm_rev_limiter,
-                fuel_ratio=data.fuel,
-                fuel=data.fuel,
-                fuel_capacity=data.fuel_capacity,
-                gear=data.gear,
-                suggested_gear=data.suggested_gear,
+        self.state.update(
+            throttle=data.throttle,
+            brake=data.brake,
+            rpm=data.rpm,
+            rpm_warn=data.rpm_warn,
+            rpm_rev_limiter=data.rpm_rev_limiter,
+            fuel_ratio=data.fuel,
+            fuel=data.fuel,
+            fuel_capacity=data.fuel_capacity,
+            gear=data.gear,
+            suggested_gear=data.suggested_gear,
+            speed_kmh=data.speed_kmh,
+            best_lap=data.best_lap,
+            last_lap=data.last_lap,
+            current_lap=data.current_lap,
+            total_laps=data.total_laps,
+            current_position=data.current_position,
+            total_cars=data.total_cars,
+            is_paused=data.is_paused,
+            is_in_race=data.is_in_race,
+            rx_time=rx_time,
+            packet_id=data.packet_id,
+            )
+        if self.predictor is not None and data.physics is not None:
+            self.predictor.observe(
+                timestamp=rx_time,
+                x=data.physics.position_x,
+                z=data.physics.position_z,
+                velocity_x=data.physics.velocity_x,
+                velocity_z=data.physics.velocity_z,
                 speed_kmh=data.speed_kmh,
-                best_lap=data.best_lap,
-                last_lap=data.last_lap,
+                rpm=data.rpm,
+            )
+        if ingest_track and self.track_service is not None and data.physics is not None:
+            self.track_service.ingest_position(
+                x=data.physics.position_x,
+                z=data.physics.position_z,
                 current_lap=data.current_lap,
-                total_laps=data.total_laps,
-                current_position=data.current_position,
-                total_cars=data.total_cars,
-                )
-            if self.track_service is not None and data.physics is not None:
-                self.track_service.ingest_position(
-                    x=data.physics.position_x,
-                    z=data.physics.position_z,
-                    current_lap=data.current_lap,
-                    last_lap_time=data.last_lap,
-                    current_fuel=data.fuel,
-                    throttle=data.throttle,
-                    brake=data.brake,
-                )
+                last_lap_time=data.last_lap,
+                current_fuel=data.fuel,
+                throttle=data.throttle,
+                brake=data.brake,
+                timestamp=data.packet_id / PACKET_RATE_HZ if data.packet_id is not None else None,
+                rx_time=rx_time,
+                sample=data,
+            )
 
     def start(self):
-        if self._running:
+        if self._running or self.client is None:
             return
         self._running = True
         self._thread = threading.Thread(target=self._loop, daemon=True)
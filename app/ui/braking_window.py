@@ -0,0 +1,201 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+from app.config import TRACK_NOTIFY_INTERVAL_MS
+from domain.braking import BrakingComparison, BrakingZone, compare_braking, detect_braking_zones
+from domain.lap_delta import ReferenceLap
+from domain.lap_telemetry import LapTelemetryState
+from app.ui.lap_notifier import LapChangeNotifier
+
+
+@dataclass(frozen=True)
+class BrakingAnalysis:
+    reference_lap: Optional[int]
+    zones_by_lap: dict[int, list[BrakingZone]]
+    comparisons: list[BrakingComparison]
+    # Id (LapTelemetryState.get_lap_ids) da volta de onde saíram as zonas de cada número.
+    lap_ids: dict[int, int]
+
+
+class _BrakingSignals(QtCore.QObject):
+    analysis_ready = QtCore.pyqtSignal(int, object)
+
+
+class _BrakingJob(QtCore.QRunnable):
+    """
+    Detecta as voltas fechadas que ainda não têm zonas e realinha tudo pela melhor
+    volta. Zonas conhecidas só valem para a mesma volta (mesmo id), não só o mesmo
+    número: depois de um reset / nova corrida a L1 é outra volta.
+    """
+
+    def __init__(
+        self,
+        generation: int,
+        lap_state: LapTelemetryState,
+        known: BrakingAnalysis,
+        signals: _BrakingSignals,
+    ):
+        super().__init__()
+        self._generation = generation
+        self._lap_state = lap_state
+        self._known = known
+        self._signals = signals
+
+    def run(self) -> None:
+        lap_times = self._lap_state.get_lap_times_ms()
+        lap_ids = self._lap_state.get_lap_ids()
+        zones_by_lap = {
+            lap_number: zones
+            for lap_number, zones in self._known.zones_by_lap.items()
+            if lap_number in lap_times and self._known.lap_ids.get(lap_number) == lap_ids.get(lap_number)
+        }
+        pending = set(lap_times) - set(zones_by_lap)
+        reference_lap = min(lap_times, key=lap_times.get) if lap_times else None
+        wanted = pending | ({reference_lap} if reference_lap is not None else set())
+
+        reference = None
+        for lap in self._lap_state.get_laps_snapshot(wanted):
+            if lap.lap_number in pending:
+                zones_by_lap[lap.lap_number] = detect_braking_zones(lap)
+            if lap.lap_number == reference_lap and len(lap.points) >= 2:
+                reference = ReferenceLap(lap.lap_number, lap.points)
+
+        comparisons = []
+        if reference is not None:
+            comparisons = compare_braking(reference, zones_by_lap.get(reference_lap, []), zones_by_lap)
+        self._signals.analysis_ready.emit(
+            self._generation,
+            BrakingAnalysis(
+                reference_lap=reference_lap,
+                zones_by_lap=zones_by_lap,
+                comparisons=comparisons,
+                lap_ids={lap_number: lap_ids[lap_number] for lap_number in zones_by_lap if lap_number in lap_ids},
+            ),
+        )
+
+
+class BrakingWindow(QtWidgets.QWidget):
+    """
+    Tabela curva × volta: ponto de frenagem de cada volta contra a melhor volta.
+    A detecção roda num worker quando uma volta fecha; a GUI só monta a tabela.
+    """
+
+    def __init__(self, lap_state: LapTelemetryState):
+        super().__init__()
+        self.lap_state = lap_state
+        self._summary_version = -1
+        self._generation = 0
+        self._running = False
+        self._rerun = False
+        self._analysis = BrakingAnalysis(reference_lap=None, zones_by_lap={}, comparisons=[], lap_ids={})
+
+        self.setWindowTitle("Braking points")
+        self.setMinimumSize(700, 400)
+        self.setStyleSheet(
+            "QWidget { background-color: black; color: white; }"
+            "QTableWidget { gridline-color: #3a3a3a; background-color: #101010; }"
+            "QHeaderView::section { background-color: #1f1f1f; color: #c8c8ff; border: 1px solid #3a3a3a; padding: 4px; }"
+        )
+
+        layout = QtWidgets.QVBoxLayout(self)
+        self.summary_label = QtWidgets.QLabel()
+        self.summary_label.setStyleSheet("color: #c8c8ff;")
+        self.table = QtWidgets.QTableWidget()
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        layout.addWidget(self.summary_label)
+        layout.addWidget(self.table, stretch=1)
+
+        self._pool = QtCore.QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._signals = _BrakingSignals()
+        self._signals.analysis_ready.connect(self._on_analysis_ready)
+
+        self.notifier = LapChangeNotifier(lap_state, min_interval_ms=TRACK_NOTIFY_INTERVAL_MS, parent=self)
+        self.notifier.laps_changed.connect(self._on_laps_changed)
+        self._render()
+
+    def _on_laps_changed(self, _laps: frozenset) -> None:
+        # Pontos novos não mudam nada aqui; só voltas fechando ou sendo descartadas.
+        if self.isVisible() and self.lap_state.get_summary_version() != self._summary_version:
+            self.analyze()
+
+    def showEvent(self, event) -> None:
+        super().showEvent(event)
+        if self.lap_state.get_summary_version() != self._summary_version:
+            self.analyze()
+
+    def analyze(self) -> None:
+        if self._running:
+            self._rerun = True
+            return
+        self._summary_version = self.lap_state.get_summary_version()
+        self._running = True
+        self._generation += 1
+        self._pool.start(
+            _BrakingJob(
+                generation=self._generation,
+                lap_state=self.lap_state,
+                known=self._analysis,
+                signals=self._signals,
+            )
+        )
+
+    def _on_analysis_ready(self, generation: int, analysis: BrakingAnalysis) -> None:
+        self._running = False
+        if generation == self._generation:
+            self._analysis = analysis
+            self._render()
+        if self._rerun or self.lap_state.get_summary_version() != self._summary_version:
+            self._rerun = False
+            self.analyze()
+
+    def _render(self) -> None:
+        analysis = self._analysis
+        reference_zones = analysis.zones_by_lap.get(analysis.reference_lap, [])
+        laps = sorted(lap_number for lap_number in analysis.zones_by_lap if lap_number != analysis.reference_lap)
+
+        if analysis.reference_lap is None:
+            self.summary_label.setText("Sem volta fechada ainda.")
+        else:
+            self.summary_label.setText(
+                f"Referência: L{analysis.reference_lap} (melhor volta) — "
+                "diferença no ponto de frenagem, + = freou depois"
+            )
+
+        self.table.clear()
+        self.table.setColumnCount(2 + len(laps))
+        self.table.setRowCount(len(reference_zones))
+        self.table.setHorizontalHeaderLabels(
+            ["Curva", f"L{analysis.reference_lap}" if analysis.reference_lap is not None else "Ref"]
+            + [f"L{lap_number}" for lap_number in laps]
+        )
+        for corner, zone in enumerate(reference_zones):
+            self.table.setItem(corner, 0, QtWidgets.QTableWidgetItem(f"T{corner + 1}"))
+            self.table.setItem(
+                corner,
+                1,
+                QtWidgets.QTableWidgetItem(f"{zone.onset_m:.0f} m · {zone.peak_brake * 100:.0f}% · {zone.duration_s:.2f} s"),
+            )
+
+        columns = {lap_number: column for column, lap_number in enumerate(laps, start=2)}
+        for comparison in analysis.comparisons:
+            column = columns.get(comparison.lap_number)
+            if column is None:
+                continue
+            item = QtWidgets.QTableWidgetItem(f"{comparison.onset_delta_m:+.0f} m")
+            item.setToolTip(
+                f"Início {comparison.zone.onset_m:.0f} m (ref {comparison.onset_ref_m:.0f} m)\n"
+                f"Soltou em {comparison.zone.release_m:.0f} m\n"
+                f"Pico {comparison.zone.peak_brake * 100:.0f}% ({comparison.peak_delta * 100:+.0f}%)\n"
+                f"Duração {comparison.zone.duration_s:.2f} s ({comparison.duration_delta_s:+.2f} s)"
+            )
+            # Verde freou depois, vermelho freou antes (a partir de ~5 m).
+            if comparison.onset_delta_m > 5.0:
+                item.setForeground(QtGui.QColor(80, 230, 120))
+            elif comparison.onset_delta_m < -5.0:
+                item.setForeground(QtGui.QColor(255, 90, 90))
+            self.table.setItem(comparison.corner, column, item)
+        self.table.resizeColumnsToContents()
@@ -0,0 +1,119 @@
+from typing import Optional
+
+from PyQt5 import QtCore, QtGui
+import pyqtgraph as pg
+from pyqtgraph.Qt import internals
+import numpy as np
+
+# Segmentos sem valor (canal ausente / NaN).
+MISSING_COLOR = (90, 90, 90, 160)
+
+
+class ColoredLineItem(pg.GraphicsObject):
+    """
+    Linha com cor por vértice num item só. O segmento i -> i+1 pega a cor do
+    ponto final (como os estilos de pedal); os segmentos são agrupados pelo
+    índice na LUT e cada grupo é um drawLines, então o custo de pintura é de
+    até len(lut) chamadas por volta, não uma por segmento.
+
+    set_geometry() guarda os segmentos com uma key de quem chamou (ex.: nível
+    de LOD + vista); set_colors() só refaz o agrupamento, então trocar o canal
+    de cor não recalcula a geometria.
+    """
+
+    def __init__(self, width: float = 2.0):
+        super().__init__()
+        self._width = width
+        self._segments = np.empty((0, 4), dtype=float)
+        self._end_index = np.empty(0, dtype=np.intp)
+        self._geometry_key = None
+        self._groups: list[tuple[QtGui.QPen, object]] = []
+        self._pens: list[QtGui.QPen] = []
+        self._lut: Optional[np.ndarray] = None
+        self._missing_pen = self._make_pen(MISSING_COLOR)
+        self._bounds = QtCore.QRectF()
+
+    def clear(self) -> None:
+        self.set_geometry(np.empty(0), np.empty(0))
+
+    def set_geometry(
+        self,
+        x: np.ndarray,
+        z: np.ndarray,
+        visible: Optional[np.ndarray] = None,
+        key: Optional[tuple] = None,
+    ) -> None:
+        """visible: máscara por segmento (ex.: visible_segment_mask); None = todos."""
+        self._geometry_key = key
+        if len(x) < 2:
+            starts = np.empty(0, dtype=np.intp)
+        elif visible is None:
+            starts = np.arange(len(x) - 1)
+        else:
+            starts = np.flatnonzero(visible)
+        segments = np.empty((len(starts), 4), dtype=float)
+        segments[:, 0] = x[starts]
+        segments[:, 1] = z[starts]
+        segments[:, 2] = x[starts + 1]
+        segments[:, 3] = z[starts + 1]
+
+        self.prepareGeometryChange()
+        self._segments = segments
+        self._end_index = starts + 1
+        self._groups = []
+        if len(segments):
+            min_x = min(segments[:, 0].min(), segments[:, 2].min())
+            max_x = max(segments[:, 0].max(), segments[:, 2].max())
+            min_z = min(segments[:, 1].min(), segments[:, 3].min())
+            max_z = max(segments[:, 1].max(), segments[:, 3].max())
+            self._bounds = QtCore.QRectF(min_x, min_z, max_x - min_x, max_z - min_z)
+        else:
+            self._bounds = QtCore.QRectF()
+        self.update()
+
+    def geometry_key(self) -> Optional[tuple]:
+        return self._geometry_key
+
+    def set_colors(self, values: np.ndarray, lut: np.ndarray, levels: tuple[float, float]) -> None:
+        """
+        values: um valor por vértice (mesmo tamanho do x de set_geometry).
+        lut: (n, 3|4) uint8; levels: valores mapeados para a primeira / última cor.
+        """
+        if lut is not self._lut:
+            self._lut = lut
+            self._pens = [self._make_pen(tuple(int(c) for c in color)) for color in lut]
+
+        segment_values = values[self._end_index]
+        low, high = levels
+        scale = (len(lut) - 1) / (high - low) if high > low else 0.0
+        valid = np.isfinite(segment_values)
+        index = np.full(len(segment_values), -1, dtype=np.intp)
+        index[valid] = np.clip((segment_values[valid] - low) * scale, 0, len(lut) - 1).astype(np.intp)
+
+        order = np.argsort(index, kind="stable")
+        sorted_index = index[order]
+        bounds = np.flatnonzero(np.diff(sorted_index)) + 1
+        groups = []
+        for chunk in np.split(order, bounds):
+            if len(chunk) == 0:
+                continue
+            color_index = int(index[chunk[0]])
+            lines = internals.PrimitiveArray(QtCore.QLineF, 4)
+            lines.resize(len(chunk))
+            lines.ndarray()[:] = self._segments[chunk]
+            groups.append((self._pens[color_index] if color_index >= 0 else self._missing_pen, lines))
+        self._groups = groups
+        self.update()
+
+    def _make_pen(self, color) -> QtGui.QPen:
+        pen = pg.mkPen(color=color, width=self._width)
+        pen.setCapStyle(QtCore.Qt.RoundCap)
+        return pen
+
+    def boundingRect(self) -> QtCore.QRectF:
+        return self._bounds
+
+    def paint(self, painter, *_args) -> None:
+        for pen, lines in self._groups:
+            painter.setPen(pen)
+            painter.drawLines(*lines.drawargs())
@@ -1,34 +1,99 @@
-from PyQt5 import QtWidgets, QtCore
+import time
+from typing import Optional
+
+from PyQt5 import QtWidgets, QtCore, QtGui
+from app.config import (
+    UI_FRAME_BUDGET_MS,
+    UI_IDLE_INTERVAL_MS,
+    UI_MAX_DEFERRED_FRAMES,
+    UI_PREDICT_GAUGES,
+    UI_PROFILE_DIR,
+    UI_PROFILER_ENABLED,
+    UI_QUALITY_AUTO,
+    UI_RACING_INTERVAL_MS,
+    UI_STALE_AFTER_S,
+)
 from domain.game_state import GameState
+from domain.ghost import GhostCar
+from domain.lap_delta import LapDeltaEngine
 from domain.lap_telemetry import LapTelemetryState
+from domain.sectors import SectorTimingEngine
+from domain.motion_predictor import MotionEstimate, MotionPredictor
+from app.replay import ReplayService
 from app.ui.speed_hauge import SpeedGauge
 from app.ui.rpm_gauge import RpmGauge
 from app.ui.lap_info_panel import LapInfoPanel
 from app.ui.telemetry_graph import TelemetryGraph
 from app.ui.fuel_panel import FuelPanel
+from app.ui.delta_panel import DeltaPanel, format_lap_time
 from app.ui.track_window import TrackWindow
+from app.ui.braking_window import BrakingWindow
+from app.ui.trace_window import TraceWindow
+from app.ui.timeline_scrubber import TimelineScrubber
+from app.ui.frame_clock import FrameClock, PRIORITY_CRITICAL, PRIORITY_LOW, PRIORITY_NORMAL
+from app.ui.quality import QualityGovernor
+from app.ui.profiler import ProfilerHud, export_profile, measure, profiler
+from app.ui.ui_rate import MODE_PAUSED, MODE_RACING, MODE_STALE, UiRateController
 
 class DashboardWindow(QtWidgets.QWidget):
 
-    def __init__(self, state: GameState = None, lap_state: LapTelemetryState = None):
+    def __init__(
+        self,
+        state: GameState = None,
+        lap_state: LapTelemetryState = None,
+        predictor: MotionPredictor = None,
+        delta: LapDeltaEngine = None,
+        sectors: SectorTimingEngine = None,
+        ghost: GhostCar = None,
+        replay: ReplayService = None,
+    ):
         super().__init__()
         self.setWindowTitle("Racing Dashboard")
         self.setMinimumSize(1500, 700)
         self.setStyleSheet("background-color: black;")
         self.state = state
         self.lap_state = lap_state
+        self.predictor = predictor
+        self.delta = delta
+        self.sectors = sectors
+        self.ghost = ghost
+        self.replay = replay
         self.track_window = None
+        self.braking_window = None
+        self.trace_window = None
+        self._last_frame = -1
+        self._last_panels_frame = -1
+        self._lap_state_version = -1
+        self._last_lap_consume = None
+        self._average_consume = None
 
-        self.refrehsh_timer = QtCore.QTimer()
-        self.refrehsh_timer.timeout.connect(self.refresh)
-        self.refrehsh_timer.start(16)  # Refresh every 16ms (~60 FPS)
+        # Um único relógio para a UI inteira (~60 FPS); ver add_task mais abaixo.
+        self.clock = FrameClock(
+            interval_ms=UI_RACING_INTERVAL_MS,
+            budget_ms=UI_FRAME_BUDGET_MS,
+            max_deferred_frames=UI_MAX_DEFERRED_FRAMES,
+        )
 
         root_layout = QtWidgets.QVBoxLayout(self)
         root_layout.setSpacing(10)
         root_layout.setContentsMargins(20, 20, 20, 20)
 
         controls_layout = QtWidgets.QHBoxLayout()
+        self.status_label = QtWidgets.QLabel()
+        self.status_label.setStyleSheet("color: #ff5a5a; font: bold 14px Arial;")
+        self.status_label.hide()
+        controls_layout.addWidget(self.status_label)
         controls_layout.addStretch(1)
+        # Referência do delta: melhor volta guardada ou uma volta fixa.
+        self.reference_combo = QtWidgets.QComboBox()
+        self.reference_combo.setStyleSheet(
+            "QComboBox { color: white; background-color: #1f1f1f; "
+            "border: 1px solid #4a4a4a; padding: 5px 10px; }"
+        )
+        self.reference_combo.addItem("Delta: best lap", None)
+        self.reference_combo.currentIndexChanged.connect(self._on_reference_changed)
+        self.reference_combo.setVisible(self.delta is not None)
+        controls_layout.addWidget(self.reference_combo)
         self.track_button = QtWidgets.QPushButton("Track map")
         self.track_button.setStyleSheet(
             "QPushButton { color: white; background-color: #1f1f1f; "
@@ -37,6 +102,14 @@ class DashboardWindow(QtWidgets.QWidget):
         )
         self.track_button.clicked.connect(self.toggle_track_window)
         controls_layout.addWidget(self.track_button)
+        self.braking_button = QtWidgets.QPushButton("Braking")
+        self.braking_button.setStyleSheet(self.track_button.styleSheet())
+        self.braking_button.clicked.connect(self.toggle_braking_window)
+        controls_layout.addWidget(self.braking_button)
+        self.trace_button = QtWidgets.QPushButton("Traces")
+        self.trace_button.setStyleSheet(self.track_button.styleSheet())
+        self.trace_button.clicked.connect(self.toggle_trace_window)
+        controls_layout.addWidget(self.trace_button)
         root_layout.addLayout(controls_layout)
 
         # =========================
@@ -54,6 +127,8 @@ class DashboardWindow(QtWidgets.QWidget):
         self.lap_panel = LapInfoPanel()
         self.graph_panel = TelemetryGraph()
         self.fuel_panel = FuelPanel()
+        self.delta_panel = DeltaPanel()
+        self.delta_panel.setVisible(self.delta is not None)
 
         # =========================
         # Coluna Central
@@ -64,6 +139,7 @@ class DashboardWindow(QtWidgets.QWidget):
         center_layout.setContentsMargins(0, 0, 0, 0)
 
         center_layout.addWidget(self.lap_panel, stretch=1)
+        center_layout.addWidget(self.delta_panel, stretch=1)
         center_layout.addWidget(self.graph_panel, stretch=2)
         center_layout.addWidget(self.fuel_panel, stretch=1)
 
@@ -74,32 +150,221 @@ class DashboardWindow(QtWidgets.QWidget):
         main_layout.addWidget(center_widget, stretch=1)
         main_layout.addWidget(self.rpm_gauge, stretch=1)
         root_layout.addLayout(main_layout, stretch=1)
-    
+
+        # Replay de captura: linha do tempo embaixo dos mostradores.
+        self.scrubber = None
+        if self.replay is not None:
+            self.scrubber = TimelineScrubber(self.replay)
+            root_layout.addWidget(self.scrubber)
+
+        # =========================
+        # Tarefas do frame
+        # =========================
+        # RPM / marcha sugerida primeiro e nunca adiados; traçado por último.
+        self.clock.add_task("gauges", self.refresh, PRIORITY_CRITICAL)
+        self.clock.add_task("rpm_blink", self.rpm_gauge.advance_blink, PRIORITY_CRITICAL, RpmGauge.BLINK_INTERVAL_MS)
+        self.clock.add_task("panels", self._refresh_panels, PRIORITY_NORMAL)
+        self.clock.add_task("fuel_blink", self.fuel_panel.advance_blink, PRIORITY_NORMAL, FuelPanel.BLINK_INTERVAL_MS)
+
+        self.rate = None
+        if self.state is not None:
+            self.rate = UiRateController(
+                state=self.state,
+                racing_interval_ms=UI_RACING_INTERVAL_MS,
+                idle_interval_ms=UI_IDLE_INTERVAL_MS,
+                stale_after_s=UI_STALE_AFTER_S,
+            )
+            self.rate.mode_changed.connect(self._on_rate_mode_changed)
+            self.rate.register(self.clock.timer)
+            self.rate.update()
+
+        self.quality = None
+        if UI_QUALITY_AUTO:
+            # Só mede correndo: pausado o timer anda no intervalo ocioso.
+            self.quality = QualityGovernor(
+                clock=self.clock,
+                active=self.rate.is_racing if self.rate is not None else None,
+            )
+            for widget in (self.speed_gauge, self.rpm_gauge, self.graph_panel):
+                self.quality.register(widget)
+            self.clock.add_task("quality", self.quality.sample, PRIORITY_CRITICAL)
+
+        # Profiler: F3 liga/desliga medição + HUD, F4 exporta CSV / Chrome trace.
+        self.profiler_hud = ProfilerHud(self)
+        self.clock.add_task("profiler_hud", self.profiler_hud.refresh, PRIORITY_LOW, 250)
+        QtWidgets.QShortcut(QtGui.QKeySequence(QtCore.Qt.Key_F3), self, self.toggle_profiler)
+        QtWidgets.QShortcut(QtGui.QKeySequence(QtCore.Qt.Key_F4), self, self.export_profile)
+        if UI_PROFILER_ENABLED:
+            self.toggle_profiler()
+        self.clock.start()
+
+    @measure("DashboardWindow.refresh")
     def refresh(self):
-        # Atualiza dados dos widgets
-        self.speed_gauge.speed = self.state.speed_kmh
-        self.rpm_gauge.rpm = self.state.rpm
-        self.rpm_gauge.rpm_warn = self.state.rpm_warn
-        self.rpm_gauge.rpm_rev_limiter = self.state.rpm_rev_limiter
+        if self.state is None:
+            return
+        mode = self.rate.update()
+        if mode == MODE_STALE:
+            self._update_stale_label()
+
+        # Com previsão, velocidade e RPM andam a cada frame, mesmo sem pacote novo.
+        predicted = self._predicted_motion() if UI_PREDICT_GAUGES and mode == MODE_RACING else None
+        if predicted is not None:
+            self._set_speed_rpm(predicted.speed_kmh, predicted.rpm)
+
+        # Nada chegou desde o último tick: nenhum widget precisa repintar.
+        frame = self.state.frame
+        if frame == self._last_frame:
+            return
+        self._last_frame = frame
+
+        if predicted is None:
+            self._set_speed_rpm(self.state.speed_kmh, self.state.rpm)
+        # Idade pacote→pixel medida pelo profiler no paintEvent de cada widget.
+        for widget in (self.speed_gauge, self.rpm_gauge, self.lap_panel, self.delta_panel):
+            widget.data_rx_time = self.state.rx_time
+        if self.delta is not None:
+            self.delta_panel.set_reading(self.delta.reading())
+        self.lap_panel.set_values(
+            gear=str(self.state.gear),
+            suggested_gear=str(self.state.suggested_gear),
+            best_lap=self.state.best_lap,
+            last_lap=self.state.last_lap,
+            current_lap=self.state.current_lap,
+            total_laps=self.state.total_laps,
+            position=self.state.current_position,
+            total_cars=self.state.total_cars,
+        )
+
+    def _set_speed_rpm(self, speed_kmh, rpm):
+        if speed_kmh is not None:
+            self.speed_gauge.set_speed(speed_kmh)
+        if rpm is not None:
+            self.rpm_gauge.set_values(
+                rpm=rpm,
+                rpm_warn=self.state.rpm_warn,
+                rpm_rev_limiter=self.state.rpm_rev_limiter,
+            )
+
+    def _predicted_motion(self) -> Optional[MotionEstimate]:
+        if self.predictor is None:
+            return None
+        estimate = self.predictor.predict()
+        if estimate is None or estimate.age_s > UI_STALE_AFTER_S:
+            return None
+        return estimate
+
+    def _update_car_marker(self):
+        if self.track_window is None or not self.track_window.isVisible():
+            return
+        estimate = self._predicted_motion()
+        if estimate is None:
+            self.track_window.canvas.clear_car_position()
+            return
+        rx_time = time.monotonic() - estimate.age_s
+        self.track_window.canvas.set_car_position(estimate.x, estimate.z, rx_time=rx_time)
+
+    def _update_ghost_marker(self):
+        # A cada frame, pelo relógio extrapolado do GhostCar (não espera o refresh do mapa).
+        if self.track_window is None or not self.track_window.isVisible():
+            return
+        position = self.ghost.position()
+        if position is None:
+            self.track_window.canvas.clear_ghost_position()
+            return
+        self.track_window.canvas.set_ghost_position(*position)
+
+    @measure("DashboardWindow.panels")
+    def _refresh_panels(self):
+        if self.state is None:
+            return
+        frame = self.state.frame
+        if frame == self._last_panels_frame:
+            return
+        self._last_panels_frame = frame
+        self.graph_panel.data_rx_time = self.state.rx_time
+        self.fuel_panel.data_rx_time = self.state.rx_time
+
         self.graph_panel.set_inputs(
             self.state.throttle,
             self.state.brake
         )
-        self.fuel_panel.fuel_percent = self.state.fuel_ratio
-        if self.lap_state is not None:
-            self.fuel_panel.last_lap_consume = self.lap_state.get_last_lap_consumption()
-            self.fuel_panel.remaining_laps = self.lap_state.estimate_remaining_laps(self.state.fuel)
-        self.lap_panel.gear = str(self.state.gear)
-        self.lap_panel.suggested_gear = str(self.state.suggested_gear)
-        self.lap_panel.best_lap = self.state.best_lap
-        self.lap_panel.last_lap = self.state.last_lap
-        self.lap_panel.current_lap = self.state.current_lap
-        self.lap_panel.total_laps = self.state.total_laps
-        self.lap_panel.position = self.state.current_position
-        self.lap_panel.total_cars = self.state.total_cars
-        
-
-        self.update()
+        self._refresh_consumption()
+        remaining_laps = None
+        if self._average_consume is not None and self.state.fuel > 0:
+            remaining_laps = self.state.fuel / self._average_consume
+        self.fuel_panel.set_values(
+            fuel_percent=self.state.fuel_ratio,
+            last_lap_consume=self._last_lap_consume,
+            remaining_laps=remaining_laps,
+        )
+
+    def toggle_profiler(self):
+        profiler.enabled = not profiler.enabled
+        self.profiler_hud.setVisible(profiler.enabled)
+        self.profiler_hud.refresh()
+
+    def export_profile(self):
+        csv_path, trace_path = export_profile(UI_PROFILE_DIR)
+        QtWidgets.QMessageBox.information(self, "Profiler", f"Profile exportado:\n{csv_path}\n{trace_path}")
+
+    def _on_rate_mode_changed(self, mode: str):
+        racing = mode == MODE_RACING
+        self.rpm_gauge.set_blinking(racing)
+        self.fuel_panel.set_blinking(racing)
+        if mode == MODE_STALE:
+            self._update_stale_label()
+            self.status_label.show()
+        elif mode == MODE_PAUSED:
+            self.status_label.setText("PAUSADO")
+            self.status_label.show()
+        else:
+            self.status_label.hide()
+
+    def _update_stale_label(self):
+        age = self.rate.seconds_since_last_packet()
+        if age is None:
+            self.status_label.setText("SEM TELEMETRIA")
+        else:
+            self.status_label.setText(f"SEM TELEMETRIA ({age:.0f}s)")
+
+    def _refresh_consumption(self):
+        # Consumo só muda quando uma volta fecha; evita travar o lock a cada frame.
+        if self.lap_state is None:
+            return
+        version = self.lap_state.get_summary_version()
+        if version == self._lap_state_version:
+            return
+        self._lap_state_version = version
+        self._last_lap_consume = self.lap_state.get_last_lap_consumption()
+        average = self.lap_state.get_average_consumption_per_lap()
+        self._average_consume = average if average is not None and average > 0 else None
+        self._refresh_reference_choices()
+
+    def _refresh_reference_choices(self):
+        if self.delta is None:
+            return
+        lap_times = self.lap_state.get_lap_times_ms()
+        choices = [None] + sorted(lap_times)
+        current = [self.reference_combo.itemData(index) for index in range(self.reference_combo.count())]
+        if choices == current:
+            return
+        selected = self.reference_combo.currentData()
+        self.reference_combo.blockSignals(True)
+        self.reference_combo.clear()
+        self.reference_combo.addItem("Delta: best lap", None)
+        for lap_number in sorted(lap_times):
+            label = format_lap_time(lap_times[lap_number] / 1000.0)
+            self.reference_combo.addItem(f"Delta: L{lap_number} ({label})", lap_number)
+        index = self.reference_combo.findData(selected)
+        self.reference_combo.setCurrentIndex(max(0, index))
+        self.reference_combo.blockSignals(False)
+        if index < 0 and selected is not None:
+            # Volta escolhida foi descartada: volta para a melhor.
+            self.delta.set_reference_lap(None)
+
+    def _on_reference_changed(self, index: int):
+        if self.delta is not None:
+            self.delta.set_reference_lap(self.reference_combo.itemData(index))
 
     def toggle_track_window(self):
         if self.lap_state is None:
@@ -114,6 +379,45 @@ class DashboardWindow(QtWidgets.QWidget):
             self.track_window.raise_()
             self.track_window.activateWindow()
 
+    def toggle_braking_window(self):
+        if self.lap_state is None:
+            return
+        if self.braking_window is None:
+            self.braking_window = BrakingWindow(lap_state=self.lap_state)
+        if self.braking_window.isVisible():
+            self.braking_window.hide()
+        else:
+            self.braking_window.show()
+            self.braking_window.raise_()
+            self.braking_window.activateWindow()
+
+    def toggle_trace_window(self):
+        if self.lap_state is None:
+            return
+        if self.trace_window is None:
+            # O crosshair marca o ponto no mapa: o canvas vem da janela da pista.
+            self.open_track_window()
+            self.trace_window = TraceWindow(lap_state=self.lap_state, canvas=self.track_window.canvas)
+        if self.trace_window.isVisible():
+            self.trace_window.hide()
+        else:
+            self.trace_window.show()
+            self.trace_window.raise_()
+            self.trace_window.activateWindow()
+
     def open_track_window(self):
         if self.track_window is None and self.lap_state is not None:
-            self.track_window = TrackWindow(lap_state=self.lap_state)
+            self.track_window = TrackWindow(
+                lap_state=self.lap_state,
+                frame_clock=self.clock,
+                sectors=self.sectors,
+                ghost=self.ghost,
+                replay=self.replay,
+            )
+            self.clock.add_task("track", self.track_window.refresh, PRIORITY_LOW)
+            if self.predictor is not None:
+                self.clock.add_task("car_marker", self._update_car_marker, PRIORITY_NORMAL)
+            if self.ghost is not None:
+                self.clock.add_task("ghost_marker", self._update_ghost_marker, PRIORITY_NORMAL)
+            if self.quality is not None:
+                self.quality.register(self.track_window.canvas)
@@ -0,0 +1,131 @@
+from typing import Optional
+
+from PyQt5 import QtWidgets, QtGui
+
+from app.ui import theme
+from app.ui.profiler import measure_paint
+from domain.lap_delta import DeltaReading
+
+
+def format_lap_time(seconds: Optional[float]) -> str:
+    if seconds is None or seconds <= 0:
+        return "--:--.---"
+    minutes, rest = divmod(seconds, 60.0)
+    return f"{int(minutes)}:{rest:06.3f}"
+
+
+class DeltaPanel(QtWidgets.QWidget):
+    # Barra cheia em ±RANGE_S.
+    RANGE_S = 1.0
+
+    def __init__(self):
+        super().__init__()
+
+        self.setMinimumHeight(110)
+
+        self.delta_s: Optional[float] = None
+        self.reference_lap: Optional[int] = None
+        self.reference_lap_s: Optional[float] = None
+        self.predicted_lap_s: Optional[float] = None
+
+        self._sized = theme.SizedResources(self._build_gradients)
+
+    def display_state(self):
+        delta_text = "--" if self.delta_s is None else f"{self.delta_s:+.3f}"
+        return (
+            delta_text,
+            self._bar_width(),
+            self.reference_lap,
+            format_lap_time(self.reference_lap_s),
+            format_lap_time(self.predicted_lap_s),
+        )
+
+    def set_reading(self, reading: Optional[DeltaReading]) -> bool:
+        before = self.display_state()
+        if reading is None:
+            self.delta_s = None
+            self.predicted_lap_s = None
+        else:
+            self.delta_s = reading.delta_s
+            self.reference_lap = reading.reference_lap
+            self.reference_lap_s = reading.reference_lap_s
+            self.predicted_lap_s = reading.predicted_lap_s
+        if self.display_state() == before:
+            return False
+        self.update()
+        return True
+
+    def _bar_width(self) -> int:
+        if self.delta_s is None:
+            return 0
+        half = (self.width() - 2 * 20) / 2
+        fraction = max(-1.0, min(1.0, self.delta_s / self.RANGE_S))
+        return int(half * fraction)
+
+    def _build_gradients(self, width: int, height: int) -> dict:
+        return {
+            "background": theme.linear_gradient(0, 0, 0, height, (
+                (0, (10, 14, 34)),
+                (1, (3, 5, 16)),
+            )),
+        }
+
+    # =========================================================
+    # PAINT
+    # =========================================================
+    @measure_paint("DeltaPanel.paint")
+    def paintEvent(self, e):
+        painter = QtGui.QPainter(self)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+
+        rect = self.rect()
+        margin = 20
+
+        painter.fillRect(rect, self._sized.get(rect.width(), rect.height())["background"])
+
+        # Verde ganhando tempo, vermelho perdendo.
+        if self.delta_s is None:
+            value_rgb = (200, 200, 230)
+        elif self.delta_s <= 0:
+            value_rgb = (80, 230, 120)
+        else:
+            value_rgb = (255, 80, 80)
+
+        # ----- LEFT (Delta) -----
+        painter.setFont(theme.font(9))
+        painter.setPen(theme.color(170, 180, 255))
+        reference = "--" if self.reference_lap is None else f"L{self.reference_lap}"
+        painter.drawText(margin, 20, f"Delta vs {reference}")
+
+        painter.setFont(theme.font(32, bold=True))
+        painter.setPen(theme.color(*value_rgb))
+        painter.drawText(margin, 62, "--" if self.delta_s is None else f"{self.delta_s:+.3f}")
+
+        # ----- RIGHT (Reference / Predicted) -----
+        right_x = rect.width() - 150
+
+        painter.setFont(theme.font(9))
+        painter.setPen(theme.color(170, 180, 255))
+        painter.drawText(right_x, 20, "Reference")
+        painter.drawText(right_x, 52, "Predicted")
+
+        painter.setFont(theme.font(14, bold=True))
+        painter.setPen(theme.color(200, 200, 255))
+        painter.drawText(right_x, 38, format_lap_time(self.reference_lap_s))
+        painter.setPen(theme.color(255, 255, 255))
+        painter.drawText(right_x, 70, format_lap_time(self.predicted_lap_s))
+
+        # ----- BAR -----
+        bar_top = rect.height() - 26
+        bar_height = 12
+        center_x = rect.width() // 2
+        painter.fillRect(margin, bar_top, rect.width() - 2 * margin, bar_height, theme.color(25, 35, 55))
+
+        bar_width = self._bar_width()
+        if bar_width > 0:
+            painter.fillRect(center_x, bar_top, bar_width, bar_height, theme.color(*value_rgb))
+        elif bar_width < 0:
+            painter.fillRect(center_x + bar_width, bar_top, -bar_width, bar_height, theme.color(*value_rgb))
+
+        painter.setPen(theme.pen((230, 230, 255, 220), 2))
+        painter.drawLine(center_x, bar_top - 3, center_x, bar_top + bar_height + 3)
@@ -0,0 +1,83 @@
+from typing import Optional
+
+from PyQt5 import QtCore
+
+from app.services.lap_export import export_laps
+from domain.lap_telemetry import LapTelemetryState
+
+
+class _ExportSignals(QtCore.QObject):
+    progress = QtCore.pyqtSignal(int, int)
+    finished = QtCore.pyqtSignal(str, int)
+    failed = QtCore.pyqtSignal(str)
+
+
+class _ExportJob(QtCore.QRunnable):
+    def __init__(
+        self,
+        lap_state: LapTelemetryState,
+        path: str,
+        fmt: str,
+        lap_numbers: Optional[set[int]],
+        signals: _ExportSignals,
+    ):
+        super().__init__()
+        self._lap_state = lap_state
+        self._path = path
+        self._fmt = fmt
+        self._lap_numbers = lap_numbers
+        self._signals = signals
+
+    def run(self) -> None:
+        try:
+            rows = export_laps(
+                self._lap_state,
+                self._path,
+                self._fmt,
+                lap_numbers=self._lap_numbers,
+                progress=self._signals.progress.emit,
+            )
+        except Exception as exc:  # O worker não pode derrubar a UI: o erro vira sinal.
+            self._signals.failed.emit(f"{type(exc).__name__}: {exc}")
+            return
+        self._signals.finished.emit(self._path, rows)
+
+
+class ExportWorker(QtCore.QObject):
+    """
+    Export de voltas fora da thread da GUI; um export por vez. Os sinais chegam
+    na thread da GUI (conexão enfileirada do QObject de sinais).
+    """
+
+    progress = QtCore.pyqtSignal(int, int)
+    finished = QtCore.pyqtSignal(str, int)
+    failed = QtCore.pyqtSignal(str)
+
+    def __init__(self, lap_state: LapTelemetryState, parent=None):
+        super().__init__(parent)
+        self.lap_state = lap_state
+        self._running = False
+        self._pool = QtCore.QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._signals = _ExportSignals()
+        self._signals.progress.connect(self.progress)
+        self._signals.finished.connect(self._on_finished)
+        self._signals.failed.connect(self._on_failed)
+
+    def is_running(self) -> bool:
+        return self._running
+
+    def start(self, path: str, fmt: str, lap_numbers: Optional[set[int]] = None) -> bool:
+        if self._running:
+            return False
+        self._running = True
+        self._pool.start(_ExportJob(self.lap_state, path, fmt, lap_numbers, self._signals))
+        return True
+
+    def _on_finished(self, path: str, rows: int) -> None:
+        self._running = False
+        self.finished.emit(path, rows)
+
+    def _on_failed(self, message: str) -> None:
+        self._running = False
+        self.failed.emit(message)
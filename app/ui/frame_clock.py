@@ -0,0 +1,117 @@
+from dataclasses import dataclass
+import time
+from typing import Callable, Optional
+
+from PyQt5 import QtCore
+
+from app.ui.profiler import profiler
+
+# Prioridade menor roda primeiro. Tarefas críticas nunca são adiadas.
+PRIORITY_CRITICAL = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+
+@dataclass
+class FrameTask:
+    name: str
+    callback: Callable[[], None]
+    priority: int
+    interval_ms: float = 0.0
+    enabled: bool = True
+    last_run: float = 0.0
+    # Média móvel do custo (ms), usada para prever se a tarefa cabe no que sobrou do frame.
+    cost_ms: float = 0.0
+    deferred_frames: int = 0
+    deferred_total: int = 0
+
+
+class FrameClock(QtCore.QObject):
+    """
+    Relógio único da UI: um QTimer chama as tarefas em ordem de prioridade e todos
+    os update() do frame caem no mesmo ciclo de pintura.
+
+    Tarefas não críticas que não cabem no orçamento do frame ficam para o próximo;
+    depois de max_deferred_frames seguidos rodam mesmo assim, para não morrerem de fome.
+    """
+
+    def __init__(self, interval_ms: int = 16, budget_ms: float = 10.0, max_deferred_frames: int = 6):
+        super().__init__()
+        self.budget_ms = budget_ms
+        self.max_deferred_frames = max_deferred_frames
+        self.frame = 0
+        self.last_frame_ms = 0.0
+        # Intervalo real entre o início deste tick e o anterior: inclui as pinturas do frame.
+        self.last_period_ms = 0.0
+        self._last_tick = 0.0
+        self._tasks: list[FrameTask] = []
+
+        self.timer = QtCore.QTimer(self)
+        self.timer.setTimerType(QtCore.Qt.PreciseTimer)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.tick)
+
+    def start(self) -> None:
+        self.timer.start()
+
+    def stop(self) -> None:
+        self.timer.stop()
+
+    def add_task(
+        self,
+        name: str,
+        callback: Callable[[], None],
+        priority: int = PRIORITY_NORMAL,
+        interval_ms: float = 0.0,
+    ) -> FrameTask:
+        """
+        interval_ms=0 roda a cada frame; acima disso, no primeiro frame após o intervalo.
+        """
+        task = FrameTask(name=name, callback=callback, priority=priority, interval_ms=interval_ms)
+        self._tasks.append(task)
+        self._tasks.sort(key=lambda item: item.priority)
+        return task
+
+    def task(self, name: str) -> Optional[FrameTask]:
+        for task in self._tasks:
+            if task.name == name:
+                return task
+        return None
+
+    def set_task_enabled(self, name: str, enabled: bool) -> None:
+        task = self.task(name)
+        if task is not None:
+            task.enabled = enabled
+
+    def tick(self) -> None:
+        self.frame += 1
+        frame_start = time.perf_counter()
+        if self._last_tick:
+            self.last_period_ms = (frame_start - self._last_tick) * 1000.0
+            if profiler.enabled:
+                profiler.record_value("FrameClock.lateness", self.last_period_ms - self.timer.interval())
+        self._last_tick = frame_start
+        for task in self._tasks:
+            if not task.enabled:
+                continue
+            now = time.perf_counter()
+            if task.interval_ms > 0 and (now - task.last_run) * 1000.0 < task.interval_ms:
+                continue
+
+            if task.priority > PRIORITY_CRITICAL and task.deferred_frames < self.max_deferred_frames:
+                spent_ms = (now - frame_start) * 1000.0
+                if spent_ms + task.cost_ms > self.budget_ms:
+                    task.deferred_frames += 1
+                    task.deferred_total += 1
+                    continue
+
+            task.callback()
+            finished = time.perf_counter()
+            cost_ms = (finished - now) * 1000.0
+            task.cost_ms = cost_ms if task.last_run == 0.0 else task.cost_ms * 0.8 + cost_ms * 0.2
+            task.last_run = now
+            task.deferred_frames = 0
+        frame_end = time.perf_counter()
+        self.last_frame_ms = (frame_end - frame_start) * 1000.0
+        if profiler.enabled:
+            profiler.record("FrameClock.tick", frame_start, frame_end - frame_start)
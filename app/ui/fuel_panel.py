@@ -1,6 +1,10 @@
 from PyQt5 import QtWidgets, QtCore, QtGui
 
+from app.ui import theme
+from app.ui.profiler import measure_paint
+
 class FuelPanel(QtWidgets.QWidget):
+    BLINK_INTERVAL_MS = 300  # 300ms = piscar confortável
 
     def __init__(self):
         super().__init__()
@@ -12,19 +16,70 @@ class FuelPanel(QtWidgets.QWidget):
         self.last_lap_consume = None
         self.remaining_laps = None
 
+        self._sized = theme.SizedResources(self._build_gradients)
+
+        # Cadenciado pelo FrameClock (advance_blink a cada BLINK_INTERVAL_MS).
         self.blink_state = True
-        self.blink_timer = QtCore.QTimer()
-        self.blink_timer.timeout.connect(self._toggle_blink)
-        self.blink_timer.start(300)  # 300ms = piscar confortável
+        self._blinking = True
 
-    def _toggle_blink(self):
+    def set_blinking(self, enabled: bool) -> None:
+        self._blinking = enabled
+        if not enabled and not self.blink_state:
+            self.blink_state = True
+            self.update(self._segments_rect())
+
+    def advance_blink(self):
+        if not self._blinking:
+            return
         if self.fuel_percent <= 20:
             self.blink_state = not self.blink_state
-            self.update()
+            self.update(self._segments_rect())
         else:
             if not self.blink_state:
                 self.blink_state = True
-                self.update()
+                self.update(self._segments_rect())
+
+    def display_state(self):
+        return (self._segments_state(), self._metrics_state())
+
+    def set_values(self, fuel_percent, last_lap_consume, remaining_laps) -> bool:
+        segments_before = self._segments_state()
+        metrics_before = self._metrics_state()
+        self.fuel_percent = fuel_percent
+        self.last_lap_consume = last_lap_consume
+        self.remaining_laps = remaining_laps
+
+        region = QtGui.QRegion()
+        if self._segments_state() != segments_before:
+            region = region.united(self._segments_rect())
+        if self._metrics_state() != metrics_before:
+            region = region.united(self._metrics_rect())
+        if region.isEmpty():
+            return False
+        self.update(region)
+        return True
+
+    def _segments_state(self):
+        return (self.remaining_segments(), self.fuel_percent <= 20)
+
+    def _metrics_state(self):
+        consume_text = "--" if self.last_lap_consume is None else f"{self.last_lap_consume:.2f}"
+        remaining_text = "--" if self.remaining_laps is None else f"{self.remaining_laps:.1f}"
+        return (consume_text, remaining_text)
+
+    def _segments_rect(self) -> QtCore.QRect:
+        return QtCore.QRect(0, 0, self.width() - 120, self.height())
+
+    def _metrics_rect(self) -> QtCore.QRect:
+        return QtCore.QRect(self.width() - 120, 0, 120, self.height())
+
+    def _build_gradients(self, width: int, height: int) -> dict:
+        return {
+            "background": theme.linear_gradient(0, 0, 0, height, (
+                (0, (6, 10, 30)),
+                (1, (2, 4, 15)),
+            )),
+        }
 
     def remaining_segments(self):
         percent = max(0.0, min(100.0, self.fuel_percent))
@@ -33,6 +88,7 @@ class FuelPanel(QtWidgets.QWidget):
     # =========================================================
     # PAINT
     # =========================================================
+    @measure_paint("FuelPanel.paint")
     def paintEvent(self, e):
         painter = QtGui.QPainter(self)
         painter.setRenderHint(QtGui.QPainter.Antialiasing)
@@ -40,10 +96,7 @@ class FuelPanel(QtWidgets.QWidget):
         rect = self.rect()
 
         # BACKGROUND
-        bg = QtGui.QLinearGradient(0, 0, 0, rect.height())
-        bg.setColorAt(0, QtGui.QColor(6, 10, 30))
-        bg.setColorAt(1, QtGui.QColor(2, 4, 15))
-        painter.fillRect(rect, bg)
+        painter.fillRect(rect, self._sized.get(rect.width(), rect.height())["background"])
 
         margin_left = 30
         margin_top = 20
@@ -53,8 +106,8 @@ class FuelPanel(QtWidgets.QWidget):
         # =====================================================
 
         # Title
-        painter.setPen(QtGui.QColor(220, 220, 255))
-        painter.setFont(QtGui.QFont("Arial", 16, QtGui.QFont.Bold))
+        painter.setPen(theme.color(220, 220, 255))
+        painter.setFont(theme.font(16, bold=True))
         painter.drawText(margin_left, margin_top+30, "Fuel")
 
         # Segment settings
@@ -76,9 +129,10 @@ class FuelPanel(QtWidgets.QWidget):
 
             # Último segmento vermelho
             if i == self.total_segments - 1:
-                active_color = QtGui.QColor(220, 40, 40)
+                active_rgb = (220, 40, 40)
             else:
-                active_color = QtGui.QColor(0, 150, 255)
+                active_rgb = (0, 150, 255)
+            active_color = theme.color(*active_rgb)
 
             if is_active:
 
@@ -86,12 +140,7 @@ class FuelPanel(QtWidgets.QWidget):
                     continue
 
                 # Glow LED
-                glow = QtGui.QColor(active_color)
-                glow.setAlpha(120)
-
-                glow_pen = QtGui.QPen(glow)
-                glow_pen.setWidth(4)
-                painter.setPen(glow_pen)
+                painter.setPen(theme.pen((*active_rgb, 120), 4))
                 painter.drawRect(
                     x - 1,
                     start_y - 1,
@@ -113,12 +162,12 @@ class FuelPanel(QtWidgets.QWidget):
                     start_y,
                     segment_width,
                     segment_height,
-                    QtGui.QColor(25, 35, 55)
+                    theme.color(25, 35, 55)
                 )
 
         # Scale labels
-        painter.setFont(QtGui.QFont("Arial", 9))
-        painter.setPen(QtGui.QColor(150, 160, 200))
+        painter.setFont(theme.font(9))
+        painter.setPen(theme.color(150, 160, 200))
 
         painter.drawText(start_x, start_y + 45, "100%")
         painter.drawText(start_x + 4 * (segment_width + spacing),
@@ -132,24 +181,24 @@ class FuelPanel(QtWidgets.QWidget):
 
         right_x = rect.width() - 115
 
-        painter.setFont(QtGui.QFont("Arial", 10))
-        painter.setPen(QtGui.QColor(170, 180, 255))
+        painter.setFont(theme.font(10))
+        painter.setPen(theme.color(170, 180, 255))
         painter.drawText(right_x, margin_top, "Last Lap Consume")
 
-        painter.setFont(QtGui.QFont("Arial", 28, QtGui.QFont.Bold))
-        painter.setPen(QtGui.QColor(255, 255, 255))
+        painter.setFont(theme.font(28, bold=True))
+        painter.setPen(theme.color(255, 255, 255))
         if self.last_lap_consume is None:
             consume_text = "--"
         else:
             consume_text = f"{self.last_lap_consume:.2f}"
         painter.drawText(right_x, margin_top + 40, consume_text)
 
-        painter.setFont(QtGui.QFont("Arial", 10))
-        painter.setPen(QtGui.QColor(170, 180, 255))
+        painter.setFont(theme.font(10))
+        painter.setPen(theme.color(170, 180, 255))
         painter.drawText(right_x, margin_top + 65, "Remaining Laps")
 
-        painter.setFont(QtGui.QFont("Arial", 36, QtGui.QFont.Bold))
-        painter.setPen(QtGui.QColor(255, 255, 255))
+        painter.setFont(theme.font(36, bold=True))
+        painter.setPen(theme.color(255, 255, 255))
         if self.remaining_laps is None:
             remaining_text = "--"
         else:
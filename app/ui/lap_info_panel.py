@@ -1,5 +1,8 @@
 from PyQt5 import QtWidgets, QtCore, QtGui
 
+from app.ui import theme
+from app.ui.profiler import measure_paint
+
 class LapInfoPanel(QtWidgets.QWidget):
 
     def __init__(self):
@@ -21,51 +24,115 @@ class LapInfoPanel(QtWidgets.QWidget):
         self.gear = "4"
         self.suggested_gear = "2"
 
+        self.margin = 18
+        self.top_height = 70
+        self._sized = theme.SizedResources(self._build_gradients)
+
+    _FIELD_GROUPS = {
+        "position": "position",
+        "total_cars": "position",
+        "current_lap": "laps",
+        "total_laps": "laps",
+        "best_lap": "times",
+        "last_lap": "times",
+        "gear": "gear",
+        "suggested_gear": "suggested_gear",
+    }
+
+    def display_state(self):
+        return tuple(getattr(self, name) for name in self._FIELD_GROUPS)
+
+    def set_values(self, **values) -> bool:
+        groups = set()
+        for name, value in values.items():
+            if getattr(self, name) != value:
+                setattr(self, name, value)
+                groups.add(self._FIELD_GROUPS[name])
+        if not groups:
+            return False
+        region = QtGui.QRegion()
+        for group in groups:
+            region = region.united(self._group_rect(group))
+        self.update(region)
+        return True
+
+    def _build_gradients(self, width: int, height: int) -> dict:
+        line_y = self.top_height + 10
+        divider_x = int(width / 3) + 20
+        return {
+            "background": theme.linear_gradient(0, 0, 0, height, (
+                (0, (15, 18, 40)),
+                (1, (5, 6, 15)),
+            )),
+            "divider_glow": theme.linear_gradient(0, line_y - 1, 0, line_y + 3, (
+                (0, (120, 90, 255, 120)),
+                (1, (0, 0, 0, 0)),
+            )),
+            "vertical_glow": theme.linear_gradient(divider_x, self.top_height + 15, divider_x, height - 15, (
+                (0, (120, 90, 255, 120)),
+                (1, (0, 0, 0, 0)),
+            )),
+        }
+
+    def _group_rect(self, group: str) -> QtCore.QRect:
+        w = self.width()
+        h = self.height()
+        column_width = w // 3
+        lower_top = self.top_height + 15
+        lower_height = h - lower_top
+        if group == "position":
+            return QtCore.QRect(0, 0, w - 160, self.top_height)
+        if group == "laps":
+            return QtCore.QRect(w - 160, 0, 160, self.top_height)
+        if group == "times":
+            return QtCore.QRect(0, lower_top, column_width + 18, lower_height)
+        if group == "gear":
+            return QtCore.QRect(column_width + 22, lower_top, column_width - 22, lower_height)
+        return QtCore.QRect(2 * column_width, lower_top, w - 2 * column_width, lower_height)
+
     # =========================================================
     # PAINT
     # =========================================================
+    @measure_paint("LapInfoPanel.paint")
     def paintEvent(self, event):
         painter = QtGui.QPainter(self)
         painter.setRenderHint(QtGui.QPainter.Antialiasing)
 
         rect = self.rect()
         radius = 12
+        gradients = self._sized.get(rect.width(), rect.height())
 
         # =====================================================
         # BACKGROUND
         # =====================================================
-        bg_gradient = QtGui.QLinearGradient(0, 0, 0, rect.height())
-        bg_gradient.setColorAt(0, QtGui.QColor(15, 18, 40))
-        bg_gradient.setColorAt(1, QtGui.QColor(5, 6, 15))
-
-        painter.setBrush(bg_gradient)
+        painter.setBrush(gradients["background"])
         painter.setPen(QtCore.Qt.NoPen)
         painter.drawRoundedRect(rect, radius, radius)
 
         # =====================================================
         # TOP SECTION (POS + LAPS)
         # =====================================================
-        margin = 18
-        top_height = 70
+        margin = self.margin
+        top_height = self.top_height
 
         # POS label
-        painter.setPen(QtGui.QColor(180, 190, 255))
-        painter.setFont(QtGui.QFont("Arial", 9))
+        painter.setPen(theme.color(180, 190, 255))
+        painter.setFont(theme.font(9))
         painter.drawText(margin, 20, "POS.")
 
         # POS value
-        painter.setFont(QtGui.QFont("Arial", 34, QtGui.QFont.Bold))
-        painter.setPen(QtGui.QColor(255, 255, 255))
+        painter.setFont(theme.font(34, bold=True))
+        painter.setPen(theme.color(255, 255, 255))
         painter.drawText(margin, 65, f"{self.position}/{self.total_cars}")
 
         # LAPS label
-        painter.setFont(QtGui.QFont("Arial", 9))
-        painter.setPen(QtGui.QColor(180, 190, 255))
+        painter.setFont(theme.font(9))
+        painter.setPen(theme.color(180, 190, 255))
         painter.drawText(rect.width() - 120, 20, "Laps")
 
         # LAPS value
-        painter.setFont(QtGui.QFont("Arial", 34, QtGui.QFont.Bold))
-        painter.setPen(QtGui.QColor(255, 255, 255))
+        painter.setFont(theme.font(34, bold=True))
+        painter.setPen(theme.color(255, 255, 255))
         painter.drawText(rect.width() - 150, 65, f"{self.current_lap}/{self.total_laps}")
 
         # =====================================================
@@ -73,19 +140,12 @@ class LapInfoPanel(QtWidgets.QWidget):
         # =====================================================
         line_y = top_height + 10
 
-        glow_gradient = QtGui.QLinearGradient(0, line_y - 1,
-                                      0, line_y + 3)
-        glow_gradient.setColorAt(0, QtGui.QColor(120, 90, 255, 120))
-        glow_gradient.setColorAt(1, QtGui.QColor(0, 0, 0, 0))
-
-        painter.setBrush(glow_gradient)
+        painter.setBrush(gradients["divider_glow"])
         painter.setPen(QtCore.Qt.NoPen)
         painter.drawRect(0, line_y - 1, rect.width(), 4)
 
         # Linha central fina
-        pen = QtGui.QPen(QtGui.QColor(150, 120, 255, 220))
-        pen.setWidth(2)
-        painter.setPen(pen)
+        painter.setPen(theme.pen((150, 120, 255, 220), 2))
         painter.drawLine(0, line_y, rect.width(), line_y)
 
         # =====================================================
@@ -98,20 +158,20 @@ class LapInfoPanel(QtWidgets.QWidget):
         # ----- LEFT (Best / Last) -----
         left_x = margin
 
-        painter.setPen(QtGui.QColor(170, 180, 255))
-        painter.setFont(QtGui.QFont("Arial", 9))
+        painter.setPen(theme.color(170, 180, 255))
+        painter.setFont(theme.font(9))
         painter.drawText(left_x, bottom_top, "Best Lap Time")
 
-        painter.setFont(QtGui.QFont("Arial", 20, QtGui.QFont.Bold))
-        painter.setPen(QtGui.QColor(255, 255, 255))
+        painter.setFont(theme.font(20, bold=True))
+        painter.setPen(theme.color(255, 255, 255))
         painter.drawText(left_x, bottom_top + 28, self.best_lap)
 
-        painter.setFont(QtGui.QFont("Arial", 9))
-        painter.setPen(QtGui.QColor(170, 180, 255))
+        painter.setFont(theme.font(9))
+        painter.setPen(theme.color(170, 180, 255))
         painter.drawText(left_x, bottom_top + 48, "Last Lap Time")
 
-        painter.setFont(QtGui.QFont("Arial", 20, QtGui.QFont.Bold))
-        painter.setPen(QtGui.QColor(200, 200, 255))
+        painter.setFont(theme.font(20, bold=True))
+        painter.setPen(theme.color(200, 200, 255))
         painter.drawText(left_x, bottom_top + 75, self.last_lap)
 
         # =====================================================
@@ -120,12 +180,7 @@ class LapInfoPanel(QtWidgets.QWidget):
         divider_x = int(column_width) + 20
 
         # Glow suave
-        v_glow = QtGui.QLinearGradient(divider_x, top_height + 15,
-                                    divider_x, rect.height() - 15)
-        v_glow.setColorAt(0, QtGui.QColor(120, 90, 255, 120))
-        v_glow.setColorAt(1, QtGui.QColor(0, 0, 0, 0))
-
-        painter.setBrush(v_glow)
+        painter.setBrush(gradients["vertical_glow"])
         painter.setPen(QtCore.Qt.NoPen)
         painter.drawRect(divider_x - 2,
                         top_height + 15,
@@ -133,9 +188,7 @@ class LapInfoPanel(QtWidgets.QWidget):
                         rect.height() - top_height - 30)
 
         # Linha central fina
-        pen = QtGui.QPen(QtGui.QColor(150, 120, 255, 200))
-        pen.setWidth(2)
-        painter.setPen(pen)
+        painter.setPen(theme.pen((150, 120, 255, 200), 2))
         painter.drawLine(divider_x,
                         top_height + 15,
                         divider_x,
@@ -145,21 +198,21 @@ class LapInfoPanel(QtWidgets.QWidget):
         # ----- CENTER (Gear) -----
         center_x = int(column_width)
 
-        painter.setFont(QtGui.QFont("Arial", 9))
-        painter.setPen(QtGui.QColor(170, 180, 255))
+        painter.setFont(theme.font(9))
+        painter.setPen(theme.color(170, 180, 255))
         painter.drawText(center_x + 80, bottom_top, "Gear")
 
-        painter.setFont(QtGui.QFont("Arial", 60, QtGui.QFont.Bold))
-        painter.setPen(QtGui.QColor(255, 255, 255))
+        painter.setFont(theme.font(60, bold=True))
+        painter.setPen(theme.color(255, 255, 255))
         painter.drawText(center_x + 70, bottom_top + 75, self.gear)
 
         # ----- RIGHT (Suggested Gear) -----
         right_x = int(column_width * 2)
 
-        painter.setFont(QtGui.QFont("Arial", 9))
-        painter.setPen(QtGui.QColor(170, 180, 255))
+        painter.setFont(theme.font(9))
+        painter.setPen(theme.color(170, 180, 255))
         painter.drawText(right_x + 20, bottom_top, "Suggested Gear")
 
-        painter.setFont(QtGui.QFont("Arial", 48, QtGui.QFont.Bold))
-        painter.setPen(QtGui.QColor(220, 220, 255))
+        painter.setFont(theme.font(48, bold=True))
+        painter.setPen(theme.color(220, 220, 255))
         painter.drawText(right_x + 50, bottom_top + 70, self.suggested_gear)
\ No newline at end of file
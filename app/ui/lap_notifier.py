@@ -0,0 +1,60 @@
+import threading
+import time
+
+from PyQt5 import QtCore
+
+from domain.lap_telemetry import LapTelemetryState
+
+
+class LapChangeNotifier(QtCore.QObject):
+    """
+    Ponte entre a thread de ingestão e a GUI: acumula as voltas alteradas e emite
+    laps_changed no máximo uma vez por min_interval_ms, sempre na thread da GUI.
+
+    A thread de ingestão só cruza a fila de eventos do Qt quando não há entrega
+    pendente; os pontos seguintes entram no conjunto já agendado.
+    """
+
+    laps_changed = QtCore.pyqtSignal(object)
+    _wake = QtCore.pyqtSignal()
+
+    def __init__(self, lap_state: LapTelemetryState, min_interval_ms: int = 16, parent=None):
+        super().__init__(parent)
+        self._min_interval_ms = min_interval_ms
+        self._lock = threading.Lock()
+        self._pending: set[int] = set()
+        self._scheduled = False
+        self._last_emit = 0.0
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._flush)
+        self._wake.connect(self._on_wake, QtCore.Qt.QueuedConnection)
+
+        lap_state.add_listener(self._on_laps_changed)
+
+    def _on_laps_changed(self, laps: set[int]) -> None:
+        # Roda na thread de ingestão.
+        with self._lock:
+            self._pending |= laps
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self._wake.emit()
+
+    def _on_wake(self) -> None:
+        elapsed_ms = (time.monotonic() - self._last_emit) * 1000.0
+        wait_ms = self._min_interval_ms - elapsed_ms
+        if wait_ms > 0:
+            self._timer.start(int(wait_ms) + 1)
+        else:
+            self._flush()
+
+    def _flush(self) -> None:
+        with self._lock:
+            laps = frozenset(self._pending)
+            self._pending.clear()
+            self._scheduled = False
+        self._last_emit = time.monotonic()
+        if laps:
+            self.laps_changed.emit(laps)
@@ -0,0 +1,245 @@
+"""
+Instrumentação opcional da UI: tempo de paintEvent / refresh, atraso do relógio
+de frame e idade pacote→pixel do dado pintado, em histogramas deslizantes, com
+HUD e export CSV / Chrome trace.
+
+Desligado (padrão) o custo por chamada é um teste de atributo: os wrappers
+chamam a função original direto.
+"""
+from bisect import bisect_right
+from collections import deque
+import csv
+import functools
+import json
+import os
+import threading
+import time
+from typing import Callable
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+from app.ui import theme
+
+# Limites superiores (ms) dos baldes do histograma; o último é aberto.
+BUCKET_EDGES_MS = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.7, 33.3, 66.7)
+
+
+class RollingHistogram:
+    """Últimas `window` amostras: baldes fixos atualizados a cada entrada/saída e percentis sob demanda."""
+
+    def __init__(self, window: int = 600):
+        self._samples: deque[float] = deque(maxlen=window)
+        self.buckets = [0] * (len(BUCKET_EDGES_MS) + 1)
+        self.count = 0
+
+    def add(self, value_ms: float) -> None:
+        if len(self._samples) == self._samples.maxlen:
+            self.buckets[bisect_right(BUCKET_EDGES_MS, self._samples[0])] -= 1
+        self._samples.append(value_ms)
+        self.buckets[bisect_right(BUCKET_EDGES_MS, value_ms)] += 1
+        self.count += 1
+
+    def percentile(self, fraction: float) -> float:
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+    def maximum(self) -> float:
+        return max(self._samples) if self._samples else 0.0
+
+
+class Profiler:
+    def __init__(self, window: int = 600, max_events: int = 50000):
+        self.enabled = False
+        self._window = window
+        self._epoch = time.perf_counter()
+        self._histograms: dict[str, RollingHistogram] = {}
+        # (name, start_s, duration_s, thread_id) para o Chrome trace.
+        self._events: deque[tuple[str, float, float, int]] = deque(maxlen=max_events)
+
+    def measure(self, name: str) -> Callable:
+        """Decorator: mede a função quando o profiler está ligado."""
+
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(name, start, time.perf_counter() - start)
+
+            return wrapper
+
+        return decorator
+
+    def measure_paint(self, name: str) -> Callable:
+        """
+        Decorator de paintEvent: além do tempo de pintura registra "<name>.age", a
+        idade (ms) do dado desenhado ao fim da pintura: time.monotonic() menos o
+        data_rx_time do widget, o instante de chegada do pacote que gerou o dado.
+        """
+
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(widget, *args, **kwargs):
+                if not self.enabled:
+                    return func(widget, *args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(widget, *args, **kwargs)
+                finally:
+                    self.record(name, start, time.perf_counter() - start)
+                    self.record_age(f"{name}.age", widget)
+
+            return wrapper
+
+        return decorator
+
+    def record_age(self, name: str, source) -> None:
+        rx_time = getattr(source, "data_rx_time", 0.0)
+        if rx_time > 0.0:
+            self.record_value(name, (time.monotonic() - rx_time) * 1000.0)
+
+    def record(self, name: str, start: float, duration_s: float) -> None:
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            histogram = RollingHistogram(self._window)
+            self._histograms[name] = histogram
+        histogram.add(duration_s * 1000.0)
+        self._events.append((name, start, duration_s, threading.get_ident()))
+
+    def record_value(self, name: str, value_ms: float) -> None:
+        """Amostra sem intervalo de tempo associado (ex.: atraso de timer); só vai para o histograma."""
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            histogram = RollingHistogram(self._window)
+            self._histograms[name] = histogram
+        histogram.add(value_ms)
+
+    def reset(self) -> None:
+        self._histograms.clear()
+        self._events.clear()
+
+    def summary(self) -> list[tuple[str, RollingHistogram]]:
+        return sorted(self._histograms.items())
+
+    def export_csv(self, path: str) -> None:
+        with open(path, "w", newline="", encoding="utf-8") as handle:
+            writer = csv.writer(handle)
+            writer.writerow(["name", "start_ms", "duration_ms", "thread"])
+            for name, start, duration, thread_id in list(self._events):
+                writer.writerow([
+                    name,
+                    f"{(start - self._epoch) * 1000.0:.3f}",
+                    f"{duration * 1000.0:.3f}",
+                    thread_id,
+                ])
+
+    def export_chrome_trace(self, path: str) -> None:
+        # Formato "trace event" (chrome://tracing, Perfetto): eventos completos "X" em microssegundos.
+        pid = os.getpid()
+        events = [
+            {
+                "name": name,
+                "ph": "X",
+                "ts": round((start - self._epoch) * 1e6, 1),
+                "dur": round(duration * 1e6, 1),
+                "pid": pid,
+                "tid": thread_id,
+            }
+            for name, start, duration, thread_id in list(self._events)
+        ]
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, handle)
+
+
+profiler = Profiler()
+measure = profiler.measure
+measure_paint = profiler.measure_paint
+
+
+def measure_widget_paint(widget: QtWidgets.QWidget, name: str, source=None) -> None:
+    """
+    Para widgets de terceiros (ex.: PlotWidget do pyqtgraph) que não dá para decorar
+    na classe. A idade do dado vem de source.data_rx_time (padrão: o próprio widget).
+    """
+    paint_event = widget.paintEvent
+    age_source = source if source is not None else widget
+
+    def wrapper(event):
+        if not profiler.enabled:
+            return paint_event(event)
+        start = time.perf_counter()
+        try:
+            return paint_event(event)
+        finally:
+            profiler.record(name, start, time.perf_counter() - start)
+            profiler.record_age(f"{name}.age", age_source)
+
+    widget.paintEvent = wrapper
+
+
+class ProfilerHud(QtWidgets.QWidget):
+    """Overlay semitransparente com p50 / p95 / máx e um mini-histograma por medida."""
+
+    ROW_HEIGHT = 18
+    WIDTH = 460
+
+    def __init__(self, parent: QtWidgets.QWidget):
+        super().__init__(parent)
+        self.setAttribute(QtCore.Qt.WA_TransparentForMouseEvents)
+        self._font = QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.FixedFont)
+        self._font.setPointSize(9)
+        self.hide()
+
+    def refresh(self) -> None:
+        if not self.isVisible():
+            return
+        rows = max(1, len(profiler.summary()))
+        self.setGeometry(10, 10, self.WIDTH, (rows + 1) * self.ROW_HEIGHT + 8)
+        self.raise_()
+        self.update()
+
+    def paintEvent(self, e):
+        painter = QtGui.QPainter(self)
+        painter.fillRect(self.rect(), theme.color(0, 0, 0, 190))
+        painter.setFont(self._font)
+        painter.setPen(theme.color(200, 200, 230))
+        painter.drawText(8, 14, f"{'medida':<24} {'n':>6} {'p50':>6} {'p95':>6} {'máx':>6}  ms")
+
+        bar_x = self.WIDTH - 110
+        bar_width = 100 / (len(BUCKET_EDGES_MS) + 1)
+        for index, (name, histogram) in enumerate(profiler.summary()):
+            y = (index + 2) * self.ROW_HEIGHT
+            p95 = histogram.percentile(0.95)
+            painter.setPen(theme.color(255, 90, 90) if p95 > BUCKET_EDGES_MS[6] else theme.color(230, 230, 255))
+            painter.drawText(
+                8,
+                y - 4,
+                f"{name[:24]:<24} {histogram.count:>6} {histogram.percentile(0.5):>6.2f} "
+                f"{p95:>6.2f} {histogram.maximum():>6.1f}",
+            )
+            peak = max(histogram.buckets) or 1
+            for bucket, count in enumerate(histogram.buckets):
+                height = int((self.ROW_HEIGHT - 6) * count / peak)
+                painter.fillRect(
+                    int(bar_x + bucket * bar_width),
+                    y - 3 - height,
+                    max(1, int(bar_width) - 1),
+                    height,
+                    theme.color(120, 200, 255) if bucket < 7 else theme.color(255, 90, 90),
+                )
+
+
+def export_profile(directory: str = "profiles") -> tuple[str, str]:
+    os.makedirs(directory, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    csv_path = os.path.join(directory, f"ui-profile-{stamp}.csv")
+    trace_path = os.path.join(directory, f"ui-profile-{stamp}.trace.json")
+    profiler.export_csv(csv_path)
+    profiler.export_chrome_trace(trace_path)
+    return csv_path, trace_path
@@ -0,0 +1,87 @@
+from collections import deque
+from typing import Callable, Optional
+
+from PyQt5 import QtCore
+
+from app.ui.frame_clock import FrameClock
+
+# Níveis de qualidade de pintura. Cada widget decide o que corta em cada nível.
+QUALITY_FULL = 0
+QUALITY_REDUCED = 1
+QUALITY_MINIMAL = 2
+
+
+class QualityGovernor(QtCore.QObject):
+    """
+    Observa o período real dos frames do FrameClock e troca o nível de qualidade
+    dos widgets registrados: cai um nível quando o p95 passa do orçamento e volta
+    um nível depois de algumas janelas seguidas com folga (histerese).
+    """
+
+    quality_changed = QtCore.pyqtSignal(int)
+
+    def __init__(
+        self,
+        clock: FrameClock,
+        window_frames: int = 60,
+        degrade_ratio: float = 1.3,
+        restore_ratio: float = 1.1,
+        restore_windows: int = 3,
+        active: Optional[Callable[[], bool]] = None,
+    ):
+        super().__init__()
+        self.clock = clock
+        self.window_frames = window_frames
+        self.degrade_ratio = degrade_ratio
+        self.restore_ratio = restore_ratio
+        self.restore_windows = restore_windows
+        self._active = active
+        self.quality = QUALITY_FULL
+        self.last_p95_ms: Optional[float] = None
+        self._periods: deque[float] = deque(maxlen=window_frames)
+        self._interval_ms = clock.timer.interval()
+        self._good_windows = 0
+        self._targets: list = []
+
+    def register(self, widget) -> None:
+        """widget precisa ter set_quality(tier)."""
+        self._targets.append(widget)
+        widget.set_quality(self.quality)
+
+    def sample(self) -> None:
+        # Tarefa do FrameClock: uma amostra por frame.
+        interval_ms = self.clock.timer.interval()
+        if interval_ms != self._interval_ms or (self._active is not None and not self._active()):
+            # Mudou o ritmo (ex.: pausa): amostras antigas não valem para o novo orçamento.
+            self._interval_ms = interval_ms
+            self._periods.clear()
+            self._good_windows = 0
+            return
+        if self.clock.last_period_ms <= 0.0:
+            return
+        self._periods.append(self.clock.last_period_ms)
+        if len(self._periods) < self.window_frames:
+            return
+
+        periods = sorted(self._periods)
+        p95 = periods[int(len(periods) * 0.95) - 1]
+        self.last_p95_ms = p95
+        self._periods.clear()
+
+        if p95 > interval_ms * self.degrade_ratio:
+            self._good_windows = 0
+            if self.quality < QUALITY_MINIMAL:
+                self._set_quality(self.quality + 1)
+        elif p95 < interval_ms * self.restore_ratio:
+            self._good_windows += 1
+            if self._good_windows >= self.restore_windows and self.quality > QUALITY_FULL:
+                self._good_windows = 0
+                self._set_quality(self.quality - 1)
+        else:
+            self._good_windows = 0
+
+    def _set_quality(self, quality: int) -> None:
+        self.quality = quality
+        for widget in self._targets:
+            widget.set_quality(quality)
+        self.quality_changed.emit(quality)
@@ -1,6 +1,11 @@
 from PyQt5 import QtWidgets, QtCore, QtGui
 
+from app.ui import theme
+from app.ui.profiler import measure_paint
+from app.ui.quality import QUALITY_FULL, QUALITY_MINIMAL, QUALITY_REDUCED
+
 class RpmGauge(QtWidgets.QWidget):
+    BLINK_INTERVAL_MS = 70  # velocidade do piscar
 
     def __init__(self):
         super().__init__()
@@ -12,15 +17,59 @@ class RpmGauge(QtWidgets.QWidget):
         self.start_angle = -210
         self.total_angle = 240
 
+        # O piscar é cadenciado pelo FrameClock (advance_blink a cada BLINK_INTERVAL_MS).
         self.blink_state = True
-        self.blink_timer = QtCore.QTimer()
-        self.blink_timer.timeout.connect(self._toggle_blink)
-        self.blink_timer.start(70)   # velocidade do piscar
-
-        self.primary = QtGui.QColor(255, 80, 80)
-        self.outer_ring = QtGui.QColor(110, 120, 200)
-    
-    def _toggle_blink(self):
+        self._blinking = True
+        self.quality = QUALITY_FULL
+
+        self.primary = theme.color(255, 80, 80)
+        self.outer_ring = theme.color(110, 120, 200)
+
+        # Coordenadas lógicas fixas (escala 500): gradientes não dependem do tamanho.
+        radius = 210
+        self._gauge_rect = QtCore.QRectF(-radius, -radius, radius * 2, radius * 2)
+        self._background_gradient = theme.radial_gradient(0, 0, radius, (
+            (0, (30, 25, 45)),
+            (1, (8, 10, 20)),
+        ))
+        self._light_gradient = theme.linear_gradient(0, -radius, 0, 0, (
+            (0.0, (255, 255, 255, 70)),
+            (0.4, (255, 255, 255, 30)),
+            (1.0, (255, 255, 255, 0)),
+        ))
+        # Variantes do blink, montadas na primeira vez que aparecem.
+        self._arc_pens: dict[int, QtGui.QPen] = {}
+        self._inner_glow_gradients: dict[int, QtGui.QRadialGradient] = {}
+
+    def display_state(self):
+        return (self.rpm, self.rpm_warn, self.rpm_rev_limiter, self.blink_state)
+
+    def set_values(self, rpm: float, rpm_warn: int, rpm_rev_limiter: int) -> bool:
+        previous = self.display_state()
+        self.rpm = round(rpm)
+        self.rpm_warn = rpm_warn
+        self.rpm_rev_limiter = rpm_rev_limiter
+        if self.display_state() == previous:
+            return False
+        self.update()
+        return True
+
+    def set_quality(self, quality: int) -> None:
+        # REDUCED tira o reflexo; MINIMAL tira também os glows. Ponteiro, ticks e texto ficam.
+        if quality != self.quality:
+            self.quality = quality
+            self.update()
+
+    def set_blinking(self, enabled: bool) -> None:
+        # Fora de corrida o piscar para e o ponteiro fica aceso.
+        self._blinking = enabled
+        if not enabled and not self.blink_state:
+            self.blink_state = True
+            self.update()
+
+    def advance_blink(self):
+        if not self._blinking:
+            return
         if self.rpm_warn > 0 and self.rpm >= self.rpm_warn:
             self.blink_state = not self.blink_state
             self.update()
@@ -30,6 +79,7 @@ class RpmGauge(QtWidgets.QWidget):
     # =========================================================
     # PAINT
     # =========================================================
+    @measure_paint("RpmGauge.paint")
     def paintEvent(self, e):
         painter = QtGui.QPainter(self)
         painter.setRenderHint(QtGui.QPainter.Antialiasing)
@@ -47,8 +97,10 @@ class RpmGauge(QtWidgets.QWidget):
         self._draw_outer_ring(painter, radius)
         self._draw_red_zone(painter, radius)
         self._draw_active_arc(painter, radius)
-        self._draw_inner_glow(painter, radius)
-        self._draw_directional_light(painter, radius)
+        if self.quality < QUALITY_MINIMAL:
+            self._draw_inner_glow(painter, radius)
+        if self.quality < QUALITY_REDUCED:
+            self._draw_directional_light(painter, radius)
         self._draw_ticks_and_numbers(painter, radius)
         self._draw_text(painter)
 
@@ -60,12 +112,7 @@ class RpmGauge(QtWidgets.QWidget):
         painter.save()
 
         # Gradiente linear do topo para o centro
-        gradient = QtGui.QLinearGradient(0, -radius, 0, 0)
-        gradient.setColorAt(0.0, QtGui.QColor(255, 255, 255, 70))
-        gradient.setColorAt(0.4, QtGui.QColor(255, 255, 255, 30))
-        gradient.setColorAt(1.0, QtGui.QColor(255, 255, 255, 0))
-
-        painter.setBrush(gradient)
+        painter.setBrush(self._light_gradient)
         painter.setPen(QtCore.Qt.NoPen)
 
         painter.drawEllipse(QtCore.QPointF(0, 0), radius, radius)
@@ -76,11 +123,7 @@ class RpmGauge(QtWidgets.QWidget):
     # BACKGROUND
     # =========================================================
     def _draw_background(self, painter, radius):
-        gradient = QtGui.QRadialGradient(0, 0, radius)
-        gradient.setColorAt(0, QtGui.QColor(30, 25, 45))
-        gradient.setColorAt(1, QtGui.QColor(8, 10, 20))
-
-        painter.setBrush(gradient)
+        painter.setBrush(self._background_gradient)
         painter.setPen(QtCore.Qt.NoPen)
         painter.drawEllipse(QtCore.QPointF(0, 0), radius, radius)
 
@@ -88,14 +131,10 @@ class RpmGauge(QtWidgets.QWidget):
     # OUTER RING
     # =========================================================
     def _draw_outer_ring(self, painter, radius):
-        rect = QtCore.QRectF(-radius, -radius, radius * 2, radius * 2)
-
-        pen = QtGui.QPen(self.outer_ring)
-        pen.setWidth(3)
-        painter.setPen(pen)
+        painter.setPen(theme.pen((110, 120, 200), 3))
 
         painter.drawArc(
-            rect,
+            self._gauge_rect,
             int((90 - self.start_angle) * 16),
             int(-self.total_angle * 16)
         )
@@ -107,7 +146,7 @@ class RpmGauge(QtWidgets.QWidget):
         if self.rpm_rev_limiter == 0:
             return
 
-        rect = QtCore.QRectF(-radius, -radius, radius * 2, radius * 2)
+        rect = self._gauge_rect
 
         warn_ratio = self.rpm_warn / self.rpm_rev_limiter
         red_span_ratio = 1.0 - warn_ratio
@@ -115,10 +154,7 @@ class RpmGauge(QtWidgets.QWidget):
         start = self.start_angle + warn_ratio * self.total_angle
         span = -self.total_angle * red_span_ratio
 
-        pen = QtGui.QPen(QtGui.QColor(255, 60, 60))
-        pen.setWidth(8)
-        pen.setCapStyle(QtCore.Qt.RoundCap)
-        painter.setPen(pen)
+        painter.setPen(theme.pen((255, 60, 60), 8, QtCore.Qt.RoundCap))
 
         painter.drawArc(
             rect,
@@ -130,7 +166,7 @@ class RpmGauge(QtWidgets.QWidget):
     # ACTIVE ARC
     # =========================================================
     def _draw_active_arc(self, painter, radius):
-        rect = QtCore.QRectF(-radius, -radius, radius * 2, radius * 2)
+        rect = self._gauge_rect
 
         if self.rpm_rev_limiter > 0:
             ratio = self.rpm / self.rpm_rev_limiter
@@ -147,30 +183,15 @@ class RpmGauge(QtWidgets.QWidget):
         span = -self.total_angle * ratio
 
         # Glow
-        glow_pen = QtGui.QPen(self.primary)
-        glow_color = QtGui.QColor(self.primary)
-        glow_color.setAlpha(glow_alpha)
-        glow_pen.setColor(glow_color)
-        glow_pen.setWidth(30)
-        glow_pen.setCapStyle(QtCore.Qt.RoundCap)
-        painter.setPen(glow_pen)
+        if self.quality < QUALITY_MINIMAL:
+            painter.setPen(theme.pen((255, 80, 80, glow_alpha), 30, QtCore.Qt.RoundCap))
 
-        painter.drawArc(rect,
-                        int((90 - self.start_angle) * 16),
-                        int(span * 16))
+            painter.drawArc(rect,
+                            int((90 - self.start_angle) * 16),
+                            int(span * 16))
 
         # Gradiente angular
-        gradient = QtGui.QConicalGradient(0, 0, -self.start_angle)
-
-        gradient.setColorAt(0.0, QtGui.QColor(255, 170, 170))
-        gradient.setColorAt(0.30, QtGui.QColor(255, 130, 130))
-        gradient.setColorAt(0.60, QtGui.QColor(255, 90, 90))
-        gradient.setColorAt(0.85, QtGui.QColor(255, 70, 70))
-        gradient.setColorAt(1.0, QtGui.QColor(arc_intensity, 60, 60))
-
-        pen = QtGui.QPen(QtGui.QBrush(gradient), 12)
-        pen.setCapStyle(QtCore.Qt.RoundCap)
-        painter.setPen(pen)
+        painter.setPen(self._arc_pen(arc_intensity))
 
         painter.drawArc(rect,
                         int((90 - self.start_angle) * 16),
@@ -180,35 +201,55 @@ class RpmGauge(QtWidgets.QWidget):
         end_angle = self.start_angle + ratio * self.total_angle
         painter.save()
         painter.rotate(end_angle)
-        highlight_pen = QtGui.QPen(QtGui.QColor(255, 200, 200))
-        highlight_pen.setWidth(6)
-        painter.setPen(highlight_pen)
+        painter.setPen(theme.pen((255, 200, 200), 6))
         painter.drawLine(0, -radius, 0, -radius + 20)
         painter.restore()
 
+    def _arc_pen(self, arc_intensity):
+        pen = self._arc_pens.get(arc_intensity)
+        if pen is None:
+            gradient = theme.conical_gradient(0, 0, -self.start_angle, (
+                (0.0, (255, 170, 170)),
+                (0.30, (255, 130, 130)),
+                (0.60, (255, 90, 90)),
+                (0.85, (255, 70, 70)),
+                (1.0, (arc_intensity, 60, 60)),
+            ))
+            pen = theme.gradient_pen(gradient, 12, QtCore.Qt.RoundCap)
+            self._arc_pens[arc_intensity] = pen
+        return pen
+
     # =========================================================
     # INNER GLOW
     # =========================================================
     def _draw_inner_glow(self, painter, radius):
         inner = radius - 45
-        ratio = self.rpm / self.rpm_rev_limiter
         if self.rpm_warn > 0 and self.rpm >= self.rpm_warn:
             alpha = 200 if self.blink_state else 60
         else:
             alpha = 120
 
-        gradient = QtGui.QRadialGradient(0, 0, inner)
-        gradient.setColorAt(0, QtGui.QColor(255, 80, 80, alpha))
-        gradient.setColorAt(1, QtGui.QColor(0, 0, 0, 0))
-
-        painter.setBrush(gradient)
+        painter.setBrush(self._inner_glow_gradient(inner, alpha))
         painter.setPen(QtCore.Qt.NoPen)
         painter.drawEllipse(QtCore.QPointF(0, 0), inner, inner)
 
+    def _inner_glow_gradient(self, inner, alpha):
+        gradient = self._inner_glow_gradients.get(alpha)
+        if gradient is None:
+            gradient = theme.radial_gradient(0, 0, inner, (
+                (0, (255, 80, 80, alpha)),
+                (1, (0, 0, 0, 0)),
+            ))
+            self._inner_glow_gradients[alpha] = gradient
+        return gradient
+
     # =========================================================
     # TICKS + NUMBERS
     # =========================================================
     def _draw_ticks_and_numbers(self, painter, radius):
+        if self.rpm_rev_limiter <= 0:
+            return
+
         painter.save()
 
         major_step = 1000
@@ -216,7 +257,7 @@ class RpmGauge(QtWidgets.QWidget):
 
         tick_radius = radius - 20
 
-        for value in range(0, self.rpm_rev_limiter + 1, minor_step):
+        for value in range(0, int(self.rpm_rev_limiter) + 1, minor_step):
             ratio = value / self.rpm_rev_limiter
             angle = self.start_angle + ratio * self.total_angle
 
@@ -224,24 +265,20 @@ class RpmGauge(QtWidgets.QWidget):
             painter.rotate(angle)
 
             if value % major_step == 0:
-                pen = QtGui.QPen(QtGui.QColor(230, 230, 255))
-                pen.setWidth(3)
-                painter.setPen(pen)
+                painter.setPen(theme.pen((230, 230, 255), 3))
                 painter.drawLine(0, -tick_radius, 0, -tick_radius + 18)
 
                 painter.save()
                 painter.translate(0, -tick_radius + 40)
                 painter.rotate(-angle)
 
-                painter.setFont(QtGui.QFont("Arial", 14))
+                painter.setFont(theme.font(14))
                 painter.drawText(QtCore.QRectF(-25, -15, 50, 30),
                                  QtCore.Qt.AlignCenter,
                                  str(value // 1000))
                 painter.restore()
             else:
-                pen = QtGui.QPen(QtGui.QColor(200, 200, 255, 120))
-                pen.setWidth(2)
-                painter.setPen(pen)
+                painter.setPen(theme.pen((200, 200, 255, 120), 2))
                 painter.drawLine(0, -tick_radius, 0, -tick_radius + 10)
 
             painter.restore()
@@ -253,24 +290,23 @@ class RpmGauge(QtWidgets.QWidget):
     # =========================================================
     def _draw_text(self, painter):
         value = str(int(self.rpm))
-        ratio = self.rpm / self.rpm_rev_limiter
 
         if self.rpm >= self.rpm_warn and not self.blink_state:
             return
 
-        painter.setPen(QtGui.QColor(0, 0, 0, 160))
-        painter.setFont(QtGui.QFont("Arial", 60, QtGui.QFont.Bold))
+        painter.setPen(theme.color(0, 0, 0, 160))
+        painter.setFont(theme.font(60, bold=True))
         painter.drawText(QtCore.QRectF(-140, -60, 280, 120),
                          QtCore.Qt.AlignCenter,
                          value)
 
-        painter.setPen(QtGui.QColor(240, 240, 255))
+        painter.setPen(theme.color(240, 240, 255))
         painter.drawText(QtCore.QRectF(-140, -65, 280, 120),
                          QtCore.Qt.AlignCenter,
                          value)
 
-        painter.setFont(QtGui.QFont("Arial", 16))
-        painter.setPen(QtGui.QColor(200, 200, 230))
+        painter.setFont(theme.font(16))
+        painter.setPen(theme.color(200, 200, 230))
         painter.drawText(QtCore.QRectF(-140, 40, 280, 60),
                          QtCore.Qt.AlignCenter,
                          "RPM x1000")
\ No newline at end of file
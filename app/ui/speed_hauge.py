@@ -1,5 +1,9 @@
 from PyQt5 import QtWidgets, QtCore, QtGui
 
+from app.ui import theme
+from app.ui.profiler import measure_paint
+from app.ui.quality import QUALITY_FULL, QUALITY_MINIMAL, QUALITY_REDUCED
+
 class SpeedGauge(QtWidgets.QWidget):
 
     def __init__(self):
@@ -12,13 +16,61 @@ class SpeedGauge(QtWidgets.QWidget):
         self.start_angle = -210
         self.total_angle = 240
 
-        self.primary = QtGui.QColor(130, 90, 255)
-        self.outer_ring = QtGui.QColor(110, 120, 200)
-        self.bg_dark = QtGui.QColor(8, 10, 20)
+        self.primary = theme.color(130, 90, 255)
+        self.outer_ring = theme.color(110, 120, 200)
+        self.bg_dark = theme.color(8, 10, 20)
+        self.quality = QUALITY_FULL
+
+        # Coordenadas lógicas fixas (escala 500): gradientes não dependem do tamanho.
+        radius = 210
+        inner = radius - 45
+        self._gauge_rect = QtCore.QRectF(-radius, -radius, radius * 2, radius * 2)
+        self._background_gradient = theme.radial_gradient(0, 0, radius, (
+            (0, (35, 30, 70)),
+            (0.6, (18, 18, 40)),
+            (1, (8, 10, 20)),
+        ))
+        self._arc_pen = theme.gradient_pen(
+            theme.conical_gradient(0, 0, -self.start_angle, (
+                (0.0, (90, 70, 255)),
+                (0.25, (110, 85, 255)),
+                (0.50, (130, 100, 255)),
+                (0.75, (150, 115, 255)),
+                (1.0, (170, 130, 255)),
+            )),
+            12,
+            QtCore.Qt.RoundCap,
+        )
+        self._inner_glow_gradient = theme.radial_gradient(0, 0, inner, (
+            (0, (100, 80, 255, 130)),
+            (1, (0, 0, 0, 0)),
+        ))
+        self._light_gradient = theme.linear_gradient(0, -radius, 0, 0, (
+            (0, (255, 255, 255, 60)),
+            (1, (255, 255, 255, 0)),
+        ))
+
+    def display_state(self):
+        return (self.speed,)
+
+    def set_quality(self, quality: int) -> None:
+        # Mesmos cortes do RpmGauge: reflexo no REDUCED, glows no MINIMAL.
+        if quality != self.quality:
+            self.quality = quality
+            self.update()
+
+    def set_speed(self, speed: float) -> bool:
+        speed = round(speed, 1)
+        if speed == self.speed:
+            return False
+        self.speed = speed
+        self.update()
+        return True
 
     # =========================================================
     # PAINT
     # =========================================================
+    @measure_paint("SpeedGauge.paint")
     def paintEvent(self, e):
         painter = QtGui.QPainter(self)
         painter.setRenderHint(QtGui.QPainter.Antialiasing)
@@ -35,8 +87,10 @@ class SpeedGauge(QtWidgets.QWidget):
         self._draw_background(painter, radius)
         self._draw_outer_ring(painter, radius)
         self._draw_active_arc(painter, radius)
-        self._draw_inner_glow(painter, radius)
-        self._draw_directional_light(painter, radius)
+        if self.quality < QUALITY_MINIMAL:
+            self._draw_inner_glow(painter, radius)
+        if self.quality < QUALITY_REDUCED:
+            self._draw_directional_light(painter, radius)
         self._draw_ticks_and_numbers(painter, radius)
         self._draw_text(painter)
 
@@ -44,12 +98,7 @@ class SpeedGauge(QtWidgets.QWidget):
     # BACKGROUND
     # =========================================================
     def _draw_background(self, painter, radius):
-        gradient = QtGui.QRadialGradient(0, 0, radius)
-        gradient.setColorAt(0, QtGui.QColor(35, 30, 70))
-        gradient.setColorAt(0.6, QtGui.QColor(18, 18, 40))
-        gradient.setColorAt(1, QtGui.QColor(8, 10, 20))
-
-        painter.setBrush(gradient)
+        painter.setBrush(self._background_gradient)
         painter.setPen(QtCore.Qt.NoPen)
         painter.drawEllipse(QtCore.QPointF(0, 0), radius, radius)
 
@@ -57,14 +106,10 @@ class SpeedGauge(QtWidgets.QWidget):
     # OUTER RING
     # =========================================================
     def _draw_outer_ring(self, painter, radius):
-        rect = QtCore.QRectF(-radius, -radius, radius * 2, radius * 2)
-
-        pen = QtGui.QPen(self.outer_ring)
-        pen.setWidth(3)
-        painter.setPen(pen)
+        painter.setPen(theme.pen((110, 120, 200), 3))
 
         painter.drawArc(
-            rect,
+            self._gauge_rect,
             int((90 - self.start_angle) * 16),
             int(-self.total_angle * 16)
         )
@@ -73,36 +118,21 @@ class SpeedGauge(QtWidgets.QWidget):
     # ACTIVE ARC WITH GRADIENT + HIGHLIGHT
     # =========================================================
     def _draw_active_arc(self, painter, radius):
-        rect = QtCore.QRectF(-radius, -radius, radius * 2, radius * 2)
+        rect = self._gauge_rect
 
         ratio = self.speed / self.max_speed
         span = -self.total_angle * ratio
 
         # Glow externo
-        glow_pen = QtGui.QPen(self.primary)
-        glow = QtGui.QColor(self.primary)
-        glow.setAlpha(70)
-        glow_pen.setColor(glow)
-        glow_pen.setWidth(22)
-        glow_pen.setCapStyle(QtCore.Qt.RoundCap)
-        painter.setPen(glow_pen)
+        if self.quality < QUALITY_MINIMAL:
+            painter.setPen(theme.pen((130, 90, 255, 70), 22, QtCore.Qt.RoundCap))
 
-        painter.drawArc(rect,
-                        int((90 - self.start_angle) * 16),
-                        int(span * 16))
+            painter.drawArc(rect,
+                            int((90 - self.start_angle) * 16),
+                            int(span * 16))
 
         # Gradiente angular simulado
-        gradient = QtGui.QConicalGradient(0, 0, -self.start_angle)
-
-        gradient.setColorAt(0.0, QtGui.QColor(90, 70, 255))
-        gradient.setColorAt(0.25, QtGui.QColor(110, 85, 255))
-        gradient.setColorAt(0.50, QtGui.QColor(130, 100, 255))
-        gradient.setColorAt(0.75, QtGui.QColor(150, 115, 255))
-        gradient.setColorAt(1.0, QtGui.QColor(170, 130, 255))
-
-        pen = QtGui.QPen(QtGui.QBrush(gradient), 12)
-        pen.setCapStyle(QtCore.Qt.RoundCap)
-        painter.setPen(pen)
+        painter.setPen(self._arc_pen)
 
         painter.drawArc(rect,
                         int((90 - self.start_angle) * 16),
@@ -112,10 +142,7 @@ class SpeedGauge(QtWidgets.QWidget):
         end_angle = self.start_angle + ratio * self.total_angle
         painter.save()
         painter.rotate(end_angle)
-        highlight_pen = QtGui.QPen(QtGui.QColor(200, 180, 255))
-        highlight_pen.setWidth(6)
-        highlight_pen.setCapStyle(QtCore.Qt.RoundCap)
-        painter.setPen(highlight_pen)
+        painter.setPen(theme.pen((200, 180, 255), 6, QtCore.Qt.RoundCap))
         painter.drawLine(0, -radius, 0, -radius + 20)
         painter.restore()
 
@@ -125,11 +152,7 @@ class SpeedGauge(QtWidgets.QWidget):
     def _draw_inner_glow(self, painter, radius):
         inner = radius - 45
 
-        gradient = QtGui.QRadialGradient(0, 0, inner)
-        gradient.setColorAt(0, QtGui.QColor(100, 80, 255, 130))
-        gradient.setColorAt(1, QtGui.QColor(0, 0, 0, 0))
-
-        painter.setBrush(gradient)
+        painter.setBrush(self._inner_glow_gradient)
         painter.setPen(QtCore.Qt.NoPen)
         painter.drawEllipse(QtCore.QPointF(0, 0), inner, inner)
 
@@ -137,11 +160,7 @@ class SpeedGauge(QtWidgets.QWidget):
     # DIRECTIONAL TOP LIGHT
     # =========================================================
     def _draw_directional_light(self, painter, radius):
-        gradient = QtGui.QLinearGradient(0, -radius, 0, 0)
-        gradient.setColorAt(0, QtGui.QColor(255, 255, 255, 60))
-        gradient.setColorAt(1, QtGui.QColor(255, 255, 255, 0))
-
-        painter.setBrush(gradient)
+        painter.setBrush(self._light_gradient)
         painter.setPen(QtCore.Qt.NoPen)
         painter.drawEllipse(QtCore.QPointF(0, 0), radius, radius)
 
@@ -164,9 +183,7 @@ class SpeedGauge(QtWidgets.QWidget):
             painter.rotate(angle)
 
             if value % major_step == 0:
-                pen = QtGui.QPen(QtGui.QColor(220, 220, 255))
-                pen.setWidth(3)
-                painter.setPen(pen)
+                painter.setPen(theme.pen((220, 220, 255), 3))
                 painter.drawLine(0, -tick_radius, 0, -tick_radius + 18)
 
                 # Número
@@ -174,16 +191,14 @@ class SpeedGauge(QtWidgets.QWidget):
                 painter.translate(0, -tick_radius + 40)
                 painter.rotate(-angle)
 
-                painter.setPen(QtGui.QColor(230, 230, 255))
-                painter.setFont(QtGui.QFont("Arial", 14))
+                painter.setPen(theme.color(230, 230, 255))
+                painter.setFont(theme.font(14))
                 painter.drawText(QtCore.QRectF(-25, -15, 50, 30),
                                  QtCore.Qt.AlignCenter,
                                  str(value))
                 painter.restore()
             else:
-                pen = QtGui.QPen(QtGui.QColor(200, 200, 255, 120))
-                pen.setWidth(2)
-                painter.setPen(pen)
+                painter.setPen(theme.pen((200, 200, 255, 120), 2))
                 painter.drawLine(0, -tick_radius, 0, -tick_radius + 10)
 
             painter.restore()
@@ -197,21 +212,21 @@ class SpeedGauge(QtWidgets.QWidget):
         value = str(int(self.speed))
 
         # Sombra
-        painter.setPen(QtGui.QColor(0, 0, 0, 160))
-        painter.setFont(QtGui.QFont("Arial", 70, QtGui.QFont.Bold))
+        painter.setPen(theme.color(0, 0, 0, 160))
+        painter.setFont(theme.font(70, bold=True))
         painter.drawText(QtCore.QRectF(-140, -60, 280, 120),
                          QtCore.Qt.AlignCenter,
                          value)
 
         # Texto principal
-        painter.setPen(QtGui.QColor(240, 240, 255))
+        painter.setPen(theme.color(240, 240, 255))
         painter.drawText(QtCore.QRectF(-140, -65, 280, 120),
                          QtCore.Qt.AlignCenter,
                          value)
 
         # Unidade
-        painter.setFont(QtGui.QFont("Arial", 16))
-        painter.setPen(QtGui.QColor(200, 200, 230))
+        painter.setFont(theme.font(16))
+        painter.setPen(theme.color(200, 200, 230))
         painter.drawText(QtCore.QRectF(-140, 40, 280, 60),
                          QtCore.Qt.AlignCenter,
                          "km/h")
\ No newline at end of file
@@ -1,5 +1,9 @@
 from PyQt5 import QtWidgets, QtCore, QtGui
 
+from app.ui import theme
+from app.ui.profiler import measure_paint
+from app.ui.quality import QUALITY_FULL, QUALITY_MINIMAL, QUALITY_REDUCED
+
 class TelemetryGraph(QtWidgets.QWidget):
 
     def __init__(self):
@@ -10,19 +14,41 @@ class TelemetryGraph(QtWidgets.QWidget):
         self.samples = 120
         self.throttle = [0.0] * self.samples
         self.brake = [0.0] * self.samples
-    
-    def set_inputs(self, throttle, brake):
+        # Consecutive identical samples; once it covers the window, scrolling changes nothing.
+        self._flat_samples = self.samples
+        self.quality = QUALITY_FULL
+
+    def display_state(self):
+        return (self.throttle[-1], self.brake[-1], self._flat_samples >= self.samples)
+
+    def set_quality(self, quality: int) -> None:
+        # REDUCED desliga o antialiasing; MINIMAL também tira o preenchimento do throttle.
+        if quality != self.quality:
+            self.quality = quality
+            self.update()
+
+    def set_inputs(self, throttle, brake) -> bool:
+        if throttle == self.throttle[-1] and brake == self.brake[-1]:
+            self._flat_samples += 1
+        else:
+            self._flat_samples = 1
         self.throttle.pop(0)
         self.brake.pop(0)
         self.throttle.append(throttle)
         self.brake.append(brake)
+        if self._flat_samples > self.samples:
+            return False
+        self.update()
+        return True
 
     # =========================================================
     # PAINT
     # =========================================================
+    @measure_paint("TelemetryGraph.paint")
     def paintEvent(self, e):
         painter = QtGui.QPainter(self)
-        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        if self.quality < QUALITY_REDUCED:
+            painter.setRenderHint(QtGui.QPainter.Antialiasing)
 
         rect = self.rect()
         w = rect.width()
@@ -31,14 +57,12 @@ class TelemetryGraph(QtWidgets.QWidget):
         # =====================================================
         # BACKGROUND
         # =====================================================
-        painter.fillRect(rect, QtGui.QColor(18, 20, 28))
+        painter.fillRect(rect, theme.color(18, 20, 28))
 
         # =====================================================
         # GRID LINES (horizontais sutis)
         # =====================================================
-        grid_pen = QtGui.QPen(QtGui.QColor(60, 65, 80))
-        grid_pen.setWidth(1)
-        painter.setPen(grid_pen)
+        painter.setPen(theme.pen((60, 65, 80), 1))
 
         for i in range(1, 5):
             y = int(h * i / 5)
@@ -53,22 +77,22 @@ class TelemetryGraph(QtWidgets.QWidget):
         step = graph_width / self.samples
 
         # ----- THROTTLE (verde) -----
-        path_throttle = QtGui.QPainterPath()
-        path_throttle.moveTo(0, h)
+        if self.quality < QUALITY_MINIMAL:
+            path_throttle = QtGui.QPainterPath()
+            path_throttle.moveTo(0, h)
 
-        for i, val in enumerate(self.throttle):
-            x = i * step
-            y = h * (1 - val)
-            path_throttle.lineTo(x, y)
+            for i, val in enumerate(self.throttle):
+                x = i * step
+                y = h * (1 - val)
+                path_throttle.lineTo(x, y)
 
-        path_throttle.lineTo(graph_width, h)
+            path_throttle.lineTo(graph_width, h)
 
-        painter.setBrush(QtGui.QColor(0, 255, 120, 60))
-        painter.setPen(QtCore.Qt.NoPen)
-        painter.drawPath(path_throttle)
+            painter.setBrush(theme.color(0, 255, 120, 60))
+            painter.setPen(QtCore.Qt.NoPen)
+            painter.drawPath(path_throttle)
 
-        pen = QtGui.QPen(QtGui.QColor(0, 255, 120), 2)
-        painter.setPen(pen)
+        painter.setPen(theme.pen((0, 255, 120), 2))
 
         for i in range(self.samples - 1):
             x1 = i * step
@@ -78,8 +102,7 @@ class TelemetryGraph(QtWidgets.QWidget):
             painter.drawLine(int(x1), int(y1), int(x2), int(y2))
 
         # ----- BRAKE (vermelho) -----
-        pen = QtGui.QPen(QtGui.QColor(255, 40, 40), 2)
-        painter.setPen(pen)
+        painter.setPen(theme.pen((255, 40, 40), 2))
 
         for i in range(self.samples - 1):
             x1 = i * step
@@ -100,7 +123,7 @@ class TelemetryGraph(QtWidgets.QWidget):
 
         # Fundo da área
         painter.fillRect(bar_x_start, 0, bar_area_width, h,
-                        QtGui.QColor(25, 28, 40))
+                        theme.color(25, 28, 40))
 
         # Valores atuais
         current_brake = self.brake[-1]
@@ -117,7 +140,7 @@ class TelemetryGraph(QtWidgets.QWidget):
         # Barra fundo
         painter.fillRect(brake_x, 0,
                         single_bar_width, h,
-                        QtGui.QColor(40, 40, 50))
+                        theme.color(40, 40, 50))
 
         # Barra ativa
         painter.fillRect(
@@ -125,12 +148,12 @@ class TelemetryGraph(QtWidgets.QWidget):
             h - brake_height,
             single_bar_width,
             brake_height,
-            QtGui.QColor(255, 40, 40)
+            theme.color(255, 40, 40)
         )
 
         # Número topo
-        painter.setPen(QtGui.QColor(200, 200, 200))
-        painter.setFont(QtGui.QFont("Arial", 9))
+        painter.setPen(theme.color(200, 200, 200))
+        painter.setFont(theme.font(9))
         painter.drawText(
             brake_x,
             15,
@@ -148,7 +171,7 @@ class TelemetryGraph(QtWidgets.QWidget):
         # Barra fundo
         painter.fillRect(throttle_x, 0,
                         single_bar_width, h,
-                        QtGui.QColor(40, 40, 50))
+                        theme.color(40, 40, 50))
 
         # Barra ativa
         painter.fillRect(
@@ -156,7 +179,7 @@ class TelemetryGraph(QtWidgets.QWidget):
             h - throttle_height,
             single_bar_width,
             throttle_height,
-            QtGui.QColor(0, 255, 120)
+            theme.color(0, 255, 120)
         )
 
         # Número topo
@@ -0,0 +1,97 @@
+"""
+Recursos de pintura compartilhados pelos widgets do dashboard.
+
+Fontes, cores e canetas são criadas uma única vez e reaproveitadas em todos os
+paintEvent. Os objetos devolvidos são compartilhados: não altere (setAlpha,
+setWidth...) o que vier daqui, peça outra variante pela chave.
+"""
+from typing import Callable, Optional
+
+from PyQt5 import QtCore, QtGui
+
+FONT_FAMILY = "Arial"
+
+_fonts: dict[tuple[int, bool], QtGui.QFont] = {}
+_colors: dict[tuple[int, int, int, int], QtGui.QColor] = {}
+_pens: dict[tuple, QtGui.QPen] = {}
+
+
+def font(point_size: int, bold: bool = False) -> QtGui.QFont:
+    key = (point_size, bold)
+    cached = _fonts.get(key)
+    if cached is None:
+        weight = QtGui.QFont.Bold if bold else QtGui.QFont.Normal
+        cached = QtGui.QFont(FONT_FAMILY, point_size, weight)
+        _fonts[key] = cached
+    return cached
+
+
+def color(r: int, g: int, b: int, a: int = 255) -> QtGui.QColor:
+    key = (r, g, b, a)
+    cached = _colors.get(key)
+    if cached is None:
+        cached = QtGui.QColor(r, g, b, a)
+        _colors[key] = cached
+    return cached
+
+
+def pen(
+    rgba: tuple,
+    width: float = 1,
+    cap: QtCore.Qt.PenCapStyle = QtCore.Qt.SquareCap,
+) -> QtGui.QPen:
+    key = (tuple(rgba), width, cap)
+    cached = _pens.get(key)
+    if cached is None:
+        cached = QtGui.QPen(color(*rgba))
+        cached.setWidthF(width)
+        cached.setCapStyle(cap)
+        _pens[key] = cached
+    return cached
+
+
+def gradient_pen(gradient: QtGui.QGradient, width: float, cap: QtCore.Qt.PenCapStyle = QtCore.Qt.SquareCap) -> QtGui.QPen:
+    # Gradientes não entram no cache global: o widget guarda a caneta que montou.
+    result = QtGui.QPen(QtGui.QBrush(gradient), width)
+    result.setCapStyle(cap)
+    return result
+
+
+def linear_gradient(x1: float, y1: float, x2: float, y2: float, stops) -> QtGui.QLinearGradient:
+    gradient = QtGui.QLinearGradient(x1, y1, x2, y2)
+    for position, rgba in stops:
+        gradient.setColorAt(position, color(*rgba))
+    return gradient
+
+
+def radial_gradient(cx: float, cy: float, radius: float, stops) -> QtGui.QRadialGradient:
+    gradient = QtGui.QRadialGradient(cx, cy, radius)
+    for position, rgba in stops:
+        gradient.setColorAt(position, color(*rgba))
+    return gradient
+
+
+def conical_gradient(cx: float, cy: float, angle: float, stops) -> QtGui.QConicalGradient:
+    gradient = QtGui.QConicalGradient(cx, cy, angle)
+    for position, rgba in stops:
+        gradient.setColorAt(position, color(*rgba))
+    return gradient
+
+
+class SizedResources:
+    """
+    Recursos que dependem do tamanho do widget (ex.: gradientes de fundo).
+    O builder recebe (width, height) e só roda de novo quando o tamanho muda.
+    """
+
+    def __init__(self, builder: Callable[[int, int], dict]):
+        self._builder = builder
+        self._size: Optional[tuple[int, int]] = None
+        self._items: dict = {}
+
+    def get(self, width: int, height: int) -> dict:
+        size = (width, height)
+        if size != self._size:
+            self._items = self._builder(width, height)
+            self._size = size
+        return self._items
@@ -0,0 +1,132 @@
+from bisect import bisect_left, bisect_right
+
+from PyQt5 import QtCore, QtWidgets
+
+from app.replay import ReplayService
+
+SPEEDS = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0)
+
+
+def format_clock(seconds: float) -> str:
+    seconds = max(0, int(seconds))
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+class TimelineScrubber(QtWidgets.QWidget):
+    """
+    Linha do tempo de um replay. Arrastando, cada posição vira preview (só o
+    pacote naquele instante); ao soltar, clicar na barra ou usar o teclado,
+    seek() refaz as voltas. Mais de um scrubber pode controlar o mesmo replay:
+    a posição é lida do ReplayService a cada sync_interval_ms.
+    """
+
+    def __init__(self, replay: ReplayService, sync_interval_ms: int = 100, parent=None):
+        super().__init__(parent)
+        self.replay = replay
+        self._lap_starts = replay.lap_starts()
+        self._lap_times = [capture_time for _lap, capture_time in self._lap_starts]
+        self._syncing = False
+
+        self.setStyleSheet(
+            "QWidget { color: white; background-color: black; }"
+            "QPushButton, QComboBox { color: white; background-color: #1f1f1f; "
+            "border: 1px solid #4a4a4a; padding: 4px 8px; }"
+        )
+        layout = QtWidgets.QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(6)
+
+        self.play_button = QtWidgets.QPushButton("Play")
+        self.play_button.setFixedWidth(64)
+        self.play_button.clicked.connect(self.toggle_play)
+        self.previous_lap_button = QtWidgets.QPushButton("|< Volta")
+        self.previous_lap_button.clicked.connect(self.previous_lap)
+        self.next_lap_button = QtWidgets.QPushButton("Volta >|")
+        self.next_lap_button.clicked.connect(self.next_lap)
+
+        self.speed_combo = QtWidgets.QComboBox()
+        for speed in SPEEDS:
+            self.speed_combo.addItem(f"{speed:g}x", speed)
+        self.speed_combo.setCurrentIndex(SPEEDS.index(1.0))
+        self.speed_combo.currentIndexChanged.connect(self._on_speed_changed)
+
+        # Milissegundos de captura: 3 h = 10.8M, longe do limite do int do QSlider.
+        self.slider = QtWidgets.QSlider(QtCore.Qt.Horizontal)
+        self.slider.setRange(0, int(replay.duration() * 1000))
+        self.slider.setSingleStep(1000)
+        self.slider.setPageStep(30_000)
+        self.slider.valueChanged.connect(self._on_value_changed)
+        self.slider.sliderReleased.connect(self._on_released)
+
+        self.time_label = QtWidgets.QLabel()
+        self.time_label.setMinimumWidth(170)
+        self.time_label.setAlignment(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
+
+        layout.addWidget(self.play_button)
+        layout.addWidget(self.previous_lap_button)
+        layout.addWidget(self.next_lap_button)
+        layout.addWidget(self.speed_combo)
+        layout.addWidget(self.slider, stretch=1)
+        layout.addWidget(self.time_label)
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.timeout.connect(self.sync)
+        self._timer.start(sync_interval_ms)
+        self.sync()
+
+    def toggle_play(self) -> None:
+        if self.replay.is_playing():
+            self.replay.pause()
+        else:
+            self.replay.play()
+        self.sync()
+
+    def previous_lap(self) -> None:
+        # Perto do começo de uma volta (< 2 s), vai para a anterior.
+        index = bisect_left(self._lap_times, self.replay.position() - 2.0) - 1
+        if index >= 0:
+            self._seek(self._lap_times[index])
+        elif self._lap_times:
+            self._seek(0.0)
+
+    def next_lap(self) -> None:
+        index = bisect_right(self._lap_times, self.replay.position())
+        if index < len(self._lap_times):
+            self._seek(self._lap_times[index])
+
+    def sync(self) -> None:
+        self.play_button.setText("Pause" if self.replay.is_playing() else "Play")
+        if self.slider.isSliderDown():
+            return
+        self._set_slider(self.replay.position())
+
+    def _seek(self, capture_time: float) -> None:
+        self.replay.seek(capture_time)
+        self._set_slider(capture_time)
+
+    def _set_slider(self, capture_time: float) -> None:
+        self._syncing = True
+        self.slider.setValue(int(capture_time * 1000))
+        self._syncing = False
+        self._update_label(capture_time)
+
+    def _update_label(self, capture_time: float) -> None:
+        index = bisect_right(self._lap_times, capture_time) - 1
+        lap = f"  L{self._lap_starts[index][0]}" if index >= 0 else ""
+        self.time_label.setText(f"{format_clock(capture_time)} / {format_clock(self.replay.duration())}{lap}")
+
+    def _on_value_changed(self, value: int) -> None:
+        if self._syncing:
+            return
+        capture_time = value / 1000.0
+        self._update_label(capture_time)
+        if self.slider.isSliderDown():
+            self.replay.preview(capture_time)
+        else:
+            self.replay.seek(capture_time)
+
+    def _on_released(self) -> None:
+        self.replay.seek(self.slider.value() / 1000.0)
+
+    def _on_speed_changed(self, _index: int) -> None:
+        self.replay.set_speed(self.speed_combo.currentData())
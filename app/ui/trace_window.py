@@ -0,0 +1,320 @@
+import time
+from typing import Optional
+
+from PyQt5 import QtCore, QtWidgets
+import pyqtgraph as pg
+import numpy as np
+
+from app.config import TRACE_REFRESH_INTERVAL_MS
+from domain.lap_telemetry import LapTelemetry, LapTelemetryState
+from app.ui.delta_panel import format_lap_time
+from app.ui.lap_notifier import LapChangeNotifier
+from app.ui.profiler import measure
+from app.ui.track_canvas import TrackCanvas
+
+# (coluna, rótulo, unidade); speed / gear / rpm só existem com o canal habilitado.
+TRACE_ROWS = (
+    ("speed_kmh", "Speed", "km/h"),
+    ("throttle", "Throttle", "%"),
+    ("brake", "Brake", "%"),
+    ("gear", "Gear", ""),
+    ("rpm", "RPM", "rpm"),
+)
+
+
+def lap_trace_columns(lap: LapTelemetry, scale: float = 1.0) -> dict[str, np.ndarray]:
+    """
+    Colunas da volta contra a distância percorrida. scale estica a distância da
+    volta para o comprimento da referência, alinhando voltas com traçados um
+    pouco diferentes sem projetar ponto a ponto.
+    """
+    count = len(lap.points)
+    x = np.fromiter((p.x for p in lap.points), dtype=float, count=count)
+    z = np.fromiter((p.z for p in lap.points), dtype=float, count=count)
+    distance = np.zeros(count)
+    if count > 1:
+        distance[1:] = np.cumsum(np.hypot(np.diff(x), np.diff(z))) * scale
+    columns = {
+        "distance": distance,
+        "x": x,
+        "z": z,
+        "throttle": np.fromiter((p.throttle for p in lap.points), dtype=float, count=count) * 100.0,
+        "brake": np.fromiter((p.brake for p in lap.points), dtype=float, count=count) * 100.0,
+    }
+    for name, _label, _unit in TRACE_ROWS:
+        if name in lap.channels and len(lap.channels[name]) == count:
+            columns[name] = lap.channels[name]
+    return columns
+
+
+class TraceWindow(QtWidgets.QWidget):
+    """
+    Traços de velocidade / pedais / marcha / RPM contra a distância da volta,
+    sobrepostos por volta. Eixos X ligados: pan e zoom só mexem na vista, as
+    curvas (com downsampling e clip-to-view do pyqtgraph) não são refeitas.
+    O crosshair mostra os valores por volta e marca o ponto no TrackCanvas.
+    """
+
+    def __init__(self, lap_state: LapTelemetryState, canvas: Optional[TrackCanvas] = None):
+        super().__init__()
+        self.lap_state = lap_state
+        self.canvas = canvas
+        self._laps: dict[int, LapTelemetry] = {}
+        self._columns: dict[int, dict[str, np.ndarray]] = {}
+        self._curves: dict[int, dict[str, pg.PlotDataItem]] = {}
+        self._selected: set[int] = set()
+        # Voltas já listadas: só as novas entram selecionadas.
+        self._listed: set[int] = set()
+        self._list_items: dict[int, QtWidgets.QListWidgetItem] = {}
+        self._reference: Optional[tuple[int, float]] = None
+        self._changed_laps: Optional[set[int]] = None
+        self._dirty = True
+        self._hover_interval_s = 0.03
+        self._last_hover_ts = 0.0
+
+        self.setWindowTitle("Traces")
+        self.setMinimumSize(1000, 700)
+        self.setStyleSheet("QWidget { background-color: black; color: white; }")
+
+        layout = QtWidgets.QHBoxLayout(self)
+
+        self.lap_list = QtWidgets.QListWidget()
+        self.lap_list.setFixedWidth(170)
+        self.lap_list.itemChanged.connect(self._on_lap_item_changed)
+
+        right = QtWidgets.QVBoxLayout()
+        self.cursor_label = QtWidgets.QLabel()
+        self.cursor_label.setTextFormat(QtCore.Qt.RichText)
+        self.cursor_label.setMinimumHeight(40)
+        self.graphics = pg.GraphicsLayoutWidget()
+        self.graphics.setBackground("k")
+        right.addWidget(self.cursor_label)
+        right.addWidget(self.graphics, stretch=1)
+
+        layout.addWidget(self.lap_list)
+        layout.addLayout(right, stretch=1)
+
+        self._plots: dict[str, pg.PlotItem] = {}
+        self._crosshairs: list[pg.InfiniteLine] = []
+        first_plot = None
+        for row, (name, label, unit) in enumerate(TRACE_ROWS):
+            plot = self.graphics.addPlot(row=row, col=0)
+            plot.setLabel("left", label, units=unit or None)
+            # Largura fixa: os eixos X dos traços ficam alinhados na vertical.
+            plot.getAxis("left").setWidth(70)
+            plot.showGrid(x=True, y=True, alpha=0.2)
+            plot.setMouseEnabled(x=True, y=False)
+            plot.setClipToView(True)
+            plot.setDownsampling(auto=True, mode="peak")
+            if first_plot is None:
+                first_plot = plot
+            else:
+                plot.setXLink(first_plot)
+            if row < len(TRACE_ROWS) - 1:
+                plot.hideAxis("bottom")
+            else:
+                plot.setLabel("bottom", "Distance", units="m")
+            crosshair = pg.InfiniteLine(angle=90, movable=False, pen=pg.mkPen((255, 220, 60, 160), width=1))
+            crosshair.setZValue(50)
+            plot.addItem(crosshair, ignoreBounds=True)
+            self._crosshairs.append(crosshair)
+            self._plots[name] = plot
+
+        self.graphics.scene().sigMouseMoved.connect(self._on_mouse_moved)
+
+        self.notifier = LapChangeNotifier(lap_state, min_interval_ms=TRACE_REFRESH_INTERVAL_MS, parent=self)
+        self.notifier.laps_changed.connect(self._on_laps_changed)
+
+    # =========================================================
+    # DADOS
+    # =========================================================
+    def _on_laps_changed(self, laps: frozenset) -> None:
+        if self._changed_laps is not None:
+            self._changed_laps |= laps
+        self._dirty = True
+        if self.isVisible():
+            self.refresh()
+
+    def showEvent(self, event) -> None:
+        super().showEvent(event)
+        if self._dirty:
+            self.refresh()
+
+    def hideEvent(self, event) -> None:
+        super().hideEvent(event)
+        if self.canvas is not None:
+            self.canvas.clear_cursor_position()
+
+    @measure("TraceWindow.refresh")
+    def refresh(self) -> None:
+        if not self._dirty:
+            return
+        if self._changed_laps is None:
+            changed = None
+            self._laps = {lap.lap_number: lap for lap in self.lap_state.get_laps_snapshot()}
+        else:
+            changed = set(self._changed_laps)
+            for lap_number in changed:
+                self._laps.pop(lap_number, None)
+            for lap in self.lap_state.get_laps_snapshot(lap_numbers=changed):
+                self._laps[lap.lap_number] = lap
+        self._changed_laps = set()
+        self._dirty = False
+
+        for lap_number in list(self._curves):
+            if lap_number not in self._laps:
+                self._remove_lap(lap_number)
+
+        # Referência de distância: melhor volta fechada. Se mudar, todas as voltas fechadas são reescaladas.
+        reference = self._pick_reference()
+        if reference != self._reference:
+            self._reference = reference
+            changed = None
+        lap_times = self.lap_state.get_lap_times_ms()
+        for lap_number, lap in self._laps.items():
+            if changed is not None and lap_number not in changed and lap_number in self._columns:
+                continue
+            scale = 1.0
+            if reference is not None and lap_number in lap_times and lap_number != reference[0]:
+                own_length = self._lap_length(lap)
+                scale = reference[1] / own_length if own_length > 0 else 1.0
+            self._columns[lap_number] = lap_trace_columns(lap, scale)
+            if lap_number not in self._listed:
+                self._selected.add(lap_number)
+            self._update_curves(lap_number)
+        self._sync_lap_list(lap_times)
+
+    def _pick_reference(self) -> Optional[tuple[int, float]]:
+        lap_times = {
+            lap_number: time_ms
+            for lap_number, time_ms in self.lap_state.get_lap_times_ms().items()
+            if lap_number in self._laps and len(self._laps[lap_number].points) > 1
+        }
+        if not lap_times:
+            return None
+        lap_number = min(lap_times, key=lap_times.get)
+        return lap_number, self._lap_length(self._laps[lap_number])
+
+    @staticmethod
+    def _lap_length(lap: LapTelemetry) -> float:
+        if len(lap.points) < 2:
+            return 0.0
+        x = np.fromiter((p.x for p in lap.points), dtype=float, count=len(lap.points))
+        z = np.fromiter((p.z for p in lap.points), dtype=float, count=len(lap.points))
+        return float(np.hypot(np.diff(x), np.diff(z)).sum())
+
+    def _update_curves(self, lap_number: int) -> None:
+        columns = self._columns[lap_number]
+        color = self._laps[lap_number].color
+        curves = self._curves.setdefault(lap_number, {})
+        for name, _label, _unit in TRACE_ROWS:
+            values = columns.get(name)
+            curve = curves.get(name)
+            if values is None:
+                if curve is not None:
+                    self._plots[name].removeItem(curves.pop(name))
+                continue
+            if curve is None:
+                curve = self._plots[name].plot(pen=pg.mkPen(color=color, width=1), skipFiniteCheck=True)
+                curves[name] = curve
+            curve.setData(columns["distance"], values)
+            curve.setVisible(lap_number in self._selected)
+
+    def _remove_lap(self, lap_number: int) -> None:
+        for name, curve in self._curves.pop(lap_number, {}).items():
+            self._plots[name].removeItem(curve)
+        self._columns.pop(lap_number, None)
+        self._selected.discard(lap_number)
+        # Se o número voltar (volta regravada), entra como volta nova, selecionada.
+        self._listed.discard(lap_number)
+
+    def _sync_lap_list(self, lap_times: dict[int, int]) -> None:
+        """
+        A lista só é refeita quando entram ou saem voltas; no resto (volta atual
+        crescendo, tempo novo, referência trocada) os rótulos mudam no lugar, sem
+        perder a rolagem nem um clique de checkbox em andamento.
+        """
+        laps = [lap_number for lap_number in sorted(self._laps) if lap_number in self._curves]
+        labels = {lap_number: self._lap_label(lap_number, lap_times) for lap_number in laps}
+        self.lap_list.blockSignals(True)
+        if laps != list(self._list_items):
+            scroll = self.lap_list.verticalScrollBar().value()
+            self.lap_list.clear()
+            self._list_items = {}
+            for lap_number in laps:
+                item = QtWidgets.QListWidgetItem(labels[lap_number])
+                item.setData(QtCore.Qt.UserRole, lap_number)
+                item.setFlags(item.flags() | QtCore.Qt.ItemIsUserCheckable)
+                item.setCheckState(QtCore.Qt.Checked if lap_number in self._selected else QtCore.Qt.Unchecked)
+                item.setForeground(pg.mkColor(self._laps[lap_number].color))
+                self.lap_list.addItem(item)
+                self._list_items[lap_number] = item
+            self.lap_list.verticalScrollBar().setValue(scroll)
+        else:
+            for lap_number, item in self._list_items.items():
+                if item.text() != labels[lap_number]:
+                    item.setText(labels[lap_number])
+        self._listed = set(self._curves)
+        self.lap_list.blockSignals(False)
+
+    def _lap_label(self, lap_number: int, lap_times: dict[int, int]) -> str:
+        label = f"L{lap_number}"
+        if lap_number in lap_times:
+            label = f"{label} {format_lap_time(lap_times[lap_number] / 1000.0)}"
+        if self._reference is not None and self._reference[0] == lap_number:
+            label = f"{label} (ref)"
+        return label
+
+    def _on_lap_item_changed(self, item: QtWidgets.QListWidgetItem) -> None:
+        lap_number = item.data(QtCore.Qt.UserRole)
+        if item.checkState() == QtCore.Qt.Checked:
+            self._selected.add(lap_number)
+        else:
+            self._selected.discard(lap_number)
+        for curve in self._curves.get(lap_number, {}).values():
+            curve.setVisible(lap_number in self._selected)
+
+    # =========================================================
+    # CROSSHAIR
+    # =========================================================
+    def _on_mouse_moved(self, scene_pos) -> None:
+        now = time.monotonic()
+        if now - self._last_hover_ts < self._hover_interval_s:
+            return
+        self._last_hover_ts = now
+
+        plot = next((item for item in self._plots.values() if item.sceneBoundingRect().contains(scene_pos)), None)
+        if plot is None:
+            return
+        distance = plot.vb.mapSceneToView(scene_pos).x()
+        for crosshair in self._crosshairs:
+            crosshair.setPos(distance)
+
+        rows = [f"<b>{distance:.0f} m</b>"]
+        marker_lap = self._reference[0] if self._reference is not None and self._reference[0] in self._selected else None
+        for lap_number in sorted(self._selected):
+            columns = self._columns.get(lap_number)
+            if columns is None or len(columns["distance"]) == 0 or distance > columns["distance"][-1]:
+                continue
+            if marker_lap is None:
+                marker_lap = lap_number
+            index = min(int(np.searchsorted(columns["distance"], distance)), len(columns["distance"]) - 1)
+            values = []
+            for name, label, unit in TRACE_ROWS:
+                if name in columns:
+                    value = columns[name][index]
+                    values.append(f"{label} {value:.0f}{unit and ' ' + unit}")
+            color = "#%02x%02x%02x" % self._laps[lap_number].color
+            rows.append(f"<span style='color:{color}'>L{lap_number}</span> " + " · ".join(values))
+        self.cursor_label.setText("<br>".join(rows))
+
+        if self.canvas is None:
+            return
+        columns = self._columns.get(marker_lap) if marker_lap is not None else None
+        if columns is None or len(columns["distance"]) < 2:
+            self.canvas.clear_cursor_position()
+            return
+        self.canvas.set_cursor_position(
+            float(np.interp(distance, columns["distance"], columns["x"])),
+            float(np.interp(distance, columns["distance"], columns["z"])),
+        )
@@ -6,6 +6,22 @@ import numpy as np
 
 from domain.track_state import TrackBounds
 from domain.lap_telemetry import LapTelemetry
+from domain.track_lod import TrackLodPyramid, visible_segment_mask
+from domain.track_heatmap import HEATMAP_MODES, TrackHeatmap
+from app.ui.profiler import measure_widget_paint
+from app.ui.quality import QUALITY_FULL
+from app.ui.colored_line import ColoredLineItem
+from app.ui.track_styles import (
+    COLOR_MODE_PEDALS,
+    GRADIENT_CHANNELS,
+    GRADIENT_MODES,
+    PYRAMID_CHANNELS,
+    STYLE_NAMES,
+    build_style_series,
+    segment_visual,
+    style_z,
+)
+from app.ui.track_tile_cache import TrackTileCache
 
 
 class TrackCanvas(QtWidgets.QWidget):
@@ -13,10 +29,37 @@ class TrackCanvas(QtWidgets.QWidget):
         super().__init__()
         self._auto_fit = True
         self._follow_car = True
+        self._raster_history = False
+        self._overlay_mode = "laps"
+        self._color_mode = COLOR_MODE_PEDALS
         self._brake_threshold = 0.10
         self._throttle_threshold = 0.10
 
-        self._lap_curves: dict[int, dict[str, pg.PlotDataItem]] = {}
+        self._follow_span = 120.0
+        # Posição prevista (dead reckoning) do marcador; None = usa o último ponto gravado.
+        self._car_override: tuple[float, float] | None = None
+        self._lod_target_px = 2.0
+        self._quality = QUALITY_FULL
+        self._view_margin = 0.05
+        self._applying_range = False
+
+        # Por volta: os três estilos de pedal + o item de gradiente (um só por volta).
+        self._lap_curves: dict[int, dict[str, pg.GraphicsObject]] = {}
+        self._lap_pyramids: dict[int, TrackLodPyramid] = {}
+        self._lap_sources: dict[int, tuple[float, int]] = {}
+        self._lap_colors: dict[int, tuple[int, int, int]] = {}
+        self._visible_lap_numbers: list[int] = []
+        self._vector_lap_numbers: list[int] = []
+        self._heatmap = TrackHeatmap()
+        self._heatmap_contrib: dict[int, int] = {}
+        self._heatmap_rgba: np.ndarray | None = None
+        self._heatmap_scale = 0
+        self._heatmap_luts = {
+            "density": pg.colormap.get("inferno").getLookupTable(nPts=256, alpha=True),
+            "brake": pg.colormap.get("CET-L3").getLookupTable(nPts=256, alpha=True),
+            "throttle": pg.colormap.get("viridis").getLookupTable(nPts=256, alpha=True),
+        }
+        self._gradient_luts: dict[str, np.ndarray] = {}
         self._hover_by_lap: dict[int, dict[str, np.ndarray]] = {}
         self._hover_downsample_step = 3
         self._hover_interval_s = 0.04
@@ -30,6 +73,9 @@ class TrackCanvas(QtWidgets.QWidget):
         self.plot.setLabel("bottom", "X")
         self.plot.setLabel("left", "Z")
         self.plot.setAspectLocked(True, ratio=1)
+        # Chegada (time.monotonic()) do pacote mais novo desenhado; lido pelo profiler.
+        self.data_rx_time = 0.0
+        measure_widget_paint(self.plot, "TrackCanvas.paint", source=self)
 
         self._car_point = self.plot.plot(
             pen=None,
@@ -39,8 +85,36 @@ class TrackCanvas(QtWidgets.QWidget):
             symbolSize=9,
         )
 
+        # Fantasma: volta de referência no mesmo tempo de volta (GhostCar).
+        self._ghost_point = self.plot.plot(
+            pen=None,
+            symbol="o",
+            symbolBrush=(200, 200, 255, 110),
+            symbolPen=pg.mkPen(color=(200, 200, 255, 200), width=1),
+            symbolSize=10,
+        )
+        self._ghost_point.setZValue(40)
+
+        # Cursor vindo de outra vista (ex.: crosshair do TraceWindow).
+        self._cursor_point = self.plot.plot(
+            pen=None,
+            symbol="d",
+            symbolBrush=(255, 220, 60),
+            symbolPen=pg.mkPen(color=(0, 0, 0), width=1),
+            symbolSize=11,
+        )
+        self._cursor_point.setZValue(20)
+
+        self._heatmap_item = pg.ImageItem(axisOrder="row-major")
+        self._heatmap_item.setZValue(-5)
+        self.plot.addItem(self._heatmap_item)
+
+        self._tile_cache = TrackTileCache(self.plot)
+        self._tile_cache.set_thresholds(self._brake_threshold, self._throttle_threshold)
+
         layout.addWidget(self.plot)
         self.plot.scene().sigMouseMoved.connect(self._on_mouse_moved)
+        self.plot.plotItem.vb.sigRangeChanged.connect(self._on_view_range_changed)
 
     def set_auto_fit(self, enabled: bool) -> None:
         self._auto_fit = enabled
@@ -48,24 +122,110 @@ class TrackCanvas(QtWidgets.QWidget):
     def set_follow_car(self, enabled: bool) -> None:
         self._follow_car = enabled
 
+    def set_raster_history(self, enabled: bool) -> None:
+        self._raster_history = enabled
+        if not enabled:
+            self._tile_cache.clear()
+
+    def set_quality(self, quality: int) -> None:
+        # Cada nível abaixo do máximo dobra o tamanho-alvo dos segmentos (LOD mais grosso).
+        if quality == self._quality:
+            return
+        self._quality = quality
+        self._lod_target_px = 2.0 * (2 ** quality)
+        self._render_visible_laps()
+
+    def set_car_position(self, x: float, z: float, rx_time: float = 0.0) -> None:
+        # Chamado a cada frame pelo preditor: move o marcador e a câmera (seguindo o
+        # carro), sem tocar nas curvas; a margem da vista cobre o trecho até o próximo set_laps.
+        self._car_override = (x, z)
+        self._car_point.setData([x], [z])
+        self.data_rx_time = rx_time
+        if self._follow_car and not self._auto_fit:
+            self._apply_view_range(bounds=None, car_x=x, car_z=z)
+
+    def clear_car_position(self) -> None:
+        # Sem posição prevista (telemetria parada): o marcador some em vez de ficar congelado.
+        if self._car_override is None:
+            return
+        self._car_override = None
+        self._car_point.setData([], [])
+
+    def set_ghost_position(self, x: float, z: float) -> None:
+        # Também a cada frame; o fantasma não entra no enquadramento da câmera.
+        self._ghost_point.setData([x], [z])
+
+    def clear_ghost_position(self) -> None:
+        self._ghost_point.setData([], [])
+
+    def set_cursor_position(self, x: float, z: float) -> None:
+        self._cursor_point.setData([x], [z])
+
+    def clear_cursor_position(self) -> None:
+        self._cursor_point.setData([], [])
+
+    def set_overlay_mode(self, mode: str) -> None:
+        if mode != "laps" and mode not in HEATMAP_MODES:
+            raise ValueError(f"Unknown overlay mode: {mode}")
+        previous = self._overlay_mode
+        self._overlay_mode = mode
+        if mode == "laps":
+            self._clear_heatmap()
+        elif previous == "laps":
+            self._tile_cache.clear()
+        else:
+            # Same histogram, different channel: only the colours change.
+            self._heatmap_rgba = None
+
+    def set_color_mode(self, mode: str) -> None:
+        """
+        pedals (estilos por pedal) ou um modo de GRADIENT_MODES (cor contínua por
+        vértice). Entre modos de gradiente a geometria em cache é reaproveitada e
+        só as cores são recalculadas.
+        """
+        if mode != COLOR_MODE_PEDALS and mode not in GRADIENT_MODES:
+            raise ValueError(f"Unknown color mode: {mode}")
+        if mode == self._color_mode:
+            return
+        self._color_mode = mode
+        if mode != COLOR_MODE_PEDALS:
+            # Os tiles só sabem desenhar os estilos de pedal: em gradiente tudo fica vetorial.
+            self._tile_cache.clear()
+            self._vector_lap_numbers = list(self._visible_lap_numbers) if self._overlay_mode == "laps" else []
+        self._render_visible_laps()
+
+    def gradient_lut(self, mode: str) -> np.ndarray:
+        lut = self._gradient_luts.get(mode)
+        if lut is None:
+            lut = pg.colormap.get(GRADIENT_MODES[mode].colormap).getLookupTable(nPts=64, alpha=True)
+            self._gradient_luts[mode] = lut
+        return lut
+
     def set_laps(self, laps: list[LapTelemetry], bounds: TrackBounds | None, visible_laps: set[int]) -> None:
         self._clear_hover_cache()
 
         if not laps:
             self._remove_all_curves()
+            self._lap_pyramids.clear()
+            self._lap_sources.clear()
+            self._visible_lap_numbers = []
+            self._vector_lap_numbers = []
+            self._tile_cache.clear()
+            self._clear_heatmap()
             self._car_point.setData([], [])
             return
 
         active_laps = {lap.lap_number for lap in laps}
         self._sync_curve_pool(active_laps)
+        self._sync_pyramids(laps)
 
         visible = [lap for lap in laps if lap.lap_number in visible_laps]
+        self._visible_lap_numbers = [lap.lap_number for lap in visible]
         self._build_hover_cache(visible)
+        self._sync_raster_history(live_lap=max(active_laps))
+        self._sync_heatmap()
 
-        for lap in visible:
-            self._draw_lap_segments(lap)
-
-        for lap_number in active_laps - visible_laps:
+        for lap_number in active_laps - set(self._vector_lap_numbers):
             self._clear_lap_curves(lap_number)
 
         latest_point = None
@@ -76,21 +236,193 @@ class TrackCanvas(QtWidgets.QWidget):
 
         if latest_point is None:
             self._car_point.setData([], [])
+            self._render_visible_laps()
+            return
+
+        if self._car_override is None:
+            self._car_point.setData([latest_point.x], [latest_point.z])
+            self.data_rx_time = latest_point.rx_time
+            car_x, car_z = latest_point.x, latest_point.z
+        else:
+            # A câmera segue o carro previsto, não o último ponto gravado (que fica para trás).
+            car_x, car_z = self._car_override
+        self._apply_view_range(bounds=bounds, car_x=car_x, car_z=car_z)
+        self._render_visible_laps()
+
+    def _apply_view_range(self, bounds: TrackBounds | None, car_x: float, car_z: float) -> None:
+        self._applying_range = True
+        try:
+            if self._auto_fit and bounds is not None:
+                self.plot.setXRange(bounds.min_x, bounds.max_x, padding=0.08)
+                self.plot.setYRange(bounds.min_z, bounds.max_z, padding=0.08)
+                return
+
+            if self._follow_car:
+                span = self._follow_span
+                self.plot.setXRange(car_x - span, car_x + span, padding=0.0)
+                self.plot.setYRange(car_z - span, car_z + span, padding=0.0)
+        finally:
+            self._applying_range = False
+
+    def _on_view_range_changed(self, *_args) -> None:
+        if self._applying_range:
             return
+        self._render_visible_laps()
+
+    def _view_window(self) -> tuple[tuple[float, float, float, float] | None, float]:
+        vb = self.plot.plotItem.vb
+        if vb.width() <= 0 or vb.height() <= 0:
+            return None, 0.0
+        (min_x, max_x), (min_z, max_z) = vb.viewRange()
+        pixel_w, pixel_h = vb.viewPixelSize()
+        margin_x = (max_x - min_x) * self._view_margin
+        margin_z = (max_z - min_z) * self._view_margin
+        view_rect = (min_x - margin_x, max_x + margin_x, min_z - margin_z, max_z + margin_z)
+        return view_rect, max(float(pixel_w), float(pixel_h))
+
+    def _render_visible_laps(self) -> None:
+        if not self._visible_lap_numbers:
+            return
+        view_rect, meters_per_pixel = self._view_window()
+        for lap_number in self._vector_lap_numbers:
+            self._draw_lap_segments(lap_number, view_rect, meters_per_pixel)
+        if self._raster_history:
+            self._tile_cache.update_view(view_rect, meters_per_pixel)
+
+    def _sync_raster_history(self, live_lap: int) -> None:
+        if self._overlay_mode != "laps":
+            self._vector_lap_numbers = []
+            return
+        if not self._raster_history or self._color_mode != COLOR_MODE_PEDALS:
+            self._vector_lap_numbers = list(self._visible_lap_numbers)
+            return
+
+        # Only the lap being driven stays vector; completed laps go to the tile cache.
+        self._vector_lap_numbers = [n for n in self._visible_lap_numbers if n == live_lap]
+        completed = [n for n in self._visible_lap_numbers if n != live_lap]
+        signature = tuple(
+            (n, self._lap_pyramids[n].size, self._lap_colors.get(n)) for n in completed
+        )
+        sources = [(self._lap_colors.get(n), self._lap_pyramids[n]) for n in completed]
+        self._tile_cache.set_sources(signature, sources)
 
-        self._car_point.setData([latest_point.x], [latest_point.z])
+    def _sync_pyramids(self, laps: list[LapTelemetry]) -> None:
+        active_laps = {lap.lap_number for lap in laps}
+        for lap_number in list(self._lap_pyramids.keys()):
+            if lap_number not in active_laps:
+                self._heatmap_forget(lap_number)
+                self._lap_pyramids.pop(lap_number)
+                self._lap_sources.pop(lap_number, None)
+                self._lap_colors.pop(lap_number, None)
+
+        for lap in laps:
+            self._lap_colors[lap.lap_number] = lap.color
+            pyramid = self._lap_pyramids.get(lap.lap_number)
+            if pyramid is None:
+                pyramid = TrackLodPyramid()
+                self._lap_pyramids[lap.lap_number] = pyramid
+
+            points = lap.points
+            if not points:
+                self._heatmap_forget(lap.lap_number)
+                pyramid.reset()
+                self._lap_sources.pop(lap.lap_number, None)
+                continue
+
+            # Points are append-only unless the lap deque dropped its oldest entries.
+            first_ts, known = self._lap_sources.get(lap.lap_number, (None, 0))
+            if first_ts != points[0].timestamp or len(points) < known:
+                self._heatmap_forget(lap.lap_number)
+                pyramid.reset()
+                known = 0
+
+            new_points = points[known:]
+            if new_points:
+                pyramid.extend(
+                    np.fromiter((p.x for p in new_points), dtype=float, count=len(new_points)),
+                    np.fromiter((p.z for p in new_points), dtype=float, count=len(new_points)),
+                    np.fromiter((p.throttle for p in new_points), dtype=float, count=len(new_points)),
+                    np.fromiter((p.brake for p in new_points), dtype=float, count=len(new_points)),
+                    values={
+                        name: lap.channels[name][known:]
+                        for name in GRADIENT_CHANNELS
+                        if name in lap.channels and len(lap.channels[name]) == len(points)
+                    },
+                )
+            self._lap_sources[lap.lap_number] = (points[0].timestamp, len(points))
+
+    def _sync_heatmap(self) -> None:
+        if self._overlay_mode == "laps":
+            return
+        visible = set(self._visible_lap_numbers)
+        for lap_number in list(self._heatmap_contrib.keys()):
+            if lap_number not in visible:
+                self._heatmap_forget(lap_number)
+
+        for lap_number in self._visible_lap_numbers:
+            pyramid = self._lap_pyramids.get(lap_number)
+            if pyramid is None:
+                continue
+            known = self._heatmap_contrib.get(lap_number, 0)
+            if pyramid.size > known:
+                x, z, throttle, brake = pyramid.base()
+                self._heatmap.add_points(x[known:], z[known:], throttle[known:], brake[known:])
+                self._heatmap_contrib[lap_number] = pyramid.size
+        self._render_heatmap()
+
+    def _heatmap_forget(self, lap_number: int) -> None:
+        known = self._heatmap_contrib.pop(lap_number, 0)
+        pyramid = self._lap_pyramids.get(lap_number)
+        if known == 0 or pyramid is None:
+            return
+        x, z, throttle, brake = pyramid.base()
+        self._heatmap.remove_points(x[:known], z[:known], throttle[:known], brake[:known])
+
+    def _clear_heatmap(self) -> None:
+        self._heatmap.clear()
+        self._heatmap_contrib.clear()
+        self._heatmap_rgba = None
+        self._heatmap_scale = 0
+        self._heatmap_item.clear()
+
+    def _render_heatmap(self) -> None:
+        resized, dirty = self._heatmap.take_dirty()
+        rows, cols = self._heatmap.shape
+        if rows == 0 or cols == 0:
+            self._heatmap_item.clear()
+            self._heatmap_rgba = None
+            return
 
-        if self._auto_fit and bounds is not None:
-            self.plot.setXRange(bounds.min_x, bounds.max_x, padding=0.08)
-            self.plot.setYRange(bounds.min_z, bounds.max_z, padding=0.08)
+        mode = self._overlay_mode
+        scale = max(1, len(self._heatmap_contrib))
+        if mode == "density" and scale != self._heatmap_scale:
+            resized = True
+        self._heatmap_scale = scale
+
+        if resized or self._heatmap_rgba is None:
+            self._heatmap_rgba = self._colorize_heatmap(self._heatmap.values(mode, density_scale=scale))
+            x0, z0, width, height = self._heatmap.world_rect()
+            self._heatmap_item.setImage(self._heatmap_rgba, autoLevels=False)
+            self._heatmap_item.setRect(QtCore.QRectF(x0, z0, width, height))
             return
 
-        if self._follow_car:
-            span = 120.0
-            x = latest_point.x
-            z = latest_point.z
-            self.plot.setXRange(x - span, x + span, padding=0.0)
-            self.plot.setYRange(z - span, z + span, padding=0.0)
+        if dirty is None:
+            return
+        row0, row1, col0, col1 = dirty
+        self._heatmap_rgba[row0:row1, col0:col1] = self._colorize_heatmap(
+            self._heatmap.values(mode, window=dirty, density_scale=scale)
+        )
+        self._heatmap_item.setImage(self._heatmap_rgba, autoLevels=False)
+
+    def _colorize_heatmap(self, values: np.ndarray) -> np.ndarray:
+        lut = self._heatmap_luts[self._overlay_mode]
+        empty = np.isnan(values)
+        idx = np.zeros(values.shape, dtype=np.intp)
+        np.multiply(values, len(lut) - 1, out=values, where=~empty)
+        idx[~empty] = values[~empty].astype(np.intp)
+        rgba = lut[idx]
+        rgba[empty, 3] = 0
+        return rgba
 
     def _sync_curve_pool(self, active_laps: set[int]) -> None:
         for lap_number in list(self._lap_curves.keys()):
@@ -102,10 +434,14 @@ class TrackCanvas(QtWidgets.QWidget):
         for lap_number in active_laps:
             if lap_number in self._lap_curves:
                 continue
+            gradient = ColoredLineItem(width=3)
+            gradient.setZValue(style_z("solid"))
+            self.plot.addItem(gradient)
             self._lap_curves[lap_number] = {
                 "solid": self.plot.plot(),
                 "dash": self.plot.plot(),
                 "dot": self.plot.plot(),
+                "gradient": gradient,
             }
 
     def _remove_all_curves(self) -> None:
@@ -118,97 +454,87 @@ class TrackCanvas(QtWidgets.QWidget):
         curve_group = self._lap_curves.get(lap_number)
         if curve_group is None:
             return
-        for item in curve_group.values():
-            item.setData([], [])
-
-    def _draw_lap_segments(self, lap: LapTelemetry) -> None:
-        curve_group = self._lap_curves.get(lap.lap_number)
-        if curve_group is None:
+        for style_name in STYLE_NAMES:
+            curve_group[style_name].setData([], [])
+        curve_group["gradient"].clear()
+
+    def _draw_lap_segments(
+        self,
+        lap_number: int,
+        view_rect: tuple[float, float, float, float] | None,
+        meters_per_pixel: float,
+    ) -> None:
+        curve_group = self._lap_curves.get(lap_number)
+        pyramid = self._lap_pyramids.get(lap_number)
+        if curve_group is None or pyramid is None:
             return
-        if len(lap.points) < 2:
-            for item in curve_group.values():
-                item.setData([], [])
+        if pyramid.size < 2:
+            self._clear_lap_curves(lap_number)
             return
 
-        series = self._build_style_series(lap)
-        for style_name in ("solid", "dash", "dot"):
+        level = pyramid.select_level(meters_per_pixel, target_px=self._lod_target_px)
+        if self._color_mode != COLOR_MODE_PEDALS and self._draw_lap_gradient(curve_group, pyramid, level, view_rect):
+            for style_name in STYLE_NAMES:
+                curve_group[style_name].setData([], [])
+            return
+        curve_group["gradient"].clear()
+        series = build_style_series(
+            *pyramid.level(level),
+            view_rect=view_rect,
+            brake_threshold=self._brake_threshold,
+            throttle_threshold=self._throttle_threshold,
+        )
+        color = self._lap_colors.get(lap_number)
+        for style_name in STYLE_NAMES:
             xs, zs = series[style_name]
             item = curve_group[style_name]
-            item.setPen(self._build_pen(lap.color, style_name))
+            item.setPen(self._build_pen(color, style_name))
             item.setData(xs, zs, connect="finite")
-            item.setZValue(self._style_z(style_name))
-
-    def _build_style_series(self, lap: LapTelemetry):
-        points = lap.points
-        series = {
-            "solid": ([], []),
-            "dash": ([], []),
-            "dot": ([], []),
-        }
-        for idx in range(1, len(points)):
-            p0 = points[idx - 1]
-            p1 = points[idx]
-            style_name = self._segment_style_name(p1.throttle, p1.brake)
-            xs, zs = series[style_name]
-            xs.extend([p0.x, p1.x, np.nan])
-            zs.extend([p0.z, p1.z, np.nan])
-        return series
+            item.setZValue(style_z(style_name))
+
+    def _draw_lap_gradient(
+        self,
+        curve_group: dict[str, pg.GraphicsObject],
+        pyramid: TrackLodPyramid,
+        level: int,
+        view_rect: tuple[float, float, float, float] | None,
+    ) -> bool:
+        """False quando a volta não gravou os canais do modo (cai nos estilos de pedal)."""
+        mode = GRADIENT_MODES[self._color_mode]
+        x, z, throttle, brake = pyramid.level(level)
+        pedals = dict(zip(PYRAMID_CHANNELS, (throttle, brake)))
+        columns = [pedals[name] if name in pedals else pyramid.values(name, level) for name in mode.channels]
+        columns = [column for column in columns if column is not None]
+        if not columns:
+            return False
+        values = columns[0] if len(columns) == 1 else np.fmax.reduce(columns)
+        item = curve_group["gradient"]
+        # Mesma volta, mesmo nível e mesma vista: segmentos já estão no item.
+        key = (level, pyramid.version, view_rect)
+        if key != item.geometry_key():
+            item.set_geometry(x, z, visible_segment_mask(x, z, view_rect), key=key)
+        item.set_colors(values, self.gradient_lut(self._color_mode), mode.levels)
+        return True
 
     def _build_pen(self, color, style_name: str):
-        style_color, width, line_style = self._segment_visual(color=color, style_name=style_name)
+        style_color, width, line_style = segment_visual(color=color, style_name=style_name)
         return pg.mkPen(color=style_color, width=width, style=line_style)
 
-    def _style_z(self, style_name: str) -> int:
-        if style_name == "dot":
-            return 30
-        if style_name == "dash":
-            return 10
-        return 20
-
-    def _segment_style_name(self, throttle: float, brake: float) -> str:
-        if brake > self._brake_threshold:
-            return "dot"
-        if throttle > self._throttle_threshold:
-            return "solid"
-        return "dash"
-
-    def _segment_visual(self, color, style_name: str):
-        base = self._normalize_color(color)
-        if style_name == "dot":
-            brake_color = self._blend(base, (255, 70, 70), 0.55)
-            return (*brake_color, 255), 4, QtCore.Qt.DotLine
-        if style_name == "dash":
-            coast_color = self._blend(base, (180, 180, 180), 0.55)
-            return (*coast_color, 130), 1, QtCore.Qt.DashLine
-        return (*base, 255), 2, QtCore.Qt.SolidLine
-
-    def _normalize_color(self, color):
-        if isinstance(color, tuple) and len(color) >= 3:
-            return (int(color[0]), int(color[1]), int(color[2]))
-        return (0, 220, 255)
-
-    def _blend(self, source, target, ratio: float):
-        ratio = max(0.0, min(1.0, ratio))
-        return (
-            int(source[0] * (1.0 - ratio) + target[0] * ratio),
-            int(source[1] * (1.0 - ratio) + target[1] * ratio),
-            int(source[2] * (1.0 - ratio) + target[2] * ratio),
-        )
-
     def _clear_hover_cache(self) -> None:
         self._hover_by_lap.clear()
 
     def _build_hover_cache(self, laps: list[LapTelemetry]) -> None:
         step = max(1, self._hover_downsample_step)
         for lap in laps:
-            if not lap.points:
+            pyramid = self._lap_pyramids.get(lap.lap_number)
+            if pyramid is None or pyramid.size == 0:
                 continue
-            sampled_points = lap.points[::step]
+            x, z, throttle, brake = pyramid.base()
             self._hover_by_lap[lap.lap_number] = {
-                "x": np.array([p.x for p in sampled_points], dtype=float),
-                "z": np.array([p.z for p in sampled_points], dtype=float),
-                "throttle": np.array([p.throttle for p in sampled_points], dtype=float),
-                "brake": np.array([p.brake for p in sampled_points], dtype=float),
+                "x": x[::step],
+                "z": z[::step],
+                "throttle": throttle[::step],
+                "brake": brake[::step],
             }
 
     def _on_mouse_moved(self, scene_pos) -> None:
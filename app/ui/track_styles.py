@@ -0,0 +1,107 @@
+from dataclasses import dataclass
+
+from PyQt5 import QtCore
+import numpy as np
+
+from domain.track_lod import visible_segment_mask
+
+
+STYLE_NAMES = ("solid", "dash", "dot")
+DEFAULT_LAP_COLOR = (0, 220, 255)
+# Modo padrão: cor da volta dividida nos três estilos de pedal.
+COLOR_MODE_PEDALS = "pedals"
+
+
+@dataclass(frozen=True)
+class GradientMode:
+    label: str
+    # Canais da volta (domain/channels.py); mais de um = máximo entre eles por vértice.
+    channels: tuple[str, ...]
+    colormap: str
+    levels: tuple[float, float]
+    unit: str
+    # Só para a legenda (ex.: pedal 0–1 mostrado em %).
+    display_scale: float = 1.0
+
+
+# Colunas fixas do TrackLodPyramid; os demais nomes são canais gravados na volta.
+PYRAMID_CHANNELS = ("throttle", "brake")
+TYRE_CHANNELS = ("tyre_temp_fl", "tyre_temp_fr", "tyre_temp_rl", "tyre_temp_rr")
+# Escala fixa em °C: a mesma cor é a mesma temperatura em qualquer volta.
+TYRE_TEMP_LEVELS = (40.0, 110.0)
+
+GRADIENT_MODES: dict[str, GradientMode] = {
+    "speed_kmh": GradientMode("Velocidade", ("speed_kmh",), "turbo", (0.0, 300.0), "km/h"),
+    "throttle": GradientMode("Acelerador", ("throttle",), "viridis", (0.0, 1.0), "%", display_scale=100.0),
+    "brake": GradientMode("Freio", ("brake",), "CET-L3", (0.0, 1.0), "%", display_scale=100.0),
+    "gear": GradientMode("Marcha", ("gear",), "plasma", (1.0, 7.0), ""),
+    "tyre_temp_max": GradientMode("Temp. pneus (máx)", TYRE_CHANNELS, "CET-D1", TYRE_TEMP_LEVELS, "°C"),
+    "tyre_temp_fl": GradientMode("Temp. pneu FL", ("tyre_temp_fl",), "CET-D1", TYRE_TEMP_LEVELS, "°C"),
+    "tyre_temp_fr": GradientMode("Temp. pneu FR", ("tyre_temp_fr",), "CET-D1", TYRE_TEMP_LEVELS, "°C"),
+    "tyre_temp_rl": GradientMode("Temp. pneu RL", ("tyre_temp_rl",), "CET-D1", TYRE_TEMP_LEVELS, "°C"),
+    "tyre_temp_rr": GradientMode("Temp. pneu RR", ("tyre_temp_rr",), "CET-D1", TYRE_TEMP_LEVELS, "°C"),
+}
+GRADIENT_CHANNELS = tuple(
+    dict.fromkeys(
+        name for mode in GRADIENT_MODES.values() for name in mode.channels if name not in PYRAMID_CHANNELS
+    )
+)
+
+
+def build_style_series(
+    x: np.ndarray,
+    z: np.ndarray,
+    throttle: np.ndarray,
+    brake: np.ndarray,
+    view_rect: tuple[float, float, float, float] | None,
+    brake_threshold: float = 0.10,
+    throttle_threshold: float = 0.10,
+) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+    visible = visible_segment_mask(x, z, view_rect)
+    # Segment i -> i+1 takes the pedal state of its end point.
+    is_dot = brake[1:] > brake_threshold
+    is_solid = ~is_dot & (throttle[1:] > throttle_threshold)
+    is_dash = ~is_dot & ~is_solid
+
+    series = {}
+    for style_name, style_mask in (("solid", is_solid), ("dash", is_dash), ("dot", is_dot)):
+        idx = np.flatnonzero(visible & style_mask)
+        breaks = np.full(len(idx), np.nan)
+        xs = np.column_stack((x[idx], x[idx + 1], breaks)).ravel()
+        zs = np.column_stack((z[idx], z[idx + 1], breaks)).ravel()
+        series[style_name] = (xs, zs)
+    return series
+
+
+def segment_visual(color, style_name: str):
+    base = normalize_color(color)
+    if style_name == "dot":
+        brake_color = blend(base, (255, 70, 70), 0.55)
+        return (*brake_color, 255), 4, QtCore.Qt.DotLine
+    if style_name == "dash":
+        coast_color = blend(base, (180, 180, 180), 0.55)
+        return (*coast_color, 130), 1, QtCore.Qt.DashLine
+    return (*base, 255), 2, QtCore.Qt.SolidLine
+
+
+def style_z(style_name: str) -> int:
+    if style_name == "dot":
+        return 30
+    if style_name == "dash":
+        return 10
+    return 20
+
+
+def normalize_color(color):
+    if isinstance(color, tuple) and len(color) >= 3:
+        return (int(color[0]), int(color[1]), int(color[2]))
+    return DEFAULT_LAP_COLOR
+
+
+def blend(source, target, ratio: float):
+    ratio = max(0.0, min(1.0, ratio))
+    return (
+        int(source[0] * (1.0 - ratio) + target[0] * ratio),
+        int(source[1] * (1.0 - ratio) + target[1] * ratio),
+        int(source[2] * (1.0 - ratio) + target[2] * ratio),
+    )
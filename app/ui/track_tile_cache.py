@@ -0,0 +1,264 @@
+from dataclasses import dataclass
+import math
+from typing import Optional
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+import pyqtgraph as pg
+import numpy as np
+
+from domain.track_lod import TrackLodPyramid
+from app.ui.track_styles import STYLE_NAMES, build_style_series, segment_visual, style_z
+
+
+@dataclass(frozen=True)
+class TileLayer:
+    color: tuple[int, int, int]
+    x: np.ndarray
+    z: np.ndarray
+    throttle: np.ndarray
+    brake: np.ndarray
+
+
+class _TileSignals(QtCore.QObject):
+    tile_ready = QtCore.pyqtSignal(int, object, object)
+
+
+class _TileJob(QtCore.QRunnable):
+    def __init__(
+        self,
+        generation: int,
+        key: tuple[int, int],
+        world_rect: tuple[float, float, float, float],
+        meters_per_pixel: float,
+        tile_px: int,
+        layers: list[TileLayer],
+        thresholds: tuple[float, float],
+        signals: _TileSignals,
+    ):
+        super().__init__()
+        self._generation = generation
+        self._key = key
+        self._world_rect = world_rect
+        self._meters_per_pixel = meters_per_pixel
+        self._tile_px = tile_px
+        self._layers = layers
+        self._thresholds = thresholds
+        self._signals = signals
+
+    def run(self) -> None:
+        image = render_tile(
+            world_rect=self._world_rect,
+            meters_per_pixel=self._meters_per_pixel,
+            tile_px=self._tile_px,
+            layers=self._layers,
+            brake_threshold=self._thresholds[0],
+            throttle_threshold=self._thresholds[1],
+        )
+        self._signals.tile_ready.emit(self._generation, self._key, image)
+
+
+def render_tile(
+    world_rect: tuple[float, float, float, float],
+    meters_per_pixel: float,
+    tile_px: int,
+    layers: list[TileLayer],
+    brake_threshold: float,
+    throttle_threshold: float,
+) -> Optional[QtGui.QImage]:
+    min_x, max_x, min_z, max_z = world_rect
+    # Pens are a few pixels wide; pull in segments that end just outside the tile.
+    margin = meters_per_pixel * 4
+    clip_rect = (min_x - margin, max_x + margin, min_z - margin, max_z + margin)
+
+    strokes = []
+    for layer in layers:
+        series = build_style_series(
+            layer.x,
+            layer.z,
+            layer.throttle,
+            layer.brake,
+            view_rect=clip_rect,
+            brake_threshold=brake_threshold,
+            throttle_threshold=throttle_threshold,
+        )
+        for style_name in STYLE_NAMES:
+            xs, zs = series[style_name]
+            if len(xs):
+                strokes.append((style_z(style_name), layer.color, style_name, xs, zs))
+    if not strokes:
+        return None
+
+    image = QtGui.QImage(tile_px, tile_px, QtGui.QImage.Format_ARGB32_Premultiplied)
+    image.fill(QtCore.Qt.transparent)
+    painter = QtGui.QPainter(image)
+    painter.setRenderHint(QtGui.QPainter.Antialiasing)
+    scale = 1.0 / meters_per_pixel
+    painter.setTransform(QtGui.QTransform(scale, 0.0, 0.0, -scale, -min_x * scale, max_z * scale))
+    for _, color, style_name, xs, zs in sorted(strokes, key=lambda item: item[0]):
+        rgba, width, line_style = segment_visual(color, style_name)
+        pen = QtGui.QPen(QtGui.QColor(*rgba))
+        pen.setWidthF(width)
+        pen.setStyle(line_style)
+        pen.setCosmetic(True)
+        painter.setPen(pen)
+        painter.drawPath(pg.arrayToQPath(xs, zs, connect="finite"))
+    painter.end()
+    return image
+
+
+class TrackTileCache(QtCore.QObject):
+    """
+    Completed laps composited into QImage tiles at power-of-two zoom levels.
+    Tiles are rendered on a worker pool and shown as pixmap items, so panning
+    only moves pixmaps instead of re-rendering every lap curve.
+    """
+
+    def __init__(self, plot: pg.PlotWidget, tile_px: int = 256, max_tiles: int = 192, z_value: float = 0.0):
+        super().__init__()
+        self._plot = plot
+        self._tile_px = tile_px
+        self._max_tiles = max_tiles
+        self._z_value = z_value
+        self._lod_target_px = 2.0
+        self._thresholds = (0.10, 0.10)
+
+        self._pool = QtCore.QThreadPool(self)
+        self._pool.setMaxThreadCount(2)
+        self._signals = _TileSignals()
+        self._signals.tile_ready.connect(self._on_tile_ready)
+
+        self._generation = 0
+        self._signature: Optional[tuple] = None
+        self._sources: list[tuple[tuple[int, int, int], TrackLodPyramid]] = []
+        self._zoom: Optional[int] = None
+        self._layers: list[TileLayer] = []
+        self._items: dict[tuple[int, int], Optional[QtWidgets.QGraphicsPixmapItem]] = {}
+        self._pending: set[tuple[int, int]] = set()
+        self._stale_items: list[QtWidgets.QGraphicsPixmapItem] = []
+        self._visible_keys: set[tuple[int, int]] = set()
+
+    def set_thresholds(self, brake_threshold: float, throttle_threshold: float) -> None:
+        self._thresholds = (brake_threshold, throttle_threshold)
+
+    def set_sources(
+        self,
+        signature: tuple,
+        sources: list[tuple[tuple[int, int, int], TrackLodPyramid]],
+    ) -> bool:
+        if signature == self._signature:
+            return False
+        self._signature = signature
+        self._sources = sources
+        self.invalidate()
+        return True
+
+    def clear(self) -> None:
+        self._signature = None
+        self._sources = []
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._zoom = None
+        self._layers = []
+        self._pending.clear()
+        self._visible_keys.clear()
+        for item in list(self._items.values()) + self._stale_items:
+            if item is not None:
+                self._plot.removeItem(item)
+        self._items.clear()
+        self._stale_items.clear()
+
+    def update_view(self, view_rect: tuple[float, float, float, float] | None, meters_per_pixel: float) -> None:
+        if not self._sources or view_rect is None or meters_per_pixel <= 0.0:
+            return
+
+        zoom = int(round(math.log2(meters_per_pixel)))
+        if zoom != self._zoom:
+            self._change_zoom(zoom)
+
+        tile_mpp = 2.0 ** zoom
+        tile_world = self._tile_px * tile_mpp
+        min_x, max_x, min_z, max_z = view_rect
+        tx_range = range(math.floor(min_x / tile_world), math.floor(max_x / tile_world) + 1)
+        tz_range = range(math.floor(min_z / tile_world), math.floor(max_z / tile_world) + 1)
+
+        self._visible_keys = {(tx, tz) for tx in tx_range for tz in tz_range}
+        for key in self._visible_keys:
+            if key in self._items or key in self._pending:
+                continue
+            tx, tz = key
+            world_rect = (tx * tile_world, (tx + 1) * tile_world, tz * tile_world, (tz + 1) * tile_world)
+            self._pending.add(key)
+            self._pool.start(
+                _TileJob(
+                    generation=self._generation,
+                    key=key,
+                    world_rect=world_rect,
+                    meters_per_pixel=tile_mpp,
+                    tile_px=self._tile_px,
+                    layers=self._layers,
+                    thresholds=self._thresholds,
+                    signals=self._signals,
+                )
+            )
+        self._evict_far_tiles()
+        self._drop_stale_when_ready()
+
+    def _change_zoom(self, zoom: int) -> None:
+        # Old tiles stay on screen until the new zoom level has been rendered.
+        self._generation += 1
+        self._zoom = zoom
+        self._stale_items.extend(item for item in self._items.values() if item is not None)
+        self._items.clear()
+        self._pending.clear()
+
+        tile_mpp = 2.0 ** zoom
+        layers = []
+        for color, pyramid in self._sources:
+            if pyramid.size < 2:
+                continue
+            level = pyramid.select_level(tile_mpp, target_px=self._lod_target_px)
+            # Copies: the pyramid keeps growing on the GUI thread while workers read these.
+            x, z, throttle, brake = (np.array(column, copy=True) for column in pyramid.level(level))
+            layers.append(TileLayer(color=color, x=x, z=z, throttle=throttle, brake=brake))
+        self._layers = layers
+
+    def _on_tile_ready(self, generation: int, key: tuple[int, int], image: Optional[QtGui.QImage]) -> None:
+        if generation != self._generation:
+            return
+        self._pending.discard(key)
+        if image is None:
+            self._items[key] = None
+        else:
+            tile_mpp = 2.0 ** self._zoom
+            tile_world = self._tile_px * tile_mpp
+            item = QtWidgets.QGraphicsPixmapItem(QtGui.QPixmap.fromImage(image))
+            item.setTransformationMode(QtCore.Qt.SmoothTransformation)
+            tx, tz = key
+            item.setTransform(
+                QtGui.QTransform(tile_mpp, 0.0, 0.0, -tile_mpp, tx * tile_world, (tz + 1) * tile_world)
+            )
+            item.setZValue(self._z_value)
+            self._plot.addItem(item)
+            self._items[key] = item
+        self._drop_stale_when_ready()
+
+    def _drop_stale_when_ready(self) -> None:
+        if not self._stale_items or self._visible_keys & self._pending:
+            return
+        for item in self._stale_items:
+            self._plot.removeItem(item)
+        self._stale_items.clear()
+
+    def _evict_far_tiles(self) -> None:
+        if len(self._items) <= self._max_tiles:
+            return
+        for key in list(self._items.keys()):
+            if key in self._visible_keys:
+                continue
+            item = self._items.pop(key)
+            if item is not None:
+                self._plot.removeItem(item)
+            if len(self._items) <= self._max_tiles:
+                break
@@ -1,16 +1,46 @@
+import os
+import time
+from typing import Optional
+
 from PyQt5 import QtCore, QtWidgets
 
-from domain.lap_telemetry import LapTelemetryState
+from app.config import EXPORT_DIR, TRACK_NOTIFY_INTERVAL_MS
+from domain.channels import CHANNELS
+from domain.lap_telemetry import LapTelemetry, LapTelemetryState
+from domain.sectors import SectorTimingEngine
+from domain.ghost import GHOST_BEST, GHOST_FILE, GHOST_LAST, GHOST_OFF, GhostCar
+from app.replay import ReplayService
+from app.services.lap_export import EXPORT_FORMATS, available_formats, load_reference_lap
+from app.ui.delta_panel import format_lap_time
+from app.ui.export_worker import ExportWorker
+from app.ui.lap_notifier import LapChangeNotifier
+from app.ui.profiler import measure
+from app.ui.timeline_scrubber import TimelineScrubber
+from app.ui.track_styles import COLOR_MODE_PEDALS, GRADIENT_MODES
 from app.ui.track_canvas import TrackCanvas
 
 
 class TrackWindow(QtWidgets.QWidget):
-    def __init__(self, lap_state: LapTelemetryState):
+    def __init__(
+        self,
+        lap_state: LapTelemetryState,
+        frame_clock=None,
+        sectors: Optional[SectorTimingEngine] = None,
+        ghost: Optional[GhostCar] = None,
+        replay: Optional[ReplayService] = None,
+    ):
         super().__init__()
         self.lap_state = lap_state
+        self.sectors = sectors
+        self.ghost = ghost
+        self._sectors_version = -1
+        # Com FrameClock, refresh() roda como tarefa de baixa prioridade do relógio.
+        self._frame_clock = frame_clock
         self._lap_buttons: dict[int, QtWidgets.QPushButton] = {}
         self._visible_laps: set[int] = set()
-        self._last_data_version = -1
+        # Snapshot por volta; só as voltas avisadas pelo notifier são copiadas de novo.
+        self._laps: dict[int, LapTelemetry] = {}
+        self._changed_laps: Optional[set[int]] = None
         self._dirty = True
 
         self.setWindowTitle("Track Map")
@@ -33,12 +63,87 @@ class TrackWindow(QtWidgets.QWidget):
         self.follow_checkbox.setChecked(True)
         self.follow_checkbox.stateChanged.connect(self._on_follow_changed)
 
+        self.raster_checkbox = QtWidgets.QCheckBox("Raster history")
+        self.raster_checkbox.setToolTip("Voltas completas em tiles de imagem; só a volta atual fica vetorial")
+        self.raster_checkbox.stateChanged.connect(self._on_raster_changed)
+
+        self.overlay_combo = QtWidgets.QComboBox()
+        self.overlay_combo.addItem("Voltas", "laps")
+        self.overlay_combo.addItem("Densidade", "density")
+        self.overlay_combo.addItem("Freio médio", "brake")
+        self.overlay_combo.addItem("Acel. média", "throttle")
+        self.overlay_combo.currentIndexChanged.connect(self._on_overlay_changed)
+
+        # Cor das voltas: estilos por pedal ou gradiente contínuo por canal.
+        self.color_combo = QtWidgets.QComboBox()
+        self.color_combo.addItem("Cor: pedais", COLOR_MODE_PEDALS)
+        for name, mode in GRADIENT_MODES.items():
+            self.color_combo.addItem(f"Cor: {mode.label}", name)
+        self.color_combo.currentIndexChanged.connect(self._on_color_mode_changed)
+
+        # Volta ideal: soma dos melhores setores da sessão.
+        self.theoretical_label = QtWidgets.QLabel()
+        self.theoretical_label.setStyleSheet("color: #c8c8ff;")
+        self.theoretical_label.setVisible(sectors is not None)
+
+        # Fantasma: melhor volta, última volta ou volta carregada de um export .npz.
+        self.ghost_combo = QtWidgets.QComboBox()
+        self.ghost_combo.addItem("Ghost: off", GHOST_OFF)
+        self.ghost_combo.addItem("Ghost: best", GHOST_BEST)
+        self.ghost_combo.addItem("Ghost: last", GHOST_LAST)
+        self.ghost_combo.addItem("Ghost: file...", GHOST_FILE)
+        self.ghost_combo.setVisible(ghost is not None)
+        if ghost is not None:
+            self.ghost_combo.setCurrentIndex(max(0, self.ghost_combo.findData(ghost.source())))
+        self.ghost_combo.activated.connect(self._on_ghost_activated)
+
+        # Canais extras gravados por amostra (valem a partir da próxima volta).
+        self.channels_button = QtWidgets.QToolButton()
+        self.channels_button.setText("Channels")
+        self.channels_button.setPopupMode(QtWidgets.QToolButton.InstantPopup)
+        channels_menu = QtWidgets.QMenu(self.channels_button)
+        enabled = set(lap_state.get_channels())
+        for name, channel in CHANNELS.items():
+            action = channels_menu.addAction(f"{channel.label} ({channel.dtype})")
+            action.setCheckable(True)
+            action.setChecked(name in enabled)
+            action.setData(name)
+            action.toggled.connect(self._on_channels_changed)
+        self.channels_button.setMenu(channels_menu)
+
+        # Export em background: voltas visíveis ou a sessão inteira.
+        self.export_button = QtWidgets.QToolButton()
+        self.export_button.setText("Export")
+        self.export_button.setPopupMode(QtWidgets.QToolButton.InstantPopup)
+        export_menu = QtWidgets.QMenu(self.export_button)
+        export_menu.addAction("Voltas visíveis...").triggered.connect(lambda: self.export_laps(visible_only=True))
+        export_menu.addAction("Sessão inteira...").triggered.connect(lambda: self.export_laps(visible_only=False))
+        self.export_button.setMenu(export_menu)
+
+        self.export_progress = QtWidgets.QProgressBar()
+        self.export_progress.setFixedWidth(120)
+        self.export_progress.setFormat("Export %v/%m")
+        self.export_progress.setVisible(False)
+
+        self.exporter = ExportWorker(lap_state, parent=self)
+        self.exporter.progress.connect(self._on_export_progress)
+        self.exporter.finished.connect(self._on_export_finished)
+        self.exporter.failed.connect(self._on_export_failed)
+
         self.clear_button = QtWidgets.QPushButton("Clear track")
         self.clear_button.clicked.connect(self.clear_track)
 
         controls.addWidget(self.auto_fit_checkbox)
         controls.addWidget(self.follow_checkbox)
+        controls.addWidget(self.raster_checkbox)
+        controls.addWidget(self.overlay_combo)
+        controls.addWidget(self.color_combo)
+        controls.addWidget(self.ghost_combo)
         controls.addStretch(1)
+        controls.addWidget(self.theoretical_label)
+        controls.addWidget(self.channels_button)
+        controls.addWidget(self.export_progress)
+        controls.addWidget(self.export_button)
         controls.addWidget(self.clear_button)
 
         self.laps_scroll = QtWidgets.QScrollArea()
@@ -54,9 +159,18 @@ class TrackWindow(QtWidgets.QWidget):
         legend_layout = QtWidgets.QHBoxLayout()
         legend_layout.setContentsMargins(0, 0, 0, 0)
         legend_layout.setSpacing(12)
-        legend_layout.addWidget(self._legend_item("Aceleração", "#2aaeff", "solid"))
-        legend_layout.addWidget(self._legend_item("Sem pedal", "#bebebe", "dashed"))
-        legend_layout.addWidget(self._legend_item("Frenagem", "#ff4646", "dotted"))
+        self._pedal_legend = [
+            self._legend_item("Aceleração", "#2aaeff", "solid"),
+            self._legend_item("Sem pedal", "#bebebe", "dashed"),
+            self._legend_item("Frenagem", "#ff4646", "dotted"),
+        ]
+        for item in self._pedal_legend:
+            legend_layout.addWidget(item)
+        self.gradient_legend = QtWidgets.QLabel()
+        self.gradient_legend.setFixedWidth(260)
+        self.gradient_legend.setAlignment(QtCore.Qt.AlignCenter)
+        self.gradient_legend.setVisible(False)
+        legend_layout.addWidget(self.gradient_legend)
         legend_layout.addStretch(1)
 
         self.canvas = TrackCanvas()
@@ -66,38 +180,162 @@ class TrackWindow(QtWidgets.QWidget):
         layout.addLayout(legend_layout)
         layout.addWidget(self.canvas, stretch=1)
 
-        self.refresh_timer = QtCore.QTimer(self)
-        self.refresh_timer.timeout.connect(self.refresh)
-        self.refresh_timer.start(120)
+        self.scrubber = None
+        if replay is not None:
+            self.scrubber = TimelineScrubber(replay)
+            layout.addWidget(self.scrubber)
+
+        # Sem polling: a ingestão avisa quais voltas mudaram, agrupado por frame.
+        self.notifier = LapChangeNotifier(lap_state, min_interval_ms=TRACK_NOTIFY_INTERVAL_MS, parent=self)
+        self.notifier.laps_changed.connect(self._on_laps_changed)
 
     def _on_auto_fit_changed(self, state: int) -> None:
         self.canvas.set_auto_fit(state == QtCore.Qt.Checked)
-        self._dirty = True
+        self._mark_dirty()
 
     def _on_follow_changed(self, state: int) -> None:
         self.canvas.set_follow_car(state == QtCore.Qt.Checked)
+        self._mark_dirty()
+
+    def _on_raster_changed(self, state: int) -> None:
+        self.canvas.set_raster_history(state == QtCore.Qt.Checked)
+        self._mark_dirty()
+
+    def _on_overlay_changed(self, _index: int) -> None:
+        self.canvas.set_overlay_mode(self.overlay_combo.currentData())
+        self._mark_dirty()
+
+    def _on_color_mode_changed(self, _index: int) -> None:
+        mode = self.color_combo.currentData()
+        self.canvas.set_color_mode(mode)
+        gradient = GRADIENT_MODES.get(mode)
+        for item in self._pedal_legend:
+            item.setVisible(gradient is None)
+        self.gradient_legend.setVisible(gradient is not None)
+        if gradient is not None:
+            lut = self.canvas.gradient_lut(mode)
+            stops = ", ".join(
+                f"stop:{index / 4:.2f} rgb({', '.join(str(int(c)) for c in lut[round(index * (len(lut) - 1) / 4)][:3])})"
+                for index in range(5)
+            )
+            low, high = (level * gradient.display_scale for level in gradient.levels)
+            self.gradient_legend.setText(f"{low:.0f} {gradient.unit}  —  {high:.0f} {gradient.unit}".strip())
+            self.gradient_legend.setStyleSheet(
+                f"color: black; font-weight: bold; background: qlineargradient(x1:0, y1:0, x2:1, y2:0, {stops});"
+            )
+        self._mark_dirty()
+
+    def _on_ghost_activated(self, index: int) -> None:
+        source = self.ghost_combo.itemData(index)
+        if source != GHOST_FILE:
+            self.ghost.set_source(source)
+            if source == GHOST_OFF:
+                self.canvas.clear_ghost_position()
+            return
+        path, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Ghost lap", EXPORT_DIR, "Lap export (*.npz)")
+        if path:
+            try:
+                self.ghost.load_reference(load_reference_lap(path))
+            except (OSError, ValueError, KeyError) as exc:
+                QtWidgets.QMessageBox.warning(self, "Ghost", f"Não deu para carregar a volta:\n{exc}")
+        # Cancelado ou falhou: o combo volta para a fonte em uso.
+        self.ghost_combo.setCurrentIndex(max(0, self.ghost_combo.findData(self.ghost.source())))
+
+    def _on_channels_changed(self, _checked: bool) -> None:
+        actions = self.channels_button.menu().actions()
+        self.lap_state.set_channels([action.data() for action in actions if action.isChecked()])
+
+    def _on_laps_changed(self, laps: frozenset) -> None:
+        if self._changed_laps is not None:
+            self._changed_laps |= laps
+        self._mark_dirty()
+
+    def _mark_dirty(self) -> None:
         self._dirty = True
+        # Janela escondida só acumula; o showEvent faz um único refresh.
+        if self._frame_clock is None and self.isVisible():
+            self.refresh()
 
+    def showEvent(self, event) -> None:
+        super().showEvent(event)
+        if self._dirty:
+            self.refresh()
+
+    @measure("TrackWindow.refresh")
     def refresh(self) -> None:
-        data_version = self.lap_state.get_version()
-        if data_version == self._last_data_version and not self._dirty:
+        if self.sectors is not None and self.sectors.get_version() != self._sectors_version:
+            self._dirty = True
+        if not self._dirty or not self.isVisible():
             return
 
-        laps = self.lap_state.get_laps_snapshot()
+        if self._changed_laps is None:
+            self._laps = {lap.lap_number: lap for lap in self.lap_state.get_laps_snapshot()}
+        elif self._changed_laps:
+            for lap_number in self._changed_laps:
+                self._laps.pop(lap_number, None)
+            for lap in self.lap_state.get_laps_snapshot(lap_numbers=self._changed_laps):
+                self._laps[lap.lap_number] = lap
+        self._changed_laps = set()
+
+        laps = [self._laps[lap_number] for lap_number in sorted(self._laps)]
+        if self.sectors is not None:
+            self._sectors_version = self.sectors.get_version()
+            self._refresh_theoretical_best()
         self._sync_lap_buttons(laps)
-        bounds = self.lap_state.get_bounds(visible_laps=self._visible_laps)
+        bounds = None
+        if self.auto_fit_checkbox.isChecked():
+            bounds = self.lap_state.get_bounds(visible_laps=self._visible_laps)
         self.canvas.set_laps(laps=laps, bounds=bounds, visible_laps=self._visible_laps)
-        self._last_data_version = data_version
         self._dirty = False
 
     def clear_track(self) -> None:
         self.lap_state.reset()
+        if self.sectors is not None:
+            self.sectors.reset()
         for button in self._lap_buttons.values():
             self.laps_buttons_layout.removeWidget(button)
             button.deleteLater()
         self._lap_buttons.clear()
         self._visible_laps.clear()
-        self._dirty = True
+        self._mark_dirty()
+
+    def export_laps(self, visible_only: bool) -> None:
+        if self.exporter.is_running():
+            return
+        formats = available_formats()
+        filters = [f"{fmt.upper()} (*{EXPORT_FORMATS[fmt]})" for fmt in formats]
+        os.makedirs(EXPORT_DIR, exist_ok=True)
+        default = os.path.join(EXPORT_DIR, time.strftime("session_%Y%m%d_%H%M%S") + EXPORT_FORMATS[formats[0]])
+        path, selected_filter = QtWidgets.QFileDialog.getSaveFileName(self, "Export laps", default, ";;".join(filters))
+        if not path:
+            return
+        fmt = formats[filters.index(selected_filter)] if selected_filter in filters else formats[0]
+        # A extensão digitada manda, se for de um formato conhecido.
+        for candidate in formats:
+            if path.lower().endswith(EXPORT_FORMATS[candidate]):
+                fmt = candidate
+                break
+        else:
+            path += EXPORT_FORMATS[fmt]
+        lap_numbers = set(self._visible_laps) if visible_only else None
+        if self.exporter.start(path, fmt, lap_numbers):
+            self.export_button.setEnabled(False)
+            self.export_progress.setRange(0, 0)
+            self.export_progress.setVisible(True)
+
+    def _on_export_progress(self, done: int, total: int) -> None:
+        self.export_progress.setRange(0, total)
+        self.export_progress.setValue(done)
+
+    def _on_export_finished(self, path: str, rows: int) -> None:
+        self.export_button.setEnabled(True)
+        self.export_progress.setVisible(False)
+        self.export_button.setToolTip(f"Último export: {path} ({rows} amostras)")
+
+    def _on_export_failed(self, message: str) -> None:
+        self.export_button.setEnabled(True)
+        self.export_progress.setVisible(False)
+        QtWidgets.QMessageBox.warning(self, "Export", f"Falha no export:\n{message}")
 
     def _sync_lap_buttons(self, laps) -> None:
         current_laps = {lap.lap_number for lap in laps}
@@ -132,14 +370,42 @@ class TrackWindow(QtWidgets.QWidget):
             label = f"L{lap.lap_number}"
             if lap.lap_time:
                 label = f"{label} {lap.lap_time}"
+            splits = self._sector_splits(lap.lap_number)
+            if splits:
+                label = f"{label}\n{splits}"
             self._lap_buttons[lap.lap_number].setText(label)
 
+    def _sector_splits(self, lap_number: int) -> str:
+        if self.sectors is None:
+            return ""
+        lap_sectors = self.sectors.lap_sectors(lap_number)
+        if lap_sectors is None:
+            return ""
+        bests = self.sectors.best_sectors()
+        splits = []
+        for index, time_ms in enumerate(lap_sectors.sector_times_ms):
+            if time_ms is None:
+                splits.append(f"S{index + 1} --")
+                continue
+            # * marca o melhor setor da sessão.
+            best = bests[index] if index < len(bests) else None
+            marker = "*" if best is not None and best.lap_number == lap_number else ""
+            splits.append(f"S{index + 1} {time_ms / 1000.0:.3f}{marker}")
+        return "  ".join(splits)
+
+    def _refresh_theoretical_best(self) -> None:
+        theoretical_ms = self.sectors.theoretical_best_ms()
+        if theoretical_ms is None:
+            self.theoretical_label.setText("Ideal --:--.---")
+        else:
+            self.theoretical_label.setText(f"Ideal {format_lap_time(theoretical_ms / 1000.0)}")
+
     def _toggle_lap_visibility(self, lap_number: int, visible: bool) -> None:
         if visible:
             self._visible_laps.add(lap_number)
         else:
             self._visible_laps.discard(lap_number)
-        self._dirty = True
+        self._mark_dirty()
 
     def _legend_item(self, label: str, color: str, line_style: str) -> QtWidgets.QWidget:
         container = QtWidgets.QWidget()
@@ -0,0 +1,96 @@
+import math
+import time
+from typing import Optional
+
+from PyQt5 import QtCore, QtGui
+
+from domain.game_state import GameState
+
+MODE_RACING = "racing"
+MODE_PAUSED = "paused"
+MODE_IDLE = "idle"
+MODE_STALE = "stale"
+
+
+class UiRateController(QtCore.QObject):
+    """
+    Decide o ritmo da UI a partir do estado do stream: taxa cheia correndo,
+    taxa baixa pausado / em menus / sem pacotes. Os timers registrados têm o
+    intervalo trocado apenas quando o modo muda.
+    """
+
+    mode_changed = QtCore.pyqtSignal(str)
+
+    def __init__(
+        self,
+        state: GameState,
+        racing_interval_ms: int = 16,
+        idle_interval_ms: int = 200,
+        stale_after_s: float = 1.0,
+    ):
+        super().__init__()
+        self.state = state
+        self.racing_interval_ms = racing_interval_ms
+        self.idle_interval_ms = idle_interval_ms
+        self.stale_after_s = stale_after_s
+        self._mode: Optional[str] = None
+        self._timers: list[tuple[QtCore.QTimer, Optional[int], Optional[int]]] = []
+
+    @property
+    def mode(self) -> Optional[str]:
+        return self._mode
+
+    def is_racing(self) -> bool:
+        return self._mode == MODE_RACING
+
+    def frame_interval_ms(self) -> int:
+        # Não adianta pintar mais rápido do que a tela atualiza.
+        interval = self.racing_interval_ms
+        screen = QtGui.QGuiApplication.primaryScreen()
+        if screen is not None and screen.refreshRate() > 0:
+            interval = max(interval, math.ceil(1000.0 / screen.refreshRate()))
+        return interval
+
+    def register(
+        self,
+        timer: QtCore.QTimer,
+        racing_ms: Optional[int] = None,
+        idle_ms: Optional[int] = None,
+    ) -> None:
+        """
+        racing_ms=None usa o intervalo de frame; idle_ms=None usa o intervalo ocioso.
+        """
+        self._timers.append((timer, racing_ms, idle_ms))
+        if self._mode is not None:
+            self._apply_timer(timer, racing_ms, idle_ms)
+
+    def update(self) -> str:
+        mode = self._current_mode()
+        if mode != self._mode:
+            self._mode = mode
+            for timer, racing_ms, idle_ms in self._timers:
+                self._apply_timer(timer, racing_ms, idle_ms)
+            self.mode_changed.emit(mode)
+        return mode
+
+    def seconds_since_last_packet(self) -> Optional[float]:
+        if self.state.frame == 0:
+            return None
+        return max(0.0, time.time() - self.state.timestamp)
+
+    def _current_mode(self) -> str:
+        age = self.seconds_since_last_packet()
+        if age is None or age > self.stale_after_s:
+            return MODE_STALE
+        if self.state.is_paused:
+            return MODE_PAUSED
+        if not self.state.is_in_race:
+            return MODE_IDLE
+        return MODE_RACING
+
+    def _apply_timer(self, timer: QtCore.QTimer, racing_ms: Optional[int], idle_ms: Optional[int]) -> None:
+        if self._mode == MODE_RACING:
+            interval = racing_ms if racing_ms is not None else self.frame_interval_ms()
+        else:
+            interval = idle_ms if idle_ms is not None else self.idle_interval_ms
+        timer.setInterval(interval)
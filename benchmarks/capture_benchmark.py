@@ -0,0 +1,156 @@
+"""
+Captura .gt7cap sintética (60 Hz) e o custo de navegar nela: escrita por pacote,
+abertura com e sem rodapé de índice, busca por tempo, preview e seek com
+reconstrução das voltas. Confere que o seek dá o mesmo estado de voltas que
+reproduzir a captura pacote a pacote até o mesmo instante.
+
+Uso:
+    python -m benchmarks.capture_benchmark [--hours 3] [--seeks 50] [--verify-minutes 20]
+"""
+import argparse
+import os
+import struct
+import tempfile
+import time
+
+import numpy as np
+
+from app.replay import ReplayService
+from app.services.track_service import TrackService
+from app.telemetry import TelemetryService
+from benchmarks.ingest_benchmark import synthetic_session
+from domain.game_state import GameState
+from domain.lap_telemetry import LapTelemetryState
+from infrastructure.capture import PACKET_SLOT_BYTES, CaptureReader, CaptureWriter
+
+# Trailer do rodapé (infrastructure/capture.py): index_offset, contagens, magic.
+_TRAILER = struct.Struct("<qqq8s")
+
+CHANNELS = ("speed_kmh", "rpm", "gear")
+
+
+def synthetic_packets(minutes: float) -> np.ndarray:
+    """Pacotes decifrados (n, PACKET_SLOT_BYTES) com os campos que o replay lê."""
+    session = synthetic_session(minutes)
+    count = len(session["x"])
+    payload = np.zeros((count, PACKET_SLOT_BYTES), dtype=np.uint8)
+
+    def put(offset: int, dtype: str, values) -> None:
+        size = np.dtype(dtype).itemsize
+        payload[:, offset:offset + size] = np.asarray(values, dtype=dtype).reshape(-1, 1).view(np.uint8)
+
+    lap = session["lap"]
+    # Tempo da volta anterior: muda a cada volta para o descarte das piores ter efeito.
+    last_lap_ms = np.where(lap > 1, 90_000 + (lap * 7919) % 4000, -1)
+    put(0x00, "<u4", np.full(count, 0x47375330))
+    put(0x04, "<f4", session["x"])
+    put(0x0C, "<f4", session["z"])
+    put(0x3C, "<f4", 6000.0 + 1000.0 * session["throttle"])
+    put(0x44, "<f4", session["fuel"])
+    put(0x4C, "<f4", np.full(count, 50.0))
+    put(0x70, "<i4", np.arange(count))
+    put(0x74, "<i2", lap)
+    put(0x7C, "<i4", last_lap_ms)
+    payload[:, 0x90] = 3
+    payload[:, 0x91] = (session["throttle"] * 255).astype(np.uint8)
+    payload[:, 0x92] = (session["brake"] * 255).astype(np.uint8)
+    return payload
+
+
+def _replay(reader: CaptureReader) -> tuple[ReplayService, LapTelemetryState]:
+    lap_state = LapTelemetryState(max_laps=10, max_points_per_lap=10000, channels=CHANNELS)
+    track_service = TrackService(lap_state, min_distance_m=1.2, sample_interval_ms=50)
+    telemetry = TelemetryService(None, GameState(), track_service=track_service)
+    return ReplayService(reader, telemetry, track_service), lap_state
+
+
+def _laps(lap_state: LapTelemetryState) -> list:
+    return [
+        (lap.lap_number, lap.lap_time, [(p.x, p.z, p.timestamp) for p in lap.points])
+        for lap in lap_state.get_laps_snapshot()
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", type=float, default=3.0)
+    parser.add_argument("--seeks", type=int, default=50)
+    parser.add_argument("--verify-minutes", type=float, default=20.0)
+    args = parser.parse_args()
+
+    payload = synthetic_packets(args.hours * 60.0)
+    count = len(payload)
+    rx_time = (np.arange(count) / 60.0).tolist()
+    rng = np.random.default_rng(1)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.gt7cap")
+        writer = CaptureWriter(path)
+        started = time.perf_counter()
+        for row, rx in zip(payload, rx_time):
+            writer.write(row.tobytes(), rx)
+        write_s = time.perf_counter() - started
+        writer.close()
+
+        started = time.perf_counter()
+        reader = CaptureReader(path)
+        open_ms = (time.perf_counter() - started) * 1000.0
+
+        # Mesma captura sem rodapé (como depois de um crash): corta no início do
+        # índice, mais meio registro escrito pela metade; o índice é refeito na abertura.
+        truncated = os.path.join(directory, "crash.gt7cap")
+        with open(path, "rb") as source, open(truncated, "wb") as target:
+            source.seek(-_TRAILER.size, os.SEEK_END)
+            index_offset = _TRAILER.unpack(source.read(_TRAILER.size))[0]
+            source.seek(0)
+            target.write(source.read(index_offset))
+            target.write(b"\0" * (reader.record_size // 2))
+        started = time.perf_counter()
+        rebuilt = CaptureReader(truncated)
+        scan_ms = (time.perf_counter() - started) * 1000.0
+        same_index = (
+            rebuilt.count == reader.count
+            and rebuilt.index().tobytes() == reader.index().tobytes()
+            and rebuilt.lap_boundaries().tobytes() == reader.lap_boundaries().tobytes()
+        )
+        rebuilt.close()
+
+        targets = rng.uniform(0.0, reader.duration, args.seeks).tolist()
+        started = time.perf_counter()
+        for target in targets:
+            reader.packet_at_time(target)
+        lookup_us = (time.perf_counter() - started) * 1e6 / len(targets)
+
+        replay, lap_state = _replay(reader)
+        started = time.perf_counter()
+        for target in targets:
+            replay._apply(target, rebuild=False)
+        preview_ms = (time.perf_counter() - started) * 1000.0 / len(targets)
+        started = time.perf_counter()
+        for target in targets:
+            replay._apply(target, rebuild=True)
+        seek_ms = (time.perf_counter() - started) * 1000.0 / len(targets)
+
+        # Referência: pacote a pacote desde o início até o instante verificado.
+        verify_s = min(args.verify_minutes * 60.0, reader.duration)
+        replay._apply(verify_s, rebuild=True)
+        live, live_state = _replay(reader)
+        last = reader.packet_at_time(verify_s)
+        for record in reader.read(0, last + 1):
+            live.telemetry.handle_packet(record["payload"][:int(record["length"])].tobytes(), 0.0)
+        same = _laps(lap_state) == _laps(live_state)
+        reader.close()
+
+    print(f"{count} pacotes ({args.hours:g} h a 60 Hz)")
+    print(f"{'escrita':<22} {write_s * 1e6 / count:>10.2f} µs/pacote")
+    print(f"{'abrir (rodapé)':<22} {open_ms:>10.2f} ms")
+    print(f"{'abrir (sem rodapé)':<22} {scan_ms:>10.1f} ms")
+    print(f"{'packet_at_time':<22} {lookup_us:>10.1f} µs")
+    print(f"{'preview':<22} {preview_ms:>10.2f} ms")
+    print(f"{'seek + voltas':<22} {seek_ms:>10.1f} ms")
+    print(f"índice refeito = índice do rodapé: {same_index}")
+    print(f"seek = replay pacote a pacote até {verify_s / 60.0:g} min: {same}")
+
+
+if __name__ == "__main__":
+    main()
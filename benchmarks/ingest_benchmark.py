@@ -0,0 +1,115 @@
+"""
+Compara a ingestão pacote a pacote (TrackService.ingest_position) com a versão em
+lote (ingest_positions) numa sessão sintética a 60 Hz, conferindo que as duas
+gravam exatamente os mesmos pontos, também com o relógio do jogo fora de ordem
+(pacotes trocados e packet_id reiniciado).
+
+Uso:
+    python -m benchmarks.ingest_benchmark [--minutes 120]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from app.services.track_service import TrackService
+from domain.lap_telemetry import LapTelemetryState
+
+PACKET_RATE_HZ = 60.0
+LAP_LENGTH_M = 4000.0
+
+
+def synthetic_session(minutes: float, seed: int = 1) -> dict[str, np.ndarray]:
+    """Circuito oval com velocidade variando e ruído de posição; volta = LAP_LENGTH_M."""
+    rng = np.random.default_rng(seed)
+    count = int(minutes * 60 * PACKET_RATE_HZ)
+    timestamp = np.arange(count) / PACKET_RATE_HZ
+    speed_ms = 45.0 + 25.0 * np.sin(timestamp / 7.0)
+    distance = np.cumsum(speed_ms / PACKET_RATE_HZ)
+    angle = 2 * np.pi * distance / LAP_LENGTH_M
+    radius = LAP_LENGTH_M / (2 * np.pi)
+    return {
+        "x": radius * 1.4 * np.cos(angle) + rng.normal(0.0, 0.05, count),
+        "z": radius * 0.7 * np.sin(angle) + rng.normal(0.0, 0.05, count),
+        "lap": (distance // LAP_LENGTH_M).astype(np.int64) + 1,
+        "timestamp": timestamp,
+        "throttle": rng.random(count),
+        "brake": rng.random(count),
+        "fuel": 100.0 - timestamp / 120.0,
+    }
+
+
+def scrambled_clock(timestamp: np.ndarray, seed: int = 2) -> np.ndarray:
+    """Relógio do jogo com pacotes fora de ordem e um reinício no meio da sessão."""
+    rng = np.random.default_rng(seed)
+    scrambled = timestamp + rng.normal(0.0, 0.04, len(timestamp))
+    scrambled[len(timestamp) // 2:] -= timestamp[len(timestamp) // 2]
+    return scrambled
+
+
+def _service() -> TrackService:
+    return TrackService(LapTelemetryState(max_laps=100000, max_points_per_lap=1_000_000))
+
+
+def _points(service: TrackService) -> list:
+    return [(lap.lap_number, [(p.x, p.z, p.timestamp) for p in lap.points]) for lap in service.lap_state.get_laps_snapshot()]
+
+
+def _ingest_per_packet(session: dict[str, np.ndarray]) -> tuple[TrackService, float]:
+    service = _service()
+    started = time.perf_counter()
+    for x, z, lap, ts, throttle, brake, fuel in zip(
+        session["x"].tolist(),
+        session["z"].tolist(),
+        session["lap"].tolist(),
+        session["timestamp"].tolist(),
+        session["throttle"].tolist(),
+        session["brake"].tolist(),
+        session["fuel"].tolist(),
+    ):
+        service.ingest_position(
+            x=x, z=z, current_lap=lap, last_lap_time=None, current_fuel=fuel,
+            throttle=throttle, brake=brake, timestamp=ts,
+        )
+    return service, time.perf_counter() - started
+
+
+def _ingest_batch(session: dict[str, np.ndarray]) -> tuple[TrackService, float, int]:
+    service = _service()
+    started = time.perf_counter()
+    added = service.ingest_positions(
+        x=session["x"],
+        z=session["z"],
+        lap=session["lap"],
+        timestamp=session["timestamp"],
+        throttle=session["throttle"],
+        brake=session["brake"],
+        fuel=session["fuel"],
+    )
+    return service, time.perf_counter() - started, added
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, default=120.0)
+    args = parser.parse_args()
+
+    session = synthetic_session(args.minutes)
+    count = len(session["x"])
+
+    per_packet, per_packet_s = _ingest_per_packet(session)
+    batch, batch_s, added = _ingest_batch(session)
+    ordered = _points(per_packet) == _points(batch)
+
+    scrambled = dict(session, timestamp=scrambled_clock(session["timestamp"]))
+    scrambled_same = _points(_ingest_per_packet(scrambled)[0]) == _points(_ingest_batch(scrambled)[0])
+
+    print(f"{count} pacotes ({args.minutes:g} min a {PACKET_RATE_HZ:g} Hz), {added} pontos gravados")
+    print(f"{'por pacote':<12} {per_packet_s * 1000.0:>10.1f} ms  {per_packet_s * 1e6 / count:>6.2f} µs/pacote")
+    print(f"{'em lote':<12} {batch_s * 1000.0:>10.1f} ms  {batch_s * 1e6 / count:>6.2f} µs/pacote")
+    print(f"mesmos pontos: {ordered}")
+    print(f"mesmos pontos (relógio fora de ordem): {scrambled_same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Conta alocações de recursos de pintura (QFont, QColor, QPen, gradientes...) por frame
+em cada widget do dashboard, renderizando offscreen em um QImage.
+
+Uso:
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.paint_allocations [--frames 200]
+"""
+import argparse
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5 import QtGui, QtWidgets
+
+PAINT_RESOURCE_TYPES = (
+    "QFont",
+    "QColor",
+    "QPen",
+    "QBrush",
+    "QLinearGradient",
+    "QRadialGradient",
+    "QConicalGradient",
+    "QPainterPath",
+)
+
+
+class AllocationCounter:
+    def __init__(self):
+        self.counts: dict[str, int] = {}
+
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def reset(self) -> None:
+        self.counts.clear()
+
+
+@contextmanager
+def count_paint_resources():
+    """
+    Troca temporariamente as classes do QtGui por subclasses que contam construções.
+    Os widgets resolvem QtGui.<Classe> em tempo de chamada, então enxergam a troca.
+    """
+    counter = AllocationCounter()
+    originals = {}
+    for name in PAINT_RESOURCE_TYPES:
+        original = getattr(QtGui, name)
+        originals[name] = original
+
+        def __init__(self, *args, _name=name, _original=original, **kwargs):
+            counter.counts[_name] = counter.counts.get(_name, 0) + 1
+            _original.__init__(self, *args, **kwargs)
+
+        setattr(QtGui, name, type(name, (original,), {"__init__": __init__}))
+    try:
+        yield counter
+    finally:
+        for name, original in originals.items():
+            setattr(QtGui, name, original)
+
+
+def render_frames(widget: QtWidgets.QWidget, frames: int, on_frame=None) -> dict[str, float]:
+    image = QtGui.QImage(widget.size(), QtGui.QImage.Format_ARGB32_Premultiplied)
+    with count_paint_resources() as counter:
+        # Primeiro frame aquece caches (tema, gradientes por tamanho) e fica fora da conta.
+        widget.render(image)
+        counter.reset()
+        tracemalloc.start()
+        started = time.perf_counter()
+        for frame in range(frames):
+            if on_frame is not None:
+                on_frame(frame)
+            widget.render(image)
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return {
+        "ms_per_frame": elapsed * 1000.0 / frames,
+        "allocs_per_frame": counter.total() / frames,
+        "peak_kib": peak / 1024.0,
+    }
+
+
+def build_widgets():
+    from app.ui.fuel_panel import FuelPanel
+    from app.ui.lap_info_panel import LapInfoPanel
+    from app.ui.rpm_gauge import RpmGauge
+    from app.ui.speed_hauge import SpeedGauge
+    from app.ui.telemetry_graph import TelemetryGraph
+
+    rpm = RpmGauge()
+    rpm.set_values(rpm=6500, rpm_warn=7000, rpm_rev_limiter=8000)
+    widgets = {
+        "SpeedGauge": (SpeedGauge(), (500, 500)),
+        "RpmGauge": (rpm, (500, 500)),
+        "LapInfoPanel": (LapInfoPanel(), (480, 220)),
+        "TelemetryGraph": (TelemetryGraph(), (480, 260)),
+        "FuelPanel": (FuelPanel(), (480, 140)),
+    }
+    for widget, size in widgets.values():
+        widget.resize(*size)
+    return widgets
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=200)
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    widgets = build_widgets()
+
+    print(f"{'widget':<16} {'ms/frame':>9} {'allocs/frame':>13} {'peak KiB':>9}")
+    total_allocs = 0.0
+    for name, (widget, _) in widgets.items():
+        result = render_frames(widget, args.frames)
+        total_allocs += result["allocs_per_frame"]
+        print(
+            f"{name:<16} {result['ms_per_frame']:>9.3f} "
+            f"{result['allocs_per_frame']:>13.1f} {result['peak_kib']:>9.1f}"
+        )
+    print(f"{'total':<16} {'':>9} {total_allocs:>13.1f}")
+    app.processEvents()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""
+Benchmark de renderização offscreen dos widgets de app/ui.
+
+Cada widget do dashboard é renderizado em QImage em vários tamanhos, alimentado
+por uma sequência de telemetria roteirizada (RPM subindo até o limitador,
+combustível baixo piscando, frenagem forte). O TrackCanvas é medido com voltas
+sintéticas de 1k / 10k / 100k pontos: set_laps frio, atualização ao vivo e pintura,
+no modo de cor escolhido (--color-mode; recolor = troca entre dois gradientes).
+
+Uso:
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.render_benchmark [--frames 120] [--points 1000 10000 100000]
+        [--color-mode pedals|speed_kmh|throttle|brake|gear|...]
+"""
+import argparse
+from dataclasses import replace
+import math
+import os
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5 import QtWidgets
+
+from benchmarks.paint_allocations import count_paint_resources, render_frames
+
+GAUGE_SIZES = ((300, 300), (500, 500), (900, 900))
+PANEL_SIZES = ((360, 160), (480, 220), (960, 440))
+TRACK_SIZE = (1000, 700)
+TRACK_LENGTH_M = 5000.0
+
+
+# =========================================================
+# TELEMETRIA ROTEIRIZADA
+# =========================================================
+def scripted_sample(frame: int, frames: int) -> dict:
+    """
+    Uma volta curta em frames: acelera com RPM subindo até o limitador (com trocas
+    de marcha), freia forte no último terço e o combustível cai para a zona de alerta.
+    """
+    phase = frame / max(1, frames - 1)
+    braking = phase > 0.66
+    gear = min(6, 1 + int(phase * 9)) if not braking else max(2, 6 - int((phase - 0.66) * 12))
+    rpm = 8000 if 0.45 < phase < 0.55 else 3500 + 4500 * ((phase * 9) % 1.0)
+    return {
+        "speed": 40 + 260 * phase if not braking else 300 - 600 * (phase - 0.66),
+        "rpm": rpm,
+        "throttle": 0.0 if braking else min(1.0, phase * 4),
+        "brake": 1.0 if braking and phase < 0.85 else (0.4 if braking else 0.0),
+        "gear": gear,
+        "fuel": 40.0 - 35.0 * phase,
+    }
+
+
+def widget_scripts():
+    from app.ui.fuel_panel import FuelPanel
+    from app.ui.lap_info_panel import LapInfoPanel
+    from app.ui.rpm_gauge import RpmGauge
+    from app.ui.speed_hauge import SpeedGauge
+    from app.ui.telemetry_graph import TelemetryGraph
+
+    def speed(widget, sample, frame):
+        widget.set_speed(sample["speed"])
+
+    def rpm(widget, sample, frame):
+        widget.set_values(rpm=sample["rpm"], rpm_warn=7000, rpm_rev_limiter=8000)
+        widget.advance_blink()
+
+    def lap_info(widget, sample, frame):
+        widget.set_values(
+            gear=str(sample["gear"]),
+            suggested_gear=str(max(1, sample["gear"] - 1)),
+            last_lap=f"1:{23 + frame % 30:02d}.{frame % 1000:03d}",
+        )
+
+    def graph(widget, sample, frame):
+        widget.set_inputs(sample["throttle"], sample["brake"])
+
+    def fuel(widget, sample, frame):
+        widget.set_values(fuel_percent=sample["fuel"], last_lap_consume=3.2, remaining_laps=sample["fuel"] / 3.2)
+        widget.advance_blink()
+
+    return {
+        "SpeedGauge": (SpeedGauge, GAUGE_SIZES, speed),
+        "RpmGauge": (RpmGauge, GAUGE_SIZES, rpm),
+        "LapInfoPanel": (LapInfoPanel, PANEL_SIZES, lap_info),
+        "TelemetryGraph": (TelemetryGraph, PANEL_SIZES, graph),
+        "FuelPanel": (FuelPanel, PANEL_SIZES, fuel),
+    }
+
+
+def bench_widgets(frames: int) -> None:
+    print(f"{'widget':<16} {'size':>9} {'ms/frame':>9} {'allocs/frame':>13} {'peak KiB':>9}")
+    for name, (factory, sizes, script) in widget_scripts().items():
+        for width, height in sizes:
+            widget = factory()
+            widget.setMinimumSize(0, 0)
+            widget.resize(width, height)
+
+            def on_frame(frame, widget=widget, script=script):
+                script(widget, scripted_sample(frame, frames), frame)
+
+            result = render_frames(widget, frames, on_frame=on_frame)
+            print(
+                f"{name:<16} {f'{width}x{height}':>9} {result['ms_per_frame']:>9.3f} "
+                f"{result['allocs_per_frame']:>13.1f} {result['peak_kib']:>9.1f}"
+            )
+
+
+# =========================================================
+# TRACK CANVAS
+# =========================================================
+def synthetic_lap(lap_number: int, points: int, offset_m: float = 0.0):
+    """Circuito fechado com curvas de raios variados; freio antes de cada curva."""
+    import numpy as np
+    from domain.lap_telemetry import LapTelemetry
+    from domain.track_state import TrackPoint
+
+    radius = TRACK_LENGTH_M / (2 * math.pi)
+    track_points = []
+    for index in range(points):
+        angle = 2 * math.pi * index / points
+        wobble = 1.0 + 0.25 * math.sin(angle * 5)
+        corner = math.sin(angle * 10)
+        track_points.append(
+            TrackPoint(
+                x=(radius + offset_m) * wobble * math.cos(angle),
+                z=(radius + offset_m) * wobble * math.sin(angle),
+                timestamp=1000.0 + index / 60.0,
+                throttle=max(0.0, -corner),
+                brake=max(0.0, corner - 0.6) * 2.5,
+            )
+        )
+    # Velocidade e marcha caem antes de cada curva (canais para os modos de cor).
+    angles = np.linspace(0.0, 2 * math.pi, points, endpoint=False)
+    speed = (200.0 - 120.0 * np.clip(np.sin(angles * 10), 0.0, None)).astype("float32")
+    return LapTelemetry(
+        lap_number=lap_number,
+        lap_time=None,
+        fuel_end=None,
+        fuel_consumed=None,
+        color=((40 + 60 * lap_number) % 256, 200, (255 - 40 * lap_number) % 256),
+        points=track_points,
+        channels={"speed_kmh": speed, "gear": np.clip(speed // 40, 1, 7).astype("uint8")},
+    )
+
+
+def bench_track(point_counts: list[int], frames: int, color_mode: str) -> None:
+    from PyQt5 import QtGui
+    from app.ui.track_canvas import TrackCanvas
+    from app.ui.track_styles import COLOR_MODE_PEDALS, GRADIENT_MODES
+
+    app = QtWidgets.QApplication.instance()
+    print()
+    print(f"{'TrackCanvas':<16} {'points':>9} {'cold ms':>9} {'live ms':>9} {'paint ms':>9} {'allocs/frame':>13} {'recolor ms':>11}")
+    for count in point_counts:
+        canvas = TrackCanvas()
+        canvas.resize(*TRACK_SIZE)
+        canvas.set_color_mode(color_mode)
+        canvas.show()
+        # Duas voltas completas + a volta ao vivo, que cresce a cada frame.
+        laps = [synthetic_lap(1, count), synthetic_lap(2, count, offset_m=3.0)]
+        live = synthetic_lap(3, count, offset_m=-3.0)
+        visible = {1, 2, 3}
+
+        started = time.perf_counter()
+        canvas.set_laps(laps=laps + [_with_points(live, 1)], bounds=None, visible_laps=visible)
+        cold_ms = (time.perf_counter() - started) * 1000.0
+
+        step = max(1, count // frames)
+        started = time.perf_counter()
+        for frame in range(frames):
+            canvas.set_laps(laps=laps + [_with_points(live, 1 + (frame + 1) * step)], bounds=None, visible_laps=visible)
+        live_ms = (time.perf_counter() - started) * 1000.0 / frames
+
+        app.processEvents()
+        image = QtGui.QImage(canvas.size(), QtGui.QImage.Format_ARGB32_Premultiplied)
+        canvas.render(image)
+        with count_paint_resources() as counter:
+            started = time.perf_counter()
+            for _ in range(frames):
+                canvas.render(image)
+            paint_ms = (time.perf_counter() - started) * 1000.0 / frames
+
+        recolor = "-"
+        if color_mode != COLOR_MODE_PEDALS:
+            other = next(mode for mode in GRADIENT_MODES if mode != color_mode)
+            started = time.perf_counter()
+            for frame in range(frames):
+                canvas.set_color_mode(other if frame % 2 == 0 else color_mode)
+            recolor = f"{(time.perf_counter() - started) * 1000.0 / frames:.2f}"
+        print(
+            f"{'':<16} {count:>9} {cold_ms:>9.1f} {live_ms:>9.2f} {paint_ms:>9.2f} "
+            f"{counter.total() / frames:>13.1f} {recolor:>11}"
+        )
+        canvas.hide()
+        canvas.deleteLater()
+        app.processEvents()
+
+
+def _with_points(lap, count: int):
+    return replace(
+        lap,
+        points=lap.points[:count],
+        channels={name: values[:count] for name, values in lap.channels.items()},
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--points", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--skip-widgets", action="store_true")
+    parser.add_argument("--skip-track", action="store_true")
+    parser.add_argument("--color-mode", default="pedals", help="pedals ou um modo de app.ui.track_styles.GRADIENT_MODES")
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    if not args.skip_widgets:
+        bench_widgets(args.frames)
+    if not args.skip_track:
+        bench_track(args.points, args.frames, args.color_mode)
+    app.processEvents()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from domain.lap_delta import ReferenceLap
+from domain.lap_telemetry import LapTelemetry
+
+
+@dataclass(frozen=True)
+class BrakingZone:
+    # Distâncias (m) no traçado da própria volta.
+    onset_m: float
+    release_m: float
+    peak_brake: float
+    duration_s: float
+    onset_x: float
+    onset_z: float
+
+
+@dataclass(frozen=True)
+class BrakingComparison:
+    corner: int
+    lap_number: int
+    zone: BrakingZone
+    # Ponto de frenagem na distância da volta de referência.
+    onset_ref_m: float
+    # Positivo: freou depois (mais perto da curva) que a referência.
+    onset_delta_m: float
+    peak_delta: float
+    duration_delta_s: float
+
+
+def detect_braking_zones(
+    lap: LapTelemetry,
+    threshold: float = 0.1,
+    merge_gap_m: float = 15.0,
+    min_duration_s: float = 0.2,
+) -> list[BrakingZone]:
+    """
+    Zonas de frenagem da volta, direto nas colunas de freio / posição: trechos
+    com freio acima do limiar, unindo aliviadas curtas (< merge_gap_m) e
+    descartando toques (< min_duration_s).
+    """
+    count = len(lap.points)
+    if count < 2:
+        return []
+    x = np.fromiter((p.x for p in lap.points), dtype=float, count=count)
+    z = np.fromiter((p.z for p in lap.points), dtype=float, count=count)
+    timestamp = np.fromiter((p.timestamp for p in lap.points), dtype=float, count=count)
+    brake = np.fromiter((p.brake for p in lap.points), dtype=float, count=count)
+    distance = np.concatenate(([0.0], np.cumsum(np.hypot(np.diff(x), np.diff(z)))))
+
+    edges = np.diff(np.concatenate(([0], (brake > threshold).astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    # Último índice com freio de cada trecho (inclusivo).
+    ends = np.flatnonzero(edges == -1) - 1
+    if len(starts) == 0:
+        return []
+
+    gaps = distance[starts[1:]] - distance[ends[:-1]]
+    keep = gaps > merge_gap_m
+    starts = np.concatenate((starts[:1], starts[1:][keep]))
+    ends = np.concatenate((ends[:-1][keep], ends[-1:]))
+
+    duration = timestamp[ends] - timestamp[starts]
+    valid = duration >= min_duration_s
+    starts, ends, duration = starts[valid], ends[valid], duration[valid]
+    if len(starts) == 0:
+        return []
+    # Pico por zona: reduceat em pares [início, fim + 1); os trechos entre zonas são descartados.
+    bounds = np.column_stack((starts, ends + 1)).ravel()
+    peaks = np.maximum.reduceat(np.append(brake, 0.0), bounds)[::2]
+
+    return [
+        BrakingZone(
+            onset_m=float(distance[start]),
+            release_m=float(distance[end]),
+            peak_brake=float(peak),
+            duration_s=float(span),
+            onset_x=float(x[start]),
+            onset_z=float(z[start]),
+        )
+        for start, end, peak, span in zip(starts.tolist(), ends.tolist(), peaks.tolist(), duration.tolist())
+    ]
+
+
+def compare_braking(
+    reference: ReferenceLap,
+    reference_zones: list[BrakingZone],
+    zones_by_lap: dict[int, list[BrakingZone]],
+    tolerance_m: float = 60.0,
+) -> list[BrakingComparison]:
+    """
+    Alinha as zonas de cada volta pelas curvas da referência (uma zona da
+    referência = uma curva): o início de cada zona é projetado no traçado da
+    referência e casa com a curva mais próxima dentro de tolerance_m.
+    """
+    if not reference_zones:
+        return []
+    corner_onsets = np.array([zone.onset_m for zone in reference_zones])
+    comparisons: list[BrakingComparison] = []
+    for lap_number, zones in sorted(zones_by_lap.items()):
+        if not zones:
+            continue
+        onsets = np.array([
+            reference.locate_near(zone.onset_x, zone.onset_z, zone.onset_m, span_m=150.0).distance_m
+            for zone in zones
+        ])
+        gaps = np.abs(onsets[:, None] - corner_onsets[None, :])
+        nearest = np.argmin(gaps, axis=1)
+        matched: dict[int, int] = {}
+        for zone_index, corner in enumerate(nearest.tolist()):
+            if gaps[zone_index, corner] > tolerance_m:
+                continue
+            previous = matched.get(corner)
+            if previous is None or gaps[zone_index, corner] < gaps[previous, corner]:
+                matched[corner] = zone_index
+        for corner, zone_index in sorted(matched.items()):
+            zone = zones[zone_index]
+            reference_zone = reference_zones[corner]
+            comparisons.append(
+                BrakingComparison(
+                    corner=corner,
+                    lap_number=lap_number,
+                    zone=zone,
+                    onset_ref_m=float(onsets[zone_index]),
+                    onset_delta_m=float(onsets[zone_index] - reference_zone.onset_m),
+                    peak_delta=zone.peak_brake - reference_zone.peak_brake,
+                    duration_delta_s=zone.duration_s - reference_zone.duration_s,
+                )
+            )
+    return comparisons
+
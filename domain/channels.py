@@ -0,0 +1,122 @@
+from dataclasses import dataclass
+import math
+from typing import Callable, Mapping, Optional, Sequence
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Channel:
+    name: str
+    dtype: str
+    label: str
+    unit: str
+    # Lê o valor do pacote decodificado (TelemetryData); None quando o campo não veio.
+    extract: Callable[[object], Optional[float]]
+
+
+def _field(name: str) -> Callable[[object], Optional[float]]:
+    return lambda data: getattr(data, name, None)
+
+
+def _physics(name: str) -> Callable[[object], Optional[float]]:
+    def extract(data):
+        physics = getattr(data, "physics", None)
+        return getattr(physics, name) if physics is not None else None
+
+    return extract
+
+
+def _gear(data) -> Optional[float]:
+    gear = getattr(data, "gear", None)
+    return gear if isinstance(gear, int) else None
+
+
+CHANNELS: dict[str, Channel] = {
+    channel.name: channel
+    for channel in (
+        Channel("speed_kmh", "float32", "Speed", "km/h", _field("speed_kmh")),
+        Channel("rpm", "float32", "RPM", "rpm", _field("rpm")),
+        Channel("gear", "uint8", "Gear", "", _gear),
+        Channel("fuel", "float32", "Fuel", "L", _field("fuel")),
+        Channel("position_y", "float32", "Altitude", "m", _physics("position_y")),
+        Channel("velocity_x", "float32", "Velocity X", "m/s", _physics("velocity_x")),
+        Channel("velocity_y", "float32", "Velocity Y", "m/s", _physics("velocity_y")),
+        Channel("velocity_z", "float32", "Velocity Z", "m/s", _physics("velocity_z")),
+        Channel("rotation_pitch", "float32", "Pitch", "", _physics("rotation_pitch")),
+        Channel("rotation_yaw", "float32", "Yaw", "", _physics("rotation_yaw")),
+        Channel("rotation_roll", "float32", "Roll", "", _physics("rotation_roll")),
+        Channel("angular_velocity_x", "float32", "Angular vel. X", "rad/s", _physics("angular_velocity_x")),
+        Channel("angular_velocity_y", "float32", "Angular vel. Y", "rad/s", _physics("angular_velocity_y")),
+        Channel("angular_velocity_z", "float32", "Angular vel. Z", "rad/s", _physics("angular_velocity_z")),
+        Channel("tyre_temp_fl", "float32", "Tyre temp FL", "°C", _field("tyre_temp_fl")),
+        Channel("tyre_temp_fr", "float32", "Tyre temp FR", "°C", _field("tyre_temp_fr")),
+        Channel("tyre_temp_rl", "float32", "Tyre temp RL", "°C", _field("tyre_temp_rl")),
+        Channel("tyre_temp_rr", "float32", "Tyre temp RR", "°C", _field("tyre_temp_rr")),
+    )
+}
+
+
+def missing_value(dtype: str) -> float:
+    # Inteiros não têm NaN: campo ausente vira 0.
+    return math.nan if np.dtype(dtype).kind == "f" else 0
+
+
+class ChannelColumns:
+    """
+    Colunas numpy de uma volta, uma por canal habilitado, alinhadas com os
+    TrackPoints da volta. Crescem dobrando a capacidade.
+    """
+
+    def __init__(self, names: Sequence[str], capacity: int = 256):
+        self.names = tuple(names)
+        self._channels = [CHANNELS[name] for name in self.names]
+        self._columns = [np.empty(capacity, dtype=channel.dtype) for channel in self._channels]
+        self._missing = [missing_value(channel.dtype) for channel in self._channels]
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append_from(self, sample) -> None:
+        """sample: pacote decodificado (ou None: linha de valores ausentes)."""
+        self._reserve(self._size + 1)
+        index = self._size
+        for column, channel, missing in zip(self._columns, self._channels, self._missing):
+            value = channel.extract(sample) if sample is not None else None
+            column[index] = missing if value is None else value
+        self._size += 1
+
+    def extend(self, count: int, values: Optional[Mapping[str, np.ndarray]]) -> None:
+        """Lote: canais ausentes em values entram como valores ausentes."""
+        self._reserve(self._size + count)
+        end = self._size + count
+        for name, column, missing in zip(self.names, self._columns, self._missing):
+            source = values.get(name) if values is not None else None
+            column[self._size:end] = missing if source is None else source
+        self._size = end
+
+    def drop_front(self, count: int) -> None:
+        # Acompanha o descarte do deque de pontos cheio (raro: maxlen bem acima de uma volta).
+        count = min(count, self._size)
+        for column in self._columns:
+            column[:self._size - count] = column[count:self._size]
+        self._size -= count
+
+    def snapshot(self) -> dict[str, np.ndarray]:
+        return {name: column[:self._size].copy() for name, column in zip(self.names, self._columns)}
+
+    def _reserve(self, size: int) -> None:
+        capacity = len(self._columns[0]) if self._columns else 0
+        if size <= capacity:
+            return
+        capacity = max(size, capacity * 2)
+        self._columns = [np.resize(column, capacity) for column in self._columns]
+
+
+def validate_channels(names: Sequence[str]) -> tuple[str, ...]:
+    unknown = [name for name in names if name not in CHANNELS]
+    if unknown:
+        raise ValueError(f"unknown telemetry channels: {', '.join(unknown)}")
+    # Ordem do registro, sem repetição.
+    return tuple(name for name in CHANNELS if name in set(names))
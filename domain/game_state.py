@@ -7,6 +7,11 @@ from typing import Optional
 class GameState:
     # Meta
     timestamp: float = 0.0
+    frame: int = 0
+    # Chegada do datagrama no relógio time.monotonic() (kernel, quando disponível).
+    rx_time: float = 0.0
+    # Relógio do jogo: contador de pacotes (60 Hz).
+    packet_id: int = 0
 
     # Dinâmica
     speed_kmh: float = 0.0
@@ -26,7 +31,9 @@ class GameState:
     total_laps: int = 0
     current_position: int = 0
     total_cars: int = 0
-    
+    is_paused: bool = False
+    is_in_race: bool = False
+
 
     def update(
         self,
@@ -48,8 +55,16 @@ class GameState:
         total_laps: int = 0,
         current_position: int = 0,
         total_cars: int = 0,
+        is_paused: Optional[bool] = None,
+        is_in_race: Optional[bool] = None,
+        rx_time: Optional[float] = None,
+        packet_id: Optional[int] = None,
     ):
         self.timestamp = time.time()
+        self.rx_time = rx_time if rx_time is not None else time.monotonic()
+        if packet_id is not None:
+            self.packet_id = packet_id
+        self.frame += 1
         self.throttle = throttle
         self.brake = brake
         self.rpm = rpm
@@ -70,5 +85,7 @@ class GameState:
         self.current_position = current_position
         self.total_cars = total_cars
         self.suggested_gear = suggested_gear
+        self.is_paused = bool(is_paused)
+        self.is_in_race = bool(is_in_race)
 
 
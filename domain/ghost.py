@@ -0,0 +1,133 @@
+import threading
+import time
+from typing import Optional
+
+from domain.lap_delta import ReferenceLap
+from domain.lap_telemetry import LapTelemetryState
+
+GHOST_OFF = "off"
+GHOST_BEST = "best"
+GHOST_LAST = "last"
+GHOST_FILE = "file"
+GHOST_SOURCES = (GHOST_OFF, GHOST_BEST, GHOST_LAST, GHOST_FILE)
+
+
+class GhostCar:
+    """
+    Carro fantasma: onde a volta de referência estava no mesmo tempo de volta
+    que o carro agora.
+
+    observe() roda a cada pacote (thread de ingestão) e só guarda o relógio da
+    volta atual: início da volta e último pacote no relógio do jogo, com o
+    instante de chegada. position() roda a cada frame (thread da GUI) e avança
+    esse relógio até agora (dead reckoning, no máximo max_extrapolation_s além
+    do último pacote) antes da busca O(log n) na referência.
+    """
+
+    def __init__(self, lap_state: LapTelemetryState, source: str = GHOST_BEST, max_extrapolation_s: float = 0.25):
+        if source not in GHOST_SOURCES:
+            raise ValueError(f"Unknown ghost source: {source}")
+        self.lap_state = lap_state
+        self.max_extrapolation_s = max_extrapolation_s
+        self._lock = threading.Lock()
+        self._source = source
+        self._reference: Optional[ReferenceLap] = None
+        self._file_reference: Optional[ReferenceLap] = None
+        # Id (LapTelemetryState) da volta da sessão usada como referência.
+        self._reference_id: Optional[int] = None
+        self._summary_version = -1
+        self._lap_number: Optional[int] = None
+        self._lap_start = 0.0
+        # (relógio do jogo, time.monotonic()) do último pacote.
+        self._last_sample: Optional[tuple[float, float]] = None
+
+    # =========================================================
+    # CONFIGURAÇÃO
+    # =========================================================
+    def set_source(self, source: str) -> None:
+        if source not in GHOST_SOURCES:
+            raise ValueError(f"Unknown ghost source: {source}")
+        with self._lock:
+            self._source = source
+            self._summary_version = -1
+            self._select_reference()
+
+    def source(self) -> str:
+        with self._lock:
+            return self._source
+
+    def load_reference(self, reference: ReferenceLap) -> None:
+        """Volta vinda de fora da sessão (ex.: export .npz); passa a ser a fonte."""
+        with self._lock:
+            self._file_reference = reference
+            self._source = GHOST_FILE
+            self._summary_version = -1
+            self._select_reference()
+
+    def reference_lap(self) -> Optional[int]:
+        with self._lock:
+            return self._reference.lap_number if self._reference is not None else None
+
+    def reset(self) -> None:
+        with self._lock:
+            self._reference = None
+            self._reference_id = None
+            self._summary_version = -1
+            self._lap_number = None
+            self._last_sample = None
+
+    # =========================================================
+    # ATUALIZAÇÃO
+    # =========================================================
+    def observe(self, lap_number: Optional[int], timestamp: float, rx_time: Optional[float] = None) -> None:
+        if lap_number is None or lap_number <= 0:
+            return
+        with self._lock:
+            if lap_number != self._lap_number or timestamp < self._lap_start:
+                self._lap_number = lap_number
+                self._lap_start = timestamp
+            self._last_sample = (timestamp, rx_time if rx_time is not None else time.monotonic())
+            version = self.lap_state.get_summary_version()
+            if version != self._summary_version:
+                self._summary_version = version
+                self._select_reference()
+
+    def position(self, now: Optional[float] = None) -> Optional[tuple[float, float]]:
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            reference = self._reference
+            if reference is None or self._last_sample is None:
+                return None
+            timestamp, rx_time = self._last_sample
+            ahead = min(max(now - rx_time, 0.0), self.max_extrapolation_s)
+            elapsed = timestamp - self._lap_start + ahead
+        return reference.position_at_time(elapsed)
+
+    def _select_reference(self) -> None:
+        if self._source in (GHOST_OFF, GHOST_FILE):
+            self._reference = self._file_reference if self._source == GHOST_FILE else None
+            self._reference_id = None
+            return
+
+        lap_times = self.lap_state.get_lap_times_ms()
+        lap_times.pop(self._lap_number, None)
+        if not lap_times:
+            self._reference = None
+            self._reference_id = None
+            return
+        if self._source == GHOST_BEST:
+            target = min(lap_times, key=lap_times.get)
+        else:
+            target = max(lap_times)
+        # Pelo id, não pelo número: o mesmo número regravado (corrida reiniciada) é outra volta.
+        target_id = self.lap_state.get_lap_ids().get(target)
+        if self._reference is not None and self._reference_id is not None and self._reference_id == target_id:
+            return
+        laps = self.lap_state.get_laps_snapshot({target})
+        if not laps or len(laps[0].points) < 2:
+            self._reference = None
+            self._reference_id = None
+            return
+        self._reference = ReferenceLap(target, laps[0].points, lap_times[target])
+        self._reference_id = target_id
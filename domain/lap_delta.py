@@ -0,0 +1,277 @@
+from bisect import bisect_right
+from dataclasses import dataclass
+import math
+import threading
+from typing import Optional
+
+import numpy as np
+
+from domain.lap_telemetry import LapTelemetryState
+from domain.track_state import TrackPoint
+
+
+@dataclass(frozen=True)
+class TrackProjection:
+    # Segmento [index, index + 1] da referência e fração ao longo dele.
+    index: int
+    fraction: float
+    distance_m: float
+    # Distância lateral do ponto até o segmento.
+    offset_m: float
+
+
+class ReferenceLap:
+    """
+    Volta indexada por distância percorrida: posição, distância acumulada e tempo
+    desde o início da volta (relógio do jogo) por ponto. locate() projeta uma
+    posição na linha da volta olhando só alguns segmentos a partir de uma dica.
+    """
+
+    def __init__(self, lap_number: int, points: list[TrackPoint], lap_time_ms: Optional[int] = None):
+        if len(points) < 2:
+            raise ValueError("reference lap needs at least two points")
+        self.lap_number = lap_number
+        self.lap_time_ms = lap_time_ms
+        self.x = np.fromiter((p.x for p in points), dtype=float, count=len(points))
+        self.z = np.fromiter((p.z for p in points), dtype=float, count=len(points))
+        timestamps = np.fromiter((p.timestamp for p in points), dtype=float, count=len(points))
+        self.time = timestamps - timestamps[0]
+        steps = np.hypot(np.diff(self.x), np.diff(self.z))
+        self.distance = np.concatenate(([0.0], np.cumsum(steps)))
+        self.length_m = float(self.distance[-1])
+        self.segment_count = len(points) - 1
+        # Listas para o laço curto da busca local (mais rápido que numpy em 10 elementos).
+        self._xs = self.x.tolist()
+        self._zs = self.z.tolist()
+        self._times = self.time.tolist()
+        self._distances = self.distance.tolist()
+
+    def locate(self, x: float, z: float, hint: Optional[int] = None, window: int = 8) -> TrackProjection:
+        """
+        Com hint: testa só os segmentos [hint - 2, hint + window] (O(1) por amostra).
+        Sem hint: busca em todos os segmentos (vetorizada).
+        """
+        if hint is None:
+            return self._locate_global(x, z)
+        best: Optional[tuple[float, int, float]] = None
+        xs, zs = self._xs, self._zs
+        for index in range(max(0, hint - 2), min(self.segment_count, hint + window + 1)):
+            ax, az = xs[index], zs[index]
+            dx, dz = xs[index + 1] - ax, zs[index + 1] - az
+            length_sq = dx * dx + dz * dz
+            fraction = ((x - ax) * dx + (z - az) * dz) / length_sq if length_sq > 0 else 0.0
+            fraction = min(1.0, max(0.0, fraction))
+            offset = math.hypot(ax + dx * fraction - x, az + dz * fraction - z)
+            if best is None or offset < best[0]:
+                best = (offset, index, fraction)
+        if best is None:
+            return self._locate_global(x, z)
+        offset, index, fraction = best
+        return self._projection(index, fraction, offset)
+
+    def locate_near(self, x: float, z: float, distance_m: float, span_m: float) -> TrackProjection:
+        """
+        Busca só nos segmentos a até span_m da distância esperada: evita casar com
+        um trecho vizinho da pista (grampo, reta paralela).
+        """
+        first = max(0, int(np.searchsorted(self.distance, distance_m - span_m)) - 1)
+        last = min(self.segment_count, int(np.searchsorted(self.distance, distance_m + span_m)) + 1)
+        if last <= first:
+            return self._locate_global(x, z)
+        return self._locate_global(x, z, first, last)
+
+    def _locate_global(self, x: float, z: float, first: int = 0, last: Optional[int] = None) -> TrackProjection:
+        if last is None:
+            last = self.segment_count
+        ax, az = self.x[first:last], self.z[first:last]
+        dx, dz = self.x[first + 1:last + 1] - ax, self.z[first + 1:last + 1] - az
+        length_sq = dx * dx + dz * dz
+        with np.errstate(invalid="ignore", divide="ignore"):
+            fraction = np.where(length_sq > 0, ((x - ax) * dx + (z - az) * dz) / length_sq, 0.0)
+        fraction = np.clip(fraction, 0.0, 1.0)
+        offsets = np.hypot(ax + dx * fraction - x, az + dz * fraction - z)
+        index = int(np.argmin(offsets))
+        return self._projection(first + index, float(fraction[index]), float(offsets[index]))
+
+    def _projection(self, index: int, fraction: float, offset: float) -> TrackProjection:
+        start = self._distances[index]
+        distance = start + (self._distances[index + 1] - start) * fraction
+        return TrackProjection(index=index, fraction=fraction, distance_m=distance, offset_m=offset)
+
+    def position_at_distance(self, distance_m: float) -> tuple[float, float]:
+        return (
+            float(np.interp(distance_m, self.distance, self.x)),
+            float(np.interp(distance_m, self.distance, self.z)),
+        )
+
+    def position_at_time(self, elapsed_s: float) -> Optional[tuple[float, float]]:
+        """Posição no instante elapsed_s da volta: bissecção nos tempos + interpolação, O(log n)."""
+        times = self._times
+        if elapsed_s < 0.0 or elapsed_s > times[-1]:
+            return None
+        index = min(bisect_right(times, elapsed_s), len(times) - 1)
+        start, end = times[index - 1], times[index]
+        fraction = (elapsed_s - start) / (end - start) if end > start else 0.0
+        return (
+            self._xs[index - 1] + (self._xs[index] - self._xs[index - 1]) * fraction,
+            self._zs[index - 1] + (self._zs[index] - self._zs[index - 1]) * fraction,
+        )
+
+    def distance_at_time(self, elapsed_s: float) -> float:
+        """Distância percorrida pela referência em elapsed_s da volta (limitada à volta)."""
+        return float(np.interp(elapsed_s, self.time, self.distance))
+
+    def time_at(self, projection: TrackProjection) -> float:
+        start = self._times[projection.index]
+        return start + (self._times[projection.index + 1] - start) * projection.fraction
+
+    @property
+    def duration_s(self) -> float:
+        if self.lap_time_ms is not None:
+            return self.lap_time_ms / 1000.0
+        return self._times[-1]
+
+
+@dataclass(frozen=True)
+class DeltaReading:
+    lap_number: int
+    reference_lap: int
+    # Positivo: mais lento que a referência no mesmo ponto da pista.
+    delta_s: float
+    elapsed_s: float
+    reference_lap_s: float
+    predicted_lap_s: float
+    distance_m: float
+    progress: float
+
+
+class LapDeltaEngine:
+    """
+    Delta ao vivo contra a melhor volta guardada (ou uma volta escolhida).
+
+    observe() roda a cada pacote na thread de ingestão, com a posição já na
+    orientação do traçado: projeta o carro na referência a partir do segmento da
+    amostra anterior (janela fixa, O(1)) e compara o tempo da volta atual com o
+    tempo da referência naquele ponto. Quando o carro se afasta da linha (box,
+    corte, referência nova), procura primeiro a search_span_m de onde a
+    referência estaria no mesmo tempo de volta, para não casar com um trecho
+    vizinho (grampo, reta paralela); a busca global é o último recurso.
+    """
+
+    def __init__(
+        self,
+        lap_state: LapTelemetryState,
+        relocate_m: float = 30.0,
+        max_offset_m: float = 60.0,
+        search_span_m: float = 300.0,
+    ):
+        self.lap_state = lap_state
+        self.relocate_m = relocate_m
+        self.max_offset_m = max_offset_m
+        self.search_span_m = search_span_m
+        self._lock = threading.Lock()
+        self._reference: Optional[ReferenceLap] = None
+        # Id (LapTelemetryState) da volta de referência: o mesmo número regravado é outra volta.
+        self._reference_id: Optional[int] = None
+        self._chosen_lap: Optional[int] = None
+        self._summary_version = -1
+        self._lap_number: Optional[int] = None
+        self._lap_start = 0.0
+        self._cursor: Optional[int] = None
+        self._reading: Optional[DeltaReading] = None
+
+    def set_reference_lap(self, lap_number: Optional[int]) -> None:
+        """None volta para a melhor volta. Aplicado no próximo pacote."""
+        with self._lock:
+            self._chosen_lap = lap_number
+            self._summary_version = -1
+
+    def reference_lap(self) -> Optional[int]:
+        with self._lock:
+            return self._reference.lap_number if self._reference is not None else None
+
+    def reading(self) -> Optional[DeltaReading]:
+        with self._lock:
+            return self._reading
+
+    def reset(self) -> None:
+        with self._lock:
+            self._reference = None
+            self._reference_id = None
+            self._summary_version = -1
+            self._lap_number = None
+            self._cursor = None
+            self._reading = None
+
+    def observe(self, lap_number: Optional[int], x: float, z: float, timestamp: float) -> None:
+        if lap_number is None or lap_number <= 0:
+            return
+        with self._lock:
+            if lap_number != self._lap_number or timestamp < self._lap_start:
+                self._lap_number = lap_number
+                self._lap_start = timestamp
+                self._cursor = 0
+                self._reading = None
+
+            # Voltas fecham / são descartadas raramente: a versão evita refazer a escolha a cada pacote.
+            version = self.lap_state.get_summary_version()
+            if version != self._summary_version:
+                self._summary_version = version
+                self._select_reference(lap_number)
+
+            reference = self._reference
+            if reference is None:
+                self._reading = None
+                return
+            elapsed = timestamp - self._lap_start
+            projection = reference.locate(x, z, self._cursor) if self._cursor is not None else None
+            if projection is None or projection.offset_m > self.relocate_m:
+                projection = reference.locate_near(
+                    x, z, reference.distance_at_time(elapsed), self.search_span_m
+                )
+                if projection.offset_m > self.relocate_m:
+                    projection = reference.locate(x, z)
+            if projection.offset_m > self.max_offset_m:
+                # Fora da pista da referência (box, outro traçado): sem delta confiável.
+                self._reading = None
+                return
+            self._cursor = projection.index
+
+            delta = elapsed - reference.time_at(projection)
+            self._reading = DeltaReading(
+                lap_number=lap_number,
+                reference_lap=reference.lap_number,
+                delta_s=delta,
+                elapsed_s=elapsed,
+                reference_lap_s=reference.duration_s,
+                predicted_lap_s=reference.duration_s + delta,
+                distance_m=projection.distance_m,
+                progress=projection.distance_m / reference.length_m if reference.length_m > 0 else 0.0,
+            )
+
+    def _select_reference(self, current_lap: int) -> None:
+        lap_times = self.lap_state.get_lap_times_ms()
+        lap_times.pop(current_lap, None)
+        if self._chosen_lap is not None and self._chosen_lap != current_lap:
+            target = self._chosen_lap
+        elif lap_times:
+            target = min(lap_times, key=lap_times.get)
+        else:
+            target = None
+
+        if target is None:
+            self._reference = None
+            self._reference_id = None
+            return
+        target_id = self.lap_state.get_lap_ids().get(target)
+        if self._reference is not None and self._reference_id == target_id:
+            return
+        laps = self.lap_state.get_laps_snapshot({target})
+        if not laps or len(laps[0].points) < 2:
+            self._reference = None
+            self._reference_id = None
+            return
+        self._reference = ReferenceLap(target, laps[0].points, lap_times.get(target))
+        self._reference_id = target_id
+        # Referência nova: a janela local não vale mais, a próxima amostra busca perto da distância esperada.
+        self._cursor = None
@@ -1,8 +1,11 @@
 from collections import deque
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import threading
-from typing import Optional
+from typing import Callable, Mapping, Optional, Sequence
 
+import numpy as np
+
+from domain.channels import ChannelColumns, validate_channels
 from domain.track_state import TrackBounds, TrackPoint
 
 
@@ -14,16 +17,48 @@ class LapTelemetry:
     fuel_consumed: Optional[float]
     color: tuple[int, int, int]
     points: list[TrackPoint]
+    # Canais extras habilitados quando a volta começou, alinhados com points.
+    channels: dict[str, np.ndarray] = field(default_factory=dict)
 
 
 class LapTelemetryState:
-    def __init__(self, max_laps: int = 10, max_points_per_lap: int = 8000):
+    def __init__(self, max_laps: int = 10, max_points_per_lap: int = 8000, channels: Sequence[str] = ()):
         self._max_laps = max_laps
         self._max_points_per_lap = max_points_per_lap
+        self._channels = validate_channels(channels)
         self._laps: dict[int, dict[str, object]] = {}
         self._enabled = True
         self._lock = threading.Lock()
         self._version = 0
+        self._summary_version = 0
+        # Identidade de cada volta criada: o número se repete depois de reset / nova corrida.
+        self._lap_serial = 0
+        self._listeners: list[Callable[[set[int]], None]] = []
+
+    def add_listener(self, listener: Callable[[set[int]], None]) -> None:
+        """
+        listener(laps) é chamado na thread de quem alterou o estado (normalmente a
+        thread de ingestão), fora do lock, com as voltas que mudaram ou sumiram.
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+    def _notify(self, laps: set[int]) -> None:
+        for listener in self._listeners:
+            listener(laps)
+
+    def set_channels(self, channels: Sequence[str]) -> None:
+        """Canais gravados a partir da próxima volta; as voltas existentes mantêm os seus."""
+        names = validate_channels(channels)
+        with self._lock:
+            self._channels = names
+
+    def get_channels(self) -> tuple[str, ...]:
+        with self._lock:
+            return self._channels
+
+    def get_max_laps(self) -> int:
+        return self._max_laps
 
     def add_point(
         self,
@@ -33,29 +68,34 @@ class LapTelemetryState:
         timestamp: float,
         throttle: float = 0.0,
         brake: float = 0.0,
+        rx_time: float = 0.0,
+        wall_time: float = 0.0,
+        sample: Optional[object] = None,
     ) -> bool:
+        """sample: pacote decodificado de onde saem os canais extras da volta (se houver)."""
         if lap_number <= 0:
             return False
 
+        changed = {lap_number}
         with self._lock:
             if not self._enabled:
                 return False
 
             if lap_number not in self._laps:
-                self._laps[lap_number] = {
-                    "lap_time": None,
-                    "lap_time_ms": None,
-                    "fuel_end": None,
-                    "color": self._color_for_lap(lap_number),
-                    "points": deque(maxlen=self._max_points_per_lap),
-                }
-                self._trim_old_laps()
+                self._laps[lap_number] = self._new_lap(lap_number)
+                changed |= self._trim_old_laps()
                 self._version += 1
+                self._summary_version += 1
 
-            lap = self._laps[lap_number]
-            lap_points = lap["points"]
+            lap = self._laps.get(lap_number)
+            lap_points = lap["points"] if lap is not None else None
             if not isinstance(lap_points, deque):
                 return False
+            columns = lap["channels"]
+            if columns is not None:
+                if len(lap_points) == lap_points.maxlen:
+                    columns.drop_front(1)
+                columns.append_from(sample)
             lap_points.append(
                 TrackPoint(
                     x=x,
@@ -63,10 +103,76 @@ class LapTelemetryState:
                     timestamp=timestamp,
                     throttle=throttle,
                     brake=brake,
+                    rx_time=rx_time,
+                    wall_time=wall_time,
                 )
             )
             self._version += 1
-            return True
+        self._notify(changed)
+        return True
+
+    def add_points(
+        self,
+        lap_number: int,
+        x: np.ndarray,
+        z: np.ndarray,
+        timestamp: np.ndarray,
+        throttle: np.ndarray,
+        brake: np.ndarray,
+        rx_time: Optional[np.ndarray] = None,
+        wall_time: Optional[np.ndarray] = None,
+        channels: Optional[Mapping[str, np.ndarray]] = None,
+    ) -> int:
+        """
+        Versão em lote de add_point para uma única volta: um lock e uma notificação
+        para o bloco inteiro. channels: colunas por nome de canal, mesmo tamanho de x.
+        Retorna quantos pontos entraram.
+        """
+        count = len(x)
+        if lap_number <= 0 or count == 0:
+            return 0
+        if rx_time is None:
+            rx_time = np.zeros(count)
+        if wall_time is None:
+            wall_time = np.zeros(count)
+
+        points = [
+            TrackPoint(x=px, z=pz, timestamp=pt, throttle=pth, brake=pb, rx_time=prx, wall_time=pw)
+            for px, pz, pt, pth, pb, prx, pw in zip(
+                np.asarray(x, dtype=float).tolist(),
+                np.asarray(z, dtype=float).tolist(),
+                np.asarray(timestamp, dtype=float).tolist(),
+                np.asarray(throttle, dtype=float).tolist(),
+                np.asarray(brake, dtype=float).tolist(),
+                np.asarray(rx_time, dtype=float).tolist(),
+                np.asarray(wall_time, dtype=float).tolist(),
+            )
+        ]
+
+        changed = {lap_number}
+        with self._lock:
+            if not self._enabled:
+                return 0
+            if lap_number not in self._laps:
+                self._laps[lap_number] = self._new_lap(lap_number)
+                changed |= self._trim_old_laps()
+                self._summary_version += 1
+            lap = self._laps.get(lap_number)
+            if lap is None:
+                return 0
+            lap_points = lap["points"]
+            if not isinstance(lap_points, deque):
+                return 0
+            columns = lap["channels"]
+            if columns is not None:
+                overflow = len(lap_points) + count - lap_points.maxlen
+                columns.extend(count, channels)
+                if overflow > 0:
+                    columns.drop_front(overflow)
+            lap_points.extend(points)
+            self._version += 1
+        self._notify(changed)
+        return count
 
     def set_lap_summary(
         self,
@@ -85,12 +191,20 @@ class LapTelemetryState:
                 if fuel_end is not None:
                     lap["fuel_end"] = fuel_end
                 self._version += 1
+                self._summary_version += 1
+        if lap is not None:
+            self._notify({lap_number})
 
-    def get_laps_snapshot(self) -> list[LapTelemetry]:
+    def get_laps_snapshot(self, lap_numbers: Optional[set[int]] = None) -> list[LapTelemetry]:
+        """
+        lap_numbers limita a cópia às voltas pedidas (as que não existem mais são ignoradas).
+        """
         with self._lock:
             laps: list[LapTelemetry] = []
             consumptions = self._fuel_consumption_by_lap()
             for lap_number in sorted(self._laps.keys()):
+                if lap_numbers is not None and lap_number not in lap_numbers:
+                    continue
                 lap = self._laps[lap_number]
                 lap_points = lap["points"]
                 if not isinstance(lap_points, deque):
@@ -108,10 +222,33 @@ class LapTelemetryState:
                         fuel_consumed=consumptions.get(lap_number),
                         color=color,
                         points=list(lap_points),
+                        channels=lap["channels"].snapshot() if lap["channels"] is not None else {},
                     )
                 )
             return laps
 
+    def get_lap_channels(self) -> dict[int, tuple[str, ...]]:
+        """Canais gravados em cada volta, sem copiar pontos (ex.: esquema de um export)."""
+        with self._lock:
+            return {
+                lap_number: lap["channels"].names if lap["channels"] is not None else ()
+                for lap_number, lap in self._laps.items()
+            }
+
+    def get_lap_ids(self) -> dict[int, int]:
+        """Id único de cada volta guardada; muda quando o mesmo número volta a ser gravado do zero."""
+        with self._lock:
+            return {lap_number: lap["id"] for lap_number, lap in self._laps.items()}
+
+    def get_lap_times_ms(self) -> dict[int, int]:
+        """Tempo oficial (ms) das voltas fechadas que ainda estão guardadas."""
+        with self._lock:
+            return {
+                lap_number: lap["lap_time_ms"]
+                for lap_number, lap in self._laps.items()
+                if isinstance(lap["lap_time_ms"], int)
+            }
+
     def get_last_lap_consumption(self) -> Optional[float]:
         with self._lock:
             consumptions = self._fuel_consumption_by_lap()
@@ -159,8 +296,11 @@ class LapTelemetryState:
 
     def reset(self) -> None:
         with self._lock:
+            removed = set(self._laps.keys())
             self._laps.clear()
             self._version += 1
+            self._summary_version += 1
+        self._notify(removed)
 
     def set_enabled(self, enabled: bool) -> None:
         with self._lock:
@@ -170,7 +310,26 @@ class LapTelemetryState:
         with self._lock:
             return self._version
 
-    def _trim_old_laps(self) -> None:
+    def get_summary_version(self) -> int:
+        # Muda só quando voltas abrem/fecham/são descartadas, não a cada ponto.
+        with self._lock:
+            return self._summary_version
+
+    def _new_lap(self, lap_number: int) -> dict[str, object]:
+        self._lap_serial += 1
+        return {
+            "id": self._lap_serial,
+            "lap_time": None,
+            "lap_time_ms": None,
+            "fuel_end": None,
+            "color": self._color_for_lap(lap_number),
+            "points": deque(maxlen=self._max_points_per_lap),
+            # Nenhum canal habilitado: nada é alocado nem extraído.
+            "channels": ChannelColumns(self._channels) if self._channels else None,
+        }
+
+    def _trim_old_laps(self) -> set[int]:
+        removed: set[int] = set()
         while len(self._laps) > self._max_laps:
             timed_laps: list[tuple[int, int]] = []
             for lap_number, lap in self._laps.items():
@@ -181,9 +340,12 @@ class LapTelemetryState:
             if timed_laps:
                 worst_lap_number = max(timed_laps, key=lambda item: item[1])[0]
                 self._laps.pop(worst_lap_number, None)
+                removed.add(worst_lap_number)
             else:
                 oldest_lap_number = min(self._laps.keys())
                 self._laps.pop(oldest_lap_number, None)
+                removed.add(oldest_lap_number)
+        return removed
 
     @staticmethod
     def _lap_time_to_ms(lap_time: str) -> Optional[int]:
@@ -0,0 +1,136 @@
+from dataclasses import dataclass
+import math
+import threading
+import time
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class MotionEstimate:
+    x: float
+    z: float
+    speed_kmh: Optional[float]
+    rpm: Optional[float]
+    age_s: float
+
+
+class MotionPredictor:
+    """
+    Dead reckoning do carro entre pacotes.
+
+    observe() recebe cada pacote (thread de ingestão); predict() extrapola posição
+    pela velocidade do pacote e speed/RPM pela taxa de variação entre os dois
+    últimos pacotes, até o instante do frame (thread da GUI). Quando chega um
+    pacote novo, o erro da previsão vira um offset que decai em correction_s,
+    então o marcador desliza para a posição real em vez de pular.
+
+    Coordenadas na mesma orientação do traçado (invert_x / invert_z como no TrackService).
+    """
+
+    def __init__(
+        self,
+        invert_x: bool = False,
+        invert_z: bool = False,
+        max_extrapolation_s: float = 0.1,
+        correction_s: float = 0.08,
+        max_correction_m: float = 15.0,
+    ):
+        self.invert_x = invert_x
+        self.invert_z = invert_z
+        self.max_extrapolation_s = max_extrapolation_s
+        self.correction_s = correction_s
+        self.max_correction_m = max_correction_m
+        self._lock = threading.Lock()
+        self._sample: Optional[tuple[float, float, float, float, float]] = None
+        # Canais escalares: (valor, taxa por segundo, timestamp).
+        self._speed: Optional[tuple[float, float, float]] = None
+        self._rpm: Optional[tuple[float, float, float]] = None
+        # Offset de posição (previsto - real) no instante do último pacote.
+        self._error_x = 0.0
+        self._error_z = 0.0
+
+    def reset(self) -> None:
+        with self._lock:
+            self._sample = None
+            self._speed = None
+            self._rpm = None
+            self._error_x = 0.0
+            self._error_z = 0.0
+
+    def observe(
+        self,
+        timestamp: float,
+        x: float,
+        z: float,
+        velocity_x: float,
+        velocity_z: float,
+        speed_kmh: Optional[float] = None,
+        rpm: Optional[float] = None,
+    ) -> None:
+        """timestamp em time.monotonic() (mesmo relógio de predict)."""
+        if self.invert_x:
+            x, velocity_x = -x, -velocity_x
+        if self.invert_z:
+            z, velocity_z = -z, -velocity_z
+
+        with self._lock:
+            if self._sample is not None:
+                predicted_x, predicted_z = self._position_at(timestamp)
+                error_x = predicted_x - x
+                error_z = predicted_z - z
+                # Salto grande (reset, replay, teleporte para o box): não tenta deslizar.
+                if math.hypot(error_x, error_z) > self.max_correction_m:
+                    error_x = error_z = 0.0
+                self._error_x, self._error_z = error_x, error_z
+            self._speed = self._rate(self._speed, timestamp, speed_kmh)
+            self._rpm = self._rate(self._rpm, timestamp, rpm)
+            self._sample = (timestamp, x, z, velocity_x, velocity_z)
+
+    def predict(self, now: Optional[float] = None) -> Optional[MotionEstimate]:
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            if self._sample is None:
+                return None
+            x, z = self._position_at(now)
+            age = now - self._sample[0]
+            dt = min(max(age, 0.0), self.max_extrapolation_s)
+            return MotionEstimate(
+                x=x,
+                z=z,
+                speed_kmh=self._extrapolate(self._speed, dt),
+                rpm=self._extrapolate(self._rpm, dt),
+                age_s=age,
+            )
+
+    def _position_at(self, now: float) -> tuple[float, float]:
+        timestamp, x, z, velocity_x, velocity_z = self._sample
+        age = max(now - timestamp, 0.0)
+        dt = min(age, self.max_extrapolation_s)
+        decay = math.exp(-age / self.correction_s) if self.correction_s > 0 else 0.0
+        return (
+            x + velocity_x * dt + self._error_x * decay,
+            z + velocity_z * dt + self._error_z * decay,
+        )
+
+    @staticmethod
+    def _rate(
+        previous: Optional[tuple[float, float, float]],
+        timestamp: float,
+        value: Optional[float],
+    ) -> Optional[tuple[float, float, float]]:
+        if value is None:
+            return None
+        if previous is None:
+            return (value, 0.0, timestamp)
+        last_value, _, last_ts = previous
+        dt = timestamp - last_ts
+        rate = (value - last_value) / dt if dt > 1e-4 else 0.0
+        return (value, rate, timestamp)
+
+    @staticmethod
+    def _extrapolate(channel: Optional[tuple[float, float, float]], dt: float) -> Optional[float]:
+        if channel is None:
+            return None
+        value, rate, _ = channel
+        return max(0.0, value + rate * dt)
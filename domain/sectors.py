@@ -0,0 +1,247 @@
+from dataclasses import dataclass
+import threading
+from typing import Optional, Sequence
+
+import numpy as np
+
+from domain.lap_delta import ReferenceLap
+from domain.lap_telemetry import LapTelemetry, LapTelemetryState
+
+
+@dataclass(frozen=True)
+class LapSectors:
+    lap_number: int
+    # Id da volta em LapTelemetryState: o mesmo número regravado do zero tem outro id.
+    lap_id: int
+    # None quando o traçado da volta não passa perto do marco (corte, box, volta incompleta).
+    sector_times_ms: tuple[Optional[int], ...]
+
+
+@dataclass(frozen=True)
+class SectorBest:
+    time_ms: int
+    lap_number: int
+
+
+def detect_sector_marks(
+    lap: LapTelemetry,
+    sector_count: int,
+    step_m: float = 5.0,
+    smooth_m: float = 40.0,
+    corner_curvature: float = 1.0 / 200.0,
+    brake_threshold: float = 0.1,
+) -> list[float]:
+    """
+    Marcos (distância em m) que dividem a volta em sector_count setores, cada um
+    no meio de uma das retas mais longas: trechos sem curvatura relevante e sem
+    freio. Sem retas suficientes, divide em partes iguais.
+    """
+    reference = ReferenceLap(lap.lap_number, lap.points)
+    length = reference.length_m
+    if sector_count <= 1 or length <= 0:
+        return []
+
+    # Reamostra por distância: curvatura = variação do rumo por metro, suavizada.
+    distance = np.arange(0.0, length, step_m)
+    x = np.interp(distance, reference.distance, reference.x)
+    z = np.interp(distance, reference.distance, reference.z)
+    brake = np.interp(distance, reference.distance, np.fromiter((p.brake for p in lap.points), dtype=float))
+    heading = np.unwrap(np.arctan2(np.gradient(z), np.gradient(x)))
+    curvature = np.abs(np.gradient(heading)) / step_m
+    kernel = max(1, int(smooth_m / step_m))
+    curvature = np.convolve(curvature, np.ones(kernel) / kernel, mode="same")
+
+    straight = (curvature < corner_curvature) & (brake < brake_threshold)
+    # Trechos contíguos de reta: [início, fim) em índices da reamostragem.
+    edges = np.diff(np.concatenate(([0], straight.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    # A reta que contém a linha de chegada já é a divisa entre o último e o primeiro setor.
+    runs = [
+        (end - start, (start + end) / 2 * step_m)
+        for start, end in zip(starts.tolist(), ends.tolist())
+        if start > 0 and end < len(distance)
+    ]
+    runs.sort(reverse=True)
+
+    min_gap = length / (sector_count * 2)
+    marks: list[float] = []
+    for _, middle in runs:
+        if len(marks) == sector_count - 1:
+            break
+        if middle < min_gap or length - middle < min_gap:
+            continue
+        if all(abs(middle - mark) >= min_gap for mark in marks):
+            marks.append(middle)
+    if len(marks) < sector_count - 1:
+        return [length * index / sector_count for index in range(1, sector_count)]
+    return sorted(marks)
+
+
+class SectorTimingEngine:
+    """
+    Tempos por setor de cada volta fechada, melhor por setor e volta ideal.
+
+    Os marcos vêm de distâncias definidas pelo usuário ou são detectados na
+    primeira volta limpa (fechada, com tempo e terminando perto de onde começou).
+    Cada volta é cronometrada uma vez, quando fecha: o ponto de cada marco é
+    projetado no traçado da própria volta e o tempo sai dos timestamps dela.
+    Voltas descartadas ou regravadas com o mesmo número (id novo) saem dos
+    resultados e os melhores são refeitos com as que sobraram.
+    """
+
+    def __init__(
+        self,
+        lap_state: LapTelemetryState,
+        sector_count: int = 3,
+        marks_m: Optional[Sequence[float]] = None,
+        max_offset_m: float = 30.0,
+        closed_lap_gap_m: float = 60.0,
+    ):
+        self.lap_state = lap_state
+        self.sector_count = sector_count
+        self.max_offset_m = max_offset_m
+        self.closed_lap_gap_m = closed_lap_gap_m
+        self._lock = threading.Lock()
+        self._user_marks = sorted(marks_m) if marks_m else None
+        self._reference: Optional[ReferenceLap] = None
+        self._marks: list[float] = []
+        self._gates: list[tuple[float, float]] = []
+        self._results: dict[int, LapSectors] = {}
+        self._bests: list[Optional[SectorBest]] = []
+        self._summary_version = -1
+        self._version = 0
+        lap_state.add_listener(self._on_laps_changed)
+
+    # =========================================================
+    # CONSULTA
+    # =========================================================
+    def get_version(self) -> int:
+        with self._lock:
+            return self._version
+
+    def marks_m(self) -> list[float]:
+        with self._lock:
+            return list(self._marks)
+
+    def lap_sectors(self, lap_number: int) -> Optional[LapSectors]:
+        with self._lock:
+            return self._results.get(lap_number)
+
+    def best_sectors(self) -> list[Optional[SectorBest]]:
+        with self._lock:
+            return list(self._bests)
+
+    def theoretical_best_ms(self) -> Optional[int]:
+        with self._lock:
+            if not self._bests or any(best is None for best in self._bests):
+                return None
+            return sum(best.time_ms for best in self._bests)
+
+    # =========================================================
+    # CONFIGURAÇÃO
+    # =========================================================
+    def set_marks(self, marks_m: Optional[Sequence[float]]) -> None:
+        """Marcos manuais (m desde a linha de chegada); None volta à detecção automática."""
+        with self._lock:
+            self._user_marks = sorted(marks_m) if marks_m else None
+            self._reference = None
+            self._marks = []
+            self._gates = []
+            self._results.clear()
+            self._bests = []
+            self._summary_version = -1
+            self._version += 1
+        self._update()
+
+    def reset(self) -> None:
+        self.set_marks(self._user_marks)
+
+    # =========================================================
+    # ATUALIZAÇÃO
+    # =========================================================
+    def _on_laps_changed(self, _laps: set[int]) -> None:
+        # Chamado a cada ponto gravado: a versão de resumo só muda quando voltas fecham ou somem.
+        if self.lap_state.get_summary_version() == self._summary_version:
+            return
+        self._update()
+
+    def _update(self) -> None:
+        version = self.lap_state.get_summary_version()
+        lap_times = self.lap_state.get_lap_times_ms()
+        lap_ids = self.lap_state.get_lap_ids()
+        with self._lock:
+            self._summary_version = version
+            stale = [
+                lap_number for lap_number, sectors in self._results.items()
+                if lap_ids.get(lap_number) != sectors.lap_id
+            ]
+            if stale:
+                for lap_number in stale:
+                    del self._results[lap_number]
+                self._rebuild_bests()
+                self._version += 1
+            pending = sorted(lap_number for lap_number in lap_times if lap_number not in self._results)
+        if not pending:
+            return
+
+        laps = self.lap_state.get_laps_snapshot(set(pending))
+        with self._lock:
+            for lap in laps:
+                if len(lap.points) < 2:
+                    continue
+                if self._reference is None:
+                    if not self._is_clean(lap):
+                        continue
+                    self._build_map(lap)
+                sectors = self._time_lap(lap, lap_times[lap.lap_number], lap_ids.get(lap.lap_number, 0))
+                self._results[lap.lap_number] = sectors
+                self._merge_bests(sectors)
+            self._version += 1
+
+    def _is_clean(self, lap: LapTelemetry) -> bool:
+        first, last = lap.points[0], lap.points[-1]
+        gap = ((first.x - last.x) ** 2 + (first.z - last.z) ** 2) ** 0.5
+        return gap <= self.closed_lap_gap_m
+
+    def _build_map(self, lap: LapTelemetry) -> None:
+        self._reference = ReferenceLap(lap.lap_number, lap.points)
+        if self._user_marks is not None:
+            marks = [mark for mark in self._user_marks if 0.0 < mark < self._reference.length_m]
+        else:
+            marks = detect_sector_marks(lap, self.sector_count)
+        self._marks = marks
+        self._gates = [self._reference.position_at_distance(mark) for mark in marks]
+        self._bests = [None] * (len(marks) + 1)
+
+    def _time_lap(self, lap: LapTelemetry, lap_time_ms: int, lap_id: int) -> LapSectors:
+        own = ReferenceLap(lap.lap_number, lap.points, lap_time_ms)
+        scale = own.length_m / self._reference.length_m if self._reference.length_m > 0 else 1.0
+        span = max(100.0, own.length_m * 0.05)
+        crossings: list[Optional[float]] = [0.0]
+        for mark, (gate_x, gate_z) in zip(self._marks, self._gates):
+            projection = own.locate_near(gate_x, gate_z, mark * scale, span)
+            crossings.append(own.time_at(projection) if projection.offset_m <= self.max_offset_m else None)
+        crossings.append(lap_time_ms / 1000.0)
+
+        times: list[Optional[int]] = []
+        for start, end in zip(crossings, crossings[1:]):
+            if start is None or end is None or end <= start:
+                times.append(None)
+            else:
+                times.append(int(round((end - start) * 1000.0)))
+        return LapSectors(lap_number=lap.lap_number, lap_id=lap_id, sector_times_ms=tuple(times))
+
+    def _rebuild_bests(self) -> None:
+        self._bests = [None] * (len(self._marks) + 1) if self._reference is not None else []
+        for lap_number in sorted(self._results):
+            self._merge_bests(self._results[lap_number])
+
+    def _merge_bests(self, sectors: LapSectors) -> None:
+        # Incremental: só compara a volta nova com os melhores da sessão.
+        for index, time_ms in enumerate(sectors.sector_times_ms):
+            if time_ms is None:
+                continue
+            best = self._bests[index]
+            if best is None or time_ms < best.time_ms:
+                self._bests[index] = SectorBest(time_ms=time_ms, lap_number=sectors.lap_number)
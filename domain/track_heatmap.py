@@ -0,0 +1,173 @@
+from typing import Optional
+
+import numpy as np
+
+
+HEATMAP_MODES = ("density", "brake", "throttle")
+
+
+class TrackHeatmap:
+    """
+    Incremental 2D histogram of lap points on a fixed metric grid.
+
+    Every point only touches its own cell, so adding a lap costs O(points)
+    regardless of how many laps are already aggregated. The grid grows in
+    blocks when a point lands outside it.
+    """
+
+    def __init__(self, cell_size_m: float = 2.0, grow_margin_cells: int = 64):
+        self._cell_size = cell_size_m
+        self._grow_margin = grow_margin_cells
+        self._origin_ix = 0
+        self._origin_iz = 0
+        self._count = np.zeros((0, 0), dtype=np.int32)
+        self._sum_throttle = np.zeros((0, 0), dtype=np.float32)
+        self._sum_brake = np.zeros((0, 0), dtype=np.float32)
+        self._dirty: Optional[tuple[int, int, int, int]] = None
+        self._resized = False
+
+    @property
+    def cell_size(self) -> float:
+        return self._cell_size
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self._count.shape
+
+    def clear(self) -> None:
+        self._origin_ix = 0
+        self._origin_iz = 0
+        self._count = np.zeros((0, 0), dtype=np.int32)
+        self._sum_throttle = np.zeros((0, 0), dtype=np.float32)
+        self._sum_brake = np.zeros((0, 0), dtype=np.float32)
+        self._dirty = None
+        self._resized = True
+
+    def add_points(self, x: np.ndarray, z: np.ndarray, throttle: np.ndarray, brake: np.ndarray) -> None:
+        if len(x) == 0:
+            return
+        ix = np.floor(np.asarray(x) / self._cell_size).astype(np.int64)
+        iz = np.floor(np.asarray(z) / self._cell_size).astype(np.int64)
+        self._ensure_contains(ix, iz)
+        rows = iz - self._origin_iz
+        cols = ix - self._origin_ix
+        np.add.at(self._count, (rows, cols), 1)
+        np.add.at(self._sum_throttle, (rows, cols), throttle)
+        np.add.at(self._sum_brake, (rows, cols), brake)
+        self._mark_dirty(rows, cols)
+
+    def remove_points(self, x: np.ndarray, z: np.ndarray, throttle: np.ndarray, brake: np.ndarray) -> None:
+        if len(x) == 0 or self._count.size == 0:
+            return
+        rows = np.floor(np.asarray(z) / self._cell_size).astype(np.int64) - self._origin_iz
+        cols = np.floor(np.asarray(x) / self._cell_size).astype(np.int64) - self._origin_ix
+        inside = (rows >= 0) & (rows < self._count.shape[0]) & (cols >= 0) & (cols < self._count.shape[1])
+        rows = rows[inside]
+        cols = cols[inside]
+        np.subtract.at(self._count, (rows, cols), 1)
+        np.subtract.at(self._sum_throttle, (rows, cols), np.asarray(throttle)[inside])
+        np.subtract.at(self._sum_brake, (rows, cols), np.asarray(brake)[inside])
+        empty = self._count[rows, cols] <= 0
+        self._count[rows[empty], cols[empty]] = 0
+        self._sum_throttle[rows[empty], cols[empty]] = 0.0
+        self._sum_brake[rows[empty], cols[empty]] = 0.0
+        self._mark_dirty(rows, cols)
+
+    def take_dirty(self) -> tuple[bool, Optional[tuple[int, int, int, int]]]:
+        """
+        Returns (resized, dirty) and resets both. dirty = (row0, row1, col0, col1),
+        half-open, covering every cell changed since the previous call.
+        """
+        resized, dirty = self._resized, self._dirty
+        self._resized = False
+        self._dirty = None
+        return resized, dirty
+
+    def world_rect(self) -> tuple[float, float, float, float]:
+        rows, cols = self._count.shape
+        return (
+            self._origin_ix * self._cell_size,
+            self._origin_iz * self._cell_size,
+            cols * self._cell_size,
+            rows * self._cell_size,
+        )
+
+    def values(
+        self,
+        mode: str,
+        window: Optional[tuple[int, int, int, int]] = None,
+        density_scale: float = 1.0,
+    ) -> np.ndarray:
+        """
+        Cell values in [0, 1] (NaN for empty cells) for the given window.
+        Density is points per cell divided by density_scale, clipped to 1.
+        """
+        if window is None:
+            window = (0, self._count.shape[0], 0, self._count.shape[1])
+        row0, row1, col0, col1 = window
+        count = self._count[row0:row1, col0:col1].astype(np.float32)
+        occupied = count > 0
+        result = np.full(count.shape, np.nan, dtype=np.float32)
+        if mode == "density":
+            scale = max(density_scale, 1e-6)
+            result[occupied] = np.minimum(count[occupied] / scale, 1.0)
+        elif mode == "brake":
+            result[occupied] = self._sum_brake[row0:row1, col0:col1][occupied] / count[occupied]
+        elif mode == "throttle":
+            result[occupied] = self._sum_throttle[row0:row1, col0:col1][occupied] / count[occupied]
+        else:
+            raise ValueError(f"Unknown heatmap mode: {mode}")
+        return np.clip(result, 0.0, 1.0, out=result, where=occupied)
+
+    def _ensure_contains(self, ix: np.ndarray, iz: np.ndarray) -> None:
+        rows, cols = self._count.shape
+        min_ix, max_ix = int(ix.min()), int(ix.max())
+        min_iz, max_iz = int(iz.min()), int(iz.max())
+        if (
+            rows > 0
+            and min_ix >= self._origin_ix
+            and max_ix < self._origin_ix + cols
+            and min_iz >= self._origin_iz
+            and max_iz < self._origin_iz + rows
+        ):
+            return
+
+        if rows == 0:
+            new_origin_ix = min_ix - self._grow_margin
+            new_origin_iz = min_iz - self._grow_margin
+            new_end_ix = max_ix + self._grow_margin + 1
+            new_end_iz = max_iz + self._grow_margin + 1
+        else:
+            new_origin_ix = min(self._origin_ix, min_ix - self._grow_margin)
+            new_origin_iz = min(self._origin_iz, min_iz - self._grow_margin)
+            new_end_ix = max(self._origin_ix + cols, max_ix + self._grow_margin + 1)
+            new_end_iz = max(self._origin_iz + rows, max_iz + self._grow_margin + 1)
+
+        new_shape = (new_end_iz - new_origin_iz, new_end_ix - new_origin_ix)
+        row_offset = self._origin_iz - new_origin_iz
+        col_offset = self._origin_ix - new_origin_ix
+        for name in ("_count", "_sum_throttle", "_sum_brake"):
+            old = getattr(self, name)
+            grown = np.zeros(new_shape, dtype=old.dtype)
+            if old.size:
+                grown[row_offset:row_offset + rows, col_offset:col_offset + cols] = old
+            setattr(self, name, grown)
+        self._origin_ix = new_origin_ix
+        self._origin_iz = new_origin_iz
+        self._dirty = None
+        self._resized = True
+
+    def _mark_dirty(self, rows: np.ndarray, cols: np.ndarray) -> None:
+        if self._resized or len(rows) == 0:
+            return
+        window = (int(rows.min()), int(rows.max()) + 1, int(cols.min()), int(cols.max()) + 1)
+        if self._dirty is None:
+            self._dirty = window
+            return
+        self._dirty = (
+            min(self._dirty[0], window[0]),
+            max(self._dirty[1], window[1]),
+            min(self._dirty[2], window[2]),
+            max(self._dirty[3], window[3]),
+        )
+
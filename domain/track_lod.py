@@ -0,0 +1,230 @@
+import math
+from typing import Mapping, Optional
+
+import numpy as np
+
+
+class TrackLodPyramid:
+    """
+    Multi-resolution copy of a lap trace.
+
+    Level 0 is the stored series; level k keeps every 2^k-th point (plus the
+    last one). Throttle is averaged and brake keeps the peak of each decimated
+    window, so short braking zones stay visible when zoomed out.
+
+    Optional named value columns (e.g. tyre temperatures) ride along with the
+    trace and keep the peak of each window too; samples without a value are NaN.
+
+    Levels are kept incrementally: extend() invalidates nothing, and the next
+    level() / values() call only reduces the windows completed since the last
+    one, plus the partial window ending at the last point. Arrays returned for
+    levels above 0 are views whose last element may change on the next extend().
+    """
+
+    def __init__(self, max_levels: int = 8, initial_capacity: int = 1024):
+        self._max_levels = max_levels
+        self._size = 0
+        self._x = np.empty(initial_capacity, dtype=float)
+        self._z = np.empty(initial_capacity, dtype=float)
+        self._throttle = np.empty(initial_capacity, dtype=float)
+        self._brake = np.empty(initial_capacity, dtype=float)
+        # (column, level) -> [complete windows already reduced, buffer].
+        self._levels: dict[tuple[str, int], list] = {}
+        self._values: dict[str, np.ndarray] = {}
+        self._value_levels: dict[tuple[str, int], list] = {}
+        self._spacing: Optional[float] = None
+        self._spacing_size = 0
+        # Bumped on every change, so callers can cache anything derived from the levels.
+        self._version = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def reset(self) -> None:
+        self._size = 0
+        self._levels.clear()
+        self._values.clear()
+        self._value_levels.clear()
+        self._spacing = None
+        self._spacing_size = 0
+        self._version += 1
+
+    def extend(
+        self,
+        x: np.ndarray,
+        z: np.ndarray,
+        throttle: np.ndarray,
+        brake: np.ndarray,
+        values: Optional[Mapping[str, np.ndarray]] = None,
+    ) -> None:
+        count = len(x)
+        if count == 0:
+            return
+        values = values or {}
+        for name in values:
+            if name not in self._values:
+                column = np.empty(len(self._x), dtype=float)
+                column[:self._size] = np.nan
+                self._values[name] = column
+        self._ensure_capacity(self._size + count)
+        end = self._size + count
+        self._x[self._size:end] = x
+        self._z[self._size:end] = z
+        self._throttle[self._size:end] = throttle
+        self._brake[self._size:end] = brake
+        for name, column in self._values.items():
+            column[self._size:end] = values.get(name, np.nan)
+        self._size = end
+        self._version += 1
+
+    def base(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        n = self._size
+        return self._x[:n], self._z[:n], self._throttle[:n], self._brake[:n]
+
+    def level_count(self) -> int:
+        levels = 1
+        while levels < self._max_levels and (self._size >> levels) >= 2:
+            levels += 1
+        return levels
+
+    def level(self, level: int) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        level = max(0, min(level, self.level_count() - 1))
+        if level == 0:
+            return self.base()
+
+        x, z, throttle, brake = self.base()
+        return (
+            self._level_column(self._levels, ("x", level), x, level),
+            self._level_column(self._levels, ("z", level), z, level),
+            self._level_column(self._levels, ("throttle", level), throttle, level, np.add, mean=True),
+            self._level_column(self._levels, ("brake", level), brake, level, np.maximum),
+        )
+
+    def value_names(self) -> tuple[str, ...]:
+        return tuple(self._values)
+
+    def values(self, name: str, level: int = 0) -> Optional[np.ndarray]:
+        """Value column at the same level as level(); None if the lap never had it."""
+        column = self._values.get(name)
+        if column is None:
+            return None
+        level = max(0, min(level, self.level_count() - 1))
+        if level == 0:
+            return column[:self._size]
+
+        # fmax ignores NaN unless the whole window is missing.
+        return self._level_column(self._value_levels, (name, level), column[:self._size], level, np.fmax)
+
+    def _level_column(
+        self,
+        cache: dict[tuple[str, int], list],
+        key: tuple[str, int],
+        base: np.ndarray,
+        level: int,
+        reduce: Optional[np.ufunc] = None,
+        mean: bool = False,
+    ) -> np.ndarray:
+        """
+        base at `level`: entry 0 is base[0], entry j the window (idx[j-1], idx[j]]
+        with idx = 0, 2^level, ... plus the last point. Without reduce the
+        entry is the point at idx[j]. Only windows completed since the last call
+        are reduced; the partial one ending at the last point sits just past them.
+        """
+        n = self._size
+        step = 1 << level
+        complete = (n - 1) // step + 1
+        entry = cache.get(key)
+        if entry is None:
+            entry = cache[key] = [0, np.empty(complete + 1, dtype=float)]
+        done, buffer = entry
+        if len(buffer) < complete + 1:
+            grown = np.empty(max(complete + 1, 2 * len(buffer)), dtype=float)
+            grown[:done] = buffer[:done]
+            entry[1] = buffer = grown
+        if done < complete:
+            if done == 0:
+                buffer[0] = base[0]
+                done = 1
+            if done < complete:
+                if reduce is None:
+                    buffer[done:complete] = base[done * step:(complete - 1) * step + 1:step]
+                else:
+                    window = base[(done - 1) * step + 1:(complete - 1) * step + 1]
+                    reduced = reduce.reduceat(window, np.arange(0, len(window), step))
+                    buffer[done:complete] = reduced / step if mean else reduced
+            entry[0] = complete
+
+        last = (complete - 1) * step
+        if last == n - 1:
+            return buffer[:complete]
+        if reduce is None:
+            buffer[complete] = base[n - 1]
+        else:
+            # reduceat like the complete windows, so the sums match a full rebuild bit for bit.
+            tail = reduce.reduceat(base[last + 1:n], [0])[0]
+            buffer[complete] = tail / (n - 1 - last) if mean else tail
+        return buffer[:complete + 1]
+
+    def point_spacing(self) -> float:
+        if self._size < 2:
+            return 0.0
+        if self._spacing is None or self._size > self._spacing_size * 1.25:
+            x, z, _, _ = self.base()
+            steps = np.hypot(np.diff(x), np.diff(z))
+            self._spacing = float(np.median(steps)) if len(steps) else 0.0
+            self._spacing_size = self._size
+        return self._spacing
+
+    def select_level(self, meters_per_pixel: float, target_px: float = 2.0) -> int:
+        spacing = self.point_spacing()
+        if spacing <= 0.0 or meters_per_pixel <= 0.0:
+            return 0
+        ratio = (meters_per_pixel * target_px) / spacing
+        if ratio <= 1.0:
+            return 0
+        return max(0, min(int(math.log2(ratio)), self.level_count() - 1))
+
+    def _ensure_capacity(self, required: int) -> None:
+        capacity = len(self._x)
+        if required <= capacity:
+            return
+        while capacity < required:
+            capacity *= 2
+        n = self._size
+        for name in ("_x", "_z", "_throttle", "_brake"):
+            grown = np.empty(capacity, dtype=float)
+            grown[:n] = getattr(self, name)[:n]
+            setattr(self, name, grown)
+        for name, column in self._values.items():
+            grown = np.empty(capacity, dtype=float)
+            grown[:n] = column[:n]
+            self._values[name] = grown
+
+
+def visible_segment_mask(
+    x: np.ndarray,
+    z: np.ndarray,
+    view_rect: Optional[tuple[float, float, float, float]],
+) -> np.ndarray:
+    """
+    Mask over segments (i -> i+1) whose bounding box touches the view, so a
+    segment crossing it with both endpoints outside is kept too.
+    view_rect = (min_x, max_x, min_z, max_z); None keeps every segment.
+    """
+    if len(x) < 2:
+        return np.zeros(0, dtype=bool)
+    if view_rect is None:
+        return np.ones(len(x) - 1, dtype=bool)
+    min_x, max_x, min_z, max_z = view_rect
+    x0, x1, z0, z1 = x[:-1], x[1:], z[:-1], z[1:]
+    return (
+        (np.minimum(x0, x1) <= max_x)
+        & (np.maximum(x0, x1) >= min_x)
+        & (np.minimum(z0, z1) <= max_z)
+        & (np.maximum(z0, z1) >= min_z)
+    )
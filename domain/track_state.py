@@ -8,9 +8,14 @@ from typing import Optional
 class TrackPoint:
     x: float
     z: float
+    # Relógio do jogo (s, packet_id / 60): determinístico, independe da velocidade de processamento.
     timestamp: float
     throttle: float = 0.0
     brake: float = 0.0
+    # Relógio de parede (time.time()) do processamento, só informativo.
+    wall_time: float = 0.0
+    # Chegada do datagrama (time.monotonic()), para medir idade até a tela.
+    rx_time: float = 0.0
 
 
 @dataclass(frozen=True)
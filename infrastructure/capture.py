@@ -0,0 +1,252 @@
+import os
+import struct
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+
+from infrastructure.packet_parser import PACKET_RATE_HZ
+
+# Arquivo .gt7cap:
+#   cabeçalho  magic, tamanho do slot, início (time.time())
+#   registros  rx_time (monotônico) + bytes válidos + pacote decifrado num slot fixo
+#   rodapé     índice esparso + fronteiras de volta + trailer (escrito no close)
+# Sem rodapé (processo morto no meio da captura) o índice é refeito na abertura.
+CAPTURE_MAGIC = b"GT7CAP01"
+INDEX_MAGIC = b"GT7CIDX1"
+CAPTURE_SUFFIX = ".gt7cap"
+# Pacote "A" do GT7; pacotes maiores são cortados (parse_telemetry lê até 0xC3, diâmetros dos pneus).
+PACKET_SLOT_BYTES = 296
+# Uma entrada do índice a cada INDEX_STRIDE pacotes (~4 s a 60 Hz).
+INDEX_STRIDE = 256
+
+_HEADER = struct.Struct("<8sHd")
+_RECORD_HEAD = struct.Struct("<dH")
+_TRAILER = struct.Struct("<qqq8s")
+
+INDEX_DTYPE = np.dtype(
+    [("packet", "<i8"), ("offset", "<i8"), ("capture_time", "<f8"), ("game_time", "<f8"), ("lap", "<i4")]
+)
+# Primeiro pacote de cada trecho com o mesmo número de volta. last_lap_ms / fuel
+# são os do próprio pacote: o resumo da volta que acabou de fechar.
+LAP_DTYPE = np.dtype(
+    [
+        ("lap", "<i4"),
+        ("packet", "<i8"),
+        ("capture_time", "<f8"),
+        ("game_time", "<f8"),
+        ("last_lap_ms", "<i4"),
+        ("fuel", "<f4"),
+    ]
+)
+
+
+def record_dtype(slot_size: int) -> np.dtype:
+    return np.dtype([("rx_time", "<f8"), ("length", "<u2"), ("payload", "u1", (slot_size,))])
+
+
+def _packet_fields(packet: bytes) -> tuple[float, int, int, float]:
+    """(relógio do jogo, volta, last_lap_ms, combustível) lidos direto do pacote decifrado."""
+    if len(packet) < 0x80:
+        return float("nan"), 0, -1, float("nan")
+    packet_id, lap = struct.unpack_from("<ih", packet, 0x70)
+    return packet_id / PACKET_RATE_HZ, lap, struct.unpack_from("<i", packet, 0x7C)[0], struct.unpack_from("<f", packet, 0x44)[0]
+
+
+class CaptureWriter:
+    """
+    Grava os pacotes decifrados como chegam (thread de ingestão) e monta o
+    índice em memória; close() escreve o rodapé. O custo por pacote é um write
+    bufferizado e a leitura de quatro campos por offset, sem parse completo.
+    """
+
+    def __init__(self, path: str, slot_size: int = PACKET_SLOT_BYTES, index_stride: int = INDEX_STRIDE):
+        self.path = path
+        self.slot_size = slot_size
+        self.index_stride = index_stride
+        self._record_size = record_dtype(slot_size).itemsize
+        self._lock = threading.Lock()
+        self._file = open(path, "wb")
+        self._file.write(_HEADER.pack(CAPTURE_MAGIC, slot_size, time.time()))
+        self._count = 0
+        self._first_rx: Optional[float] = None
+        self._last_lap: Optional[int] = None
+        self._index: list[tuple] = []
+        self._laps: list[tuple] = []
+
+    def write(self, packet: bytes, rx_time: float) -> None:
+        game_time, lap, last_lap_ms, fuel = _packet_fields(packet)
+        payload = packet[:self.slot_size]
+        with self._lock:
+            if self._file is None:
+                return
+            if self._first_rx is None:
+                self._first_rx = rx_time
+            capture_time = rx_time - self._first_rx
+            if self._count % self.index_stride == 0:
+                offset = _HEADER.size + self._count * self._record_size
+                self._index.append((self._count, offset, capture_time, game_time, lap))
+            if lap != self._last_lap:
+                self._laps.append((lap, self._count, capture_time, game_time, last_lap_ms, fuel))
+                self._last_lap = lap
+            self._file.write(_RECORD_HEAD.pack(rx_time, len(payload)))
+            self._file.write(payload.ljust(self.slot_size, b"\0"))
+            self._count += 1
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is None:
+                return
+            index_offset = self._file.tell()
+            self._file.write(np.array(self._index, dtype=INDEX_DTYPE).tobytes())
+            self._file.write(np.array(self._laps, dtype=LAP_DTYPE).tobytes())
+            self._file.write(_TRAILER.pack(index_offset, len(self._index), len(self._laps), INDEX_MAGIC))
+            self._file.close()
+            self._file = None
+
+
+class CaptureReader:
+    """
+    Acesso aleatório a um .gt7cap: packet_at_time() é uma bissecção no índice
+    mais a leitura de no máximo um passo do índice; read() lê só o trecho pedido.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "rb")
+        magic, self.slot_size, self.start_wall_time = _HEADER.unpack(self._file.read(_HEADER.size))
+        if magic != CAPTURE_MAGIC:
+            self._file.close()
+            raise ValueError(f"{path} is not a GT7 capture")
+        self._dtype = record_dtype(self.slot_size)
+        self.record_size = self._dtype.itemsize
+
+        size = os.fstat(self._file.fileno()).st_size
+        footer = self._read_footer(size)
+        if footer is not None:
+            index_offset, self._index, self._laps = footer
+            self.count = (index_offset - _HEADER.size) // self.record_size
+        else:
+            # Captura sem rodapé: registro final pela metade é descartado.
+            self.count = (size - _HEADER.size) // self.record_size
+            self._index, self._laps = self._scan()
+
+        self._first_rx = float(self.read(0, 1)["rx_time"][0]) if self.count else 0.0
+        self.duration = float(self.read(self.count - 1, 1)["rx_time"][0]) - self._first_rx if self.count else 0.0
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+    def index(self) -> np.ndarray:
+        return self._index
+
+    def lap_boundaries(self) -> np.ndarray:
+        return self._laps
+
+    def capture_time(self, records: np.ndarray) -> np.ndarray:
+        """Segundos desde o primeiro pacote da captura."""
+        return records["rx_time"] - self._first_rx
+
+    def read(self, first: int, count: int) -> np.ndarray:
+        first = max(0, min(first, self.count))
+        count = max(0, min(count, self.count - first))
+        offset = _HEADER.size + first * self.record_size
+        if len(self._index):
+            # Offset da entrada do índice anterior + registros de tamanho fixo até first.
+            entry = self._index[max(0, int(np.searchsorted(self._index["packet"], first, side="right")) - 1)]
+            offset = int(entry["offset"]) + (first - int(entry["packet"])) * self.record_size
+        with self._lock:
+            self._file.seek(offset)
+            data = self._file.read(count * self.record_size)
+        return np.frombuffer(data, dtype=self._dtype, count=len(data) // self.record_size)
+
+    def packet_at_time(self, capture_time: float) -> int:
+        """Último pacote com tempo de captura <= capture_time (O(log n) + um passo do índice)."""
+        if self.count == 0:
+            return 0
+        times = self._index["capture_time"]
+        slot = max(0, int(np.searchsorted(times, capture_time, side="right")) - 1)
+        first = int(self._index["packet"][slot])
+        last = int(self._index["packet"][slot + 1]) if slot + 1 < len(self._index) else self.count
+        window = self.capture_time(self.read(first, last - first))
+        return first + max(0, int(np.searchsorted(window, capture_time, side="right")) - 1)
+
+    def lap_segments(self, end: int) -> list[tuple[int, int, int]]:
+        """(volta, início, fim) de cada trecho contíguo de volta antes do pacote end."""
+        laps = self._laps
+        starts = laps["packet"].tolist()
+        segments = []
+        for position, (lap, start) in enumerate(zip(laps["lap"].tolist(), starts)):
+            if start >= end:
+                break
+            stop = starts[position + 1] if position + 1 < len(starts) else self.count
+            segments.append((lap, start, min(stop, end)))
+        return segments
+
+    def _read_footer(self, size: int):
+        if size < _HEADER.size + _TRAILER.size:
+            return None
+        self._file.seek(size - _TRAILER.size)
+        index_offset, index_count, lap_count, magic = _TRAILER.unpack(self._file.read(_TRAILER.size))
+        if magic != INDEX_MAGIC:
+            return None
+        self._file.seek(index_offset)
+        index = np.frombuffer(self._file.read(index_count * INDEX_DTYPE.itemsize), dtype=INDEX_DTYPE)
+        laps = np.frombuffer(self._file.read(lap_count * LAP_DTYPE.itemsize), dtype=LAP_DTYPE)
+        return index_offset, index, laps
+
+    def _scan(self, chunk: int = 65536) -> tuple[np.ndarray, np.ndarray]:
+        """Refaz índice e fronteiras lendo a captura em blocos (só os campos do índice)."""
+        index_parts = []
+        lap_parts = []
+        first_rx = None
+        previous_lap = None
+        for first in range(0, self.count, chunk):
+            self._file.seek(_HEADER.size + first * self.record_size)
+            data = self._file.read(min(chunk, self.count - first) * self.record_size)
+            records = np.frombuffer(data, dtype=self._dtype)
+            payload = records["payload"]
+            if first_rx is None and len(records):
+                first_rx = float(records["rx_time"][0])
+            capture_time = records["rx_time"] - first_rx
+            complete = records["length"] >= 0x80
+            game_time = np.where(
+                complete, np.ascontiguousarray(payload[:, 0x70:0x74]).view("<i4").ravel() / PACKET_RATE_HZ, np.nan
+            )
+            lap = np.where(complete, np.ascontiguousarray(payload[:, 0x74:0x76]).view("<i2").ravel(), 0)
+            packet = np.arange(first, first + len(records))
+
+            rows = np.flatnonzero(packet % INDEX_STRIDE == 0)
+            part = np.empty(len(rows), dtype=INDEX_DTYPE)
+            part["packet"] = packet[rows]
+            part["offset"] = _HEADER.size + packet[rows] * self.record_size
+            part["capture_time"] = capture_time[rows]
+            part["game_time"] = game_time[rows]
+            part["lap"] = lap[rows]
+            index_parts.append(part)
+
+            starts_lap = np.empty(len(lap), dtype=bool)
+            starts_lap[1:] = lap[1:] != lap[:-1]
+            if len(lap):
+                starts_lap[0] = previous_lap is None or lap[0] != previous_lap
+            changed = np.flatnonzero(starts_lap)
+            part = np.empty(len(changed), dtype=LAP_DTYPE)
+            part["lap"] = lap[changed]
+            part["packet"] = packet[changed]
+            part["capture_time"] = capture_time[changed]
+            part["game_time"] = game_time[changed]
+            part["last_lap_ms"] = np.where(
+                complete[changed], np.ascontiguousarray(payload[changed, 0x7C:0x80]).view("<i4").ravel(), -1
+            )
+            part["fuel"] = np.where(
+                complete[changed], np.ascontiguousarray(payload[changed, 0x44:0x48]).view("<f4").ravel(), np.nan
+            )
+            lap_parts.append(part)
+            if len(lap):
+                previous_lap = int(lap[-1])
+        if not index_parts:
+            return np.empty(0, dtype=INDEX_DTYPE), np.empty(0, dtype=LAP_DTYPE)
+        return np.concatenate(index_parts), np.concatenate(lap_parts)
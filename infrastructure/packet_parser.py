@@ -2,6 +2,11 @@ from dataclasses import dataclass
 import struct
 from typing import Optional
 
+import numpy as np
+
+# O jogo envia um pacote por tick de simulação; packet_id / PACKET_RATE_HZ é o relógio do jogo.
+PACKET_RATE_HZ = 60.0
+
 @dataclass
 class PhysicsData:
     # =========================
@@ -59,6 +64,13 @@ class TelemetryData:
     total_laps: Optional[int] = None
     current_position: Optional[int] = None
     total_cars: Optional[int] = None
+    is_paused: Optional[bool] = None
+    is_in_race: Optional[bool] = None
+    packet_id: Optional[int] = None
+    tyre_temp_fl: Optional[float] = None
+    tyre_temp_fr: Optional[float] = None
+    tyre_temp_rl: Optional[float] = None
+    tyre_temp_rr: Optional[float] = None
     physics: Optional[PhysicsData] = None
 
 def ms_to_time(ms: int, include_hours: bool = False) -> str:
@@ -119,6 +131,10 @@ def parse_telemetry(packet: bytes) -> TelemetryData:
     total_laps = None
     current_position = None
     total_cars = None
+    is_paused = None
+    is_in_race = None
+    packet_id = None
+    tyre_temp_fl = tyre_temp_fr = tyre_temp_rl = tyre_temp_rr = None
     physics_data = None
     if _has_bytes(packet, 0x4C, 4):
         speed_mps = struct.unpack_from("<f", packet, 0x4C)[0]
@@ -195,9 +211,8 @@ def parse_telemetry(packet: bytes) -> TelemetryData:
     ############
     # Race infos #
     ############
-    if _has_bytes(packet, 0x80, 4):
-        race_time = ms_to_time(struct.unpack_from("<I", packet, 0x80)[0], include_hours=True) # time of the day
-        # print(f"Race Time: {race_time}")
+    if _has_bytes(packet, 0x70, 4):
+        packet_id = struct.unpack_from("<i", packet, 0x70)[0] # contador do jogo, +1 por tick de 60 Hz
 
     if _has_bytes(packet, 0x84, 2):
         current_position = struct.unpack_from("<H", packet, 0x84)[0] # current position
@@ -275,5 +290,62 @@ def parse_telemetry(packet: bytes) -> TelemetryData:
         total_laps=total_laps,
         current_position=current_position,
         total_cars=total_cars,
+        is_paused=is_paused,
+        is_in_race=is_in_race,
+        packet_id=packet_id,
+        tyre_temp_fl=tyre_temp_fl,
+        tyre_temp_fr=tyre_temp_fr,
+        tyre_temp_rl=tyre_temp_rl,
+        tyre_temp_rr=tyre_temp_rr,
         physics=physics_data,
     )
+
+
+# Campos lidos por parse_telemetry_columns: nome -> (offset, dtype). Mesmos offsets de parse_telemetry.
+_COLUMN_FIELDS = {
+    "position_x": (0x04, "<f4"),
+    "position_y": (0x08, "<f4"),
+    "position_z": (0x0C, "<f4"),
+    "velocity_x": (0x10, "<f4"),
+    "velocity_y": (0x14, "<f4"),
+    "velocity_z": (0x18, "<f4"),
+    "rotation_pitch": (0x1C, "<f4"),
+    "rotation_yaw": (0x20, "<f4"),
+    "rotation_roll": (0x24, "<f4"),
+    "angular_velocity_x": (0x2C, "<f4"),
+    "angular_velocity_y": (0x30, "<f4"),
+    "angular_velocity_z": (0x34, "<f4"),
+    "rpm": (0x3C, "<f4"),
+    "fuel": (0x44, "<f4"),
+    "fuel_capacity": (0x48, "<f4"),
+    "speed_mps": (0x4C, "<f4"),
+    "tyre_temp_fl": (0x60, "<f4"),
+    "tyre_temp_fr": (0x64, "<f4"),
+    "tyre_temp_rl": (0x68, "<f4"),
+    "tyre_temp_rr": (0x6C, "<f4"),
+    "packet_id": (0x70, "<i4"),
+    "current_lap": (0x74, "<i2"),
+    "best_lap_ms": (0x78, "<i4"),
+    "last_lap_ms": (0x7C, "<i4"),
+}
+# Último byte lido (freio em 0x92): pacotes mais curtos ficam de fora do lote.
+COLUMNS_MIN_LENGTH = 0x93
+
+
+def parse_telemetry_columns(payload: np.ndarray, length: np.ndarray) -> dict[str, np.ndarray]:
+    """
+    Versão vetorizada de parse_telemetry para um bloco de pacotes já decifrados
+    (replay de captura): payload (n, tamanho) uint8, length = bytes válidos de
+    cada linha. Uma coluna numpy por campo, com os nomes de TelemetryData /
+    PhysicsData (canais de domain/channels.py incluídos); a coluna "valid" marca
+    as linhas longas o bastante para todos os campos.
+    """
+    columns = {"valid": np.asarray(length) >= COLUMNS_MIN_LENGTH}
+    for name, (offset, dtype) in _COLUMN_FIELDS.items():
+        size = np.dtype(dtype).itemsize
+        columns[name] = np.ascontiguousarray(payload[:, offset:offset + size]).view(dtype).ravel()
+    columns["speed_kmh"] = columns.pop("speed_mps") * 3.6
+    columns["throttle"] = payload[:, 0x91] / 255.0
+    columns["brake"] = payload[:, 0x92] / 255.0
+    columns["gear"] = payload[:, 0x90] & 0x0F
+    return columns
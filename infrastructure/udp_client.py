@@ -1,19 +1,36 @@
 import socket
+import struct
+import sys
 import threading
 import time
 
 from app.config import PS5_IP, HANDSHAKE_PORT, TELEMETRY_PORT
 
+# O módulo socket não exporta SO_TIMESTAMPNS; no Linux (x86/ARM) é 35 e o cmsg
+# SCM_TIMESTAMPNS usa o mesmo número, com um struct timespec (tv_sec, tv_nsec).
+_SO_TIMESTAMPNS = getattr(socket, "SO_TIMESTAMPNS", 35)
+_TIMESPEC = struct.Struct("@ll")
+
 
 class GT7UdpClient:
     def __init__(self):
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         self.sock.bind(("", TELEMETRY_PORT))
+        self.kernel_timestamps = self._enable_kernel_timestamps()
 
         self._running = False
         self._handshake_thread = None
 
+    def _enable_kernel_timestamps(self) -> bool:
+        if not sys.platform.startswith("linux") or not hasattr(self.sock, "recvmsg"):
+            return False
+        try:
+            self.sock.setsockopt(socket.SOL_SOCKET, _SO_TIMESTAMPNS, 1)
+        except OSError:
+            return False
+        return True
+
     # ======================
     # HANDSHAKE
     # ======================
@@ -62,3 +79,25 @@ class GT7UdpClient:
         Retorna (data, addr)
         """
         return self.sock.recvfrom(buffer_size)
+
+    def receive_timestamped(self, buffer_size: int = 4096):
+        """
+        Bloqueante.
+        Retorna (data, addr, rx_time), com rx_time no relógio time.monotonic():
+        instante em que o kernel recebeu o datagrama (SO_TIMESTAMPNS) ou, sem
+        suporte, o instante em que recvfrom retornou.
+        """
+        if not self.kernel_timestamps:
+            data, addr = self.sock.recvfrom(buffer_size)
+            return data, addr, time.monotonic()
+
+        data, ancdata, _, addr = self.sock.recvmsg(buffer_size, socket.CMSG_SPACE(_TIMESPEC.size))
+        now_wall = time.time()
+        now_mono = time.monotonic()
+        for level, kind, payload in ancdata:
+            if level == socket.SOL_SOCKET and kind == _SO_TIMESTAMPNS and len(payload) >= _TIMESPEC.size:
+                seconds, nanoseconds = _TIMESPEC.unpack_from(payload)
+                # O kernel carimba em CLOCK_REALTIME; leva para o monotônico pela idade do pacote.
+                age = max(0.0, now_wall - (seconds + nanoseconds * 1e-9))
+                return data, addr, now_mono - age
+        return data, addr, now_mono
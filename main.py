@@ -1,37 +1,100 @@
+import argparse
+import os
 import sys
+import time
 from PyQt5 import QtWidgets
-from app.config import TRACK_INVERT_X, TRACK_INVERT_Z
+from app.config import (
+    CAPTURE_CHANNELS,
+    CAPTURE_DIR,
+    PREDICT_MAX_EXTRAPOLATION_S,
+    SECTOR_COUNT,
+    SECTOR_MARKS_M,
+    TRACK_INVERT_X,
+    TRACK_INVERT_Z,
+)
+from infrastructure.capture import CAPTURE_SUFFIX, CaptureReader, CaptureWriter
 from infrastructure.udp_client import GT7UdpClient
 from domain.game_state import GameState
+from domain.ghost import GhostCar
+from domain.lap_delta import LapDeltaEngine
 from domain.lap_telemetry import LapTelemetryState
+from domain.motion_predictor import MotionPredictor
+from domain.sectors import SectorTimingEngine
+from app.replay import ReplayService
 from app.telemetry import TelemetryService
 from app.services.track_service import TrackService
 from app.ui.dashboard_window import DashboardWindow
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="GT7 telemetry dashboard")
+    parser.add_argument("--record", action="store_true", help=f"grava os pacotes em {CAPTURE_DIR}/")
+    parser.add_argument("--replay", metavar="CAPTURE", help="reproduz uma captura .gt7cap em vez do UDP")
+    # O resto (ex.: opções do Qt) segue para o QApplication.
+    return parser.parse_known_args()
+
+
 def main():
-    client = GT7UdpClient()
-    client.start()
+    args, qt_args = parse_args()
+    reader = CaptureReader(args.replay) if args.replay else None
+    client = None
+    capture = None
+    if reader is None:
+        client = GT7UdpClient()
+        client.start()
+        if args.record:
+            os.makedirs(CAPTURE_DIR, exist_ok=True)
+            capture = CaptureWriter(os.path.join(CAPTURE_DIR, time.strftime("session_%Y%m%d_%H%M%S") + CAPTURE_SUFFIX))
 
     state = GameState()
-    lap_state = LapTelemetryState(max_laps=10, max_points_per_lap=10000)
+    lap_state = LapTelemetryState(max_laps=10, max_points_per_lap=10000, channels=CAPTURE_CHANNELS)
+    delta = LapDeltaEngine(lap_state=lap_state)
+    ghost = GhostCar(lap_state=lap_state)
+    sectors = SectorTimingEngine(lap_state=lap_state, sector_count=SECTOR_COUNT, marks_m=SECTOR_MARKS_M)
     track_service = TrackService(
         lap_state=lap_state,
         min_distance_m=1.2,
         sample_interval_ms=50,
         invert_x=TRACK_INVERT_X,
         invert_z=TRACK_INVERT_Z,
+        delta=delta,
+        ghost=ghost,
     )
-    telemetry = TelemetryService(client, state, track_service=track_service)
+    predictor = MotionPredictor(
+        invert_x=TRACK_INVERT_X,
+        invert_z=TRACK_INVERT_Z,
+        max_extrapolation_s=PREDICT_MAX_EXTRAPOLATION_S,
+    )
+    telemetry = TelemetryService(client, state, track_service=track_service, predictor=predictor, capture=capture)
     telemetry.start()
+    replay = None
+    if reader is not None:
+        replay = ReplayService(reader, telemetry, track_service, predictor=predictor, sectors=sectors)
+        replay.start()
+        replay.seek(0.0)
 
     # Qt App (SEMPRE no main thread)
-    app = QtWidgets.QApplication(sys.argv)
-    window = DashboardWindow(state=state, lap_state=lap_state)
+    app = QtWidgets.QApplication(sys.argv[:1] + qt_args)
+    window = DashboardWindow(
+        state=state,
+        lap_state=lap_state,
+        predictor=predictor,
+        delta=delta,
+        sectors=sectors,
+        ghost=ghost,
+        replay=replay,
+    )
     window.show()
     window.open_track_window()
     if window.track_window is not None:
         window.track_window.show()
-    sys.exit(app.exec_())
+    code = app.exec_()
+    if capture is not None:
+        # Rodapé com o índice; sem ele a captura ainda abre (índice refeito na leitura).
+        telemetry.stop()
+        capture.close()
+    if replay is not None:
+        replay.stop()
+    sys.exit(code)
 
 if __name__ == "__main__":
     main()